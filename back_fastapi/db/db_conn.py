@@ -1,9 +1,21 @@
 from dotenv import load_dotenv
 import os
+import json
+import time
+import itertools
+import contextvars
+import threading
+import weakref
+import logging
 import psycopg2
+import psycopg2.errors
 from psycopg2 import pool, OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from typing import Optional
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
+
 
 # Load .env
 load_dotenv()
@@ -13,17 +25,290 @@ DB_PW = os.environ.get('db_pw')
 DB_HOST = os.environ.get('db_host')
 PORT = os.environ.get('port')
 DB_DATABASE = os.environ.get('db_database')
+# 워커 프로세스별 커넥션 풀 크기 (운영 모드에서는 entrypoint.py가 전체 예산 / 워커 수로 설정)
+DB_POOL_MAX = int(os.environ.get('db_pool_max', 20))
+DB_POOL_MIN = min(int(os.environ.get('db_pool_min', 1)), DB_POOL_MAX)
+
+# 읽기 전용 replica 목록 (쉼표로 구분한 host 또는 host:port, 비어 있으면 모든 읽기를 primary에서 처리)
+DB_REPLICA_HOSTS = [h.strip() for h in os.environ.get('db_replica_hosts', '').split(',') if h.strip()]
+# replica 지연(lag)이 이 값(초)을 넘으면 해당 replica를 사용하지 않음
+DB_REPLICA_MAX_LAG_SECONDS = float(os.environ.get('db_replica_max_lag_seconds', 5))
+# replica 상태(연결 가능 여부, lag)를 다시 확인하는 간격 (초)
+DB_REPLICA_CHECK_SECONDS = float(os.environ.get('db_replica_check_seconds', 1))
+# 연결할 수 없는 replica 를 다시 확인하는 최대 간격 (초, 실패할 때마다 두 배로 늘어남)
+DB_REPLICA_CHECK_MAX_SECONDS = float(os.environ.get('db_replica_check_max_seconds', 30))
+# replica 연결 제한 시간 (초) - replica가 내려간 경우 요청이 오래 막히지 않도록 짧게 설정
+DB_REPLICA_CONNECT_TIMEOUT = int(os.environ.get('db_replica_connect_timeout', 2))
+# 사용자가 쓰기를 한 뒤 이 시간(초) 동안은 그 사용자의 읽기를 primary에서 처리 (read-your-writes)
+DB_READ_STICKY_SECONDS = float(os.environ.get('db_read_sticky_seconds', 5))
 
 # PostgreSQL connection pool
-connection_pool = pool.SimpleConnectionPool(1, 20,
-                                            user=DB_ID,
-                                            password=DB_PW,
-                                            host=DB_HOST,
-                                            port=PORT,
-                                            database=DB_DATABASE)
+# import 시점에는 DB에 연결하지 않고, 앱 lifespan에서 init_connection_pool()로 생성합니다.
+# 스트리밍 응답 등 스레드풀에서 커넥션을 반환하는 경우가 있으므로 ThreadedConnectionPool을 사용합니다.
+connection_pool = None
+_pool_lock = threading.Lock()
+
+# replica에서 WAL 재생이 밀린 시간 (수신한 WAL을 모두 재생했으면 0, replica가 아닌 서버는 NULL -> 0)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class _Replica:
+    """읽기 전용 replica 하나의 커넥션 풀과 상태"""
+
+    def __init__(self, address: str):
+        host, _, port = address.partition(':')
+        self.host = host
+        self.port = port or PORT
+        # minconn=0: 풀 생성 시 연결하지 않으므로 replica가 내려가 있어도 기동에 영향 없음
+        self.pool = pool.ThreadedConnectionPool(0, DB_POOL_MAX,
+                                                user=DB_ID,
+                                                password=DB_PW,
+                                                host=self.host,
+                                                port=self.port,
+                                                database=DB_DATABASE,
+                                                connect_timeout=DB_REPLICA_CONNECT_TIMEOUT)
+        self.healthy = False
+        self.lag_seconds = None
+        self.checked_at = None
+        # 연속 확인 실패 횟수와 다음 확인 시각 (time.monotonic, 상태 확인 스레드만 사용)
+        self.failures = 0
+        self.next_check_at = 0.0
+
+    @property
+    def name(self):
+        return f"{self.host}:{self.port}"
+
 
+replicas = []
+# replica 상태 확인 스레드 (워커 프로세스당 하나)
+_replica_monitor = None
+_replica_monitor_stop = threading.Event()
+# replica 풀에서 꺼낸 커넥션 -> 풀 (close_db_connection 에서 원래 풀로 반환하기 위함)
+_replica_conn_owner = weakref.WeakKeyDictionary()
+_replica_round_robin = itertools.count()
+# 사용자별 read-your-writes 만료 시각 (time.monotonic 기준, 워커 프로세스 단위 - 다른 워커의 쓰기는 변경 알림으로 기록)
+_recent_writes = {}
+# 요청별 쓰기 표시 (routers.util.read_your_writes 미들웨어가 설정, 스레드풀 작업에도 같은 dict 가 전달됨)
+# {"uid": 쿠키의 사용자, "until": 쿠키의 만료 시각 (epoch 초), "wrote": 이 요청에서 쓰기를 한 사용자}
+request_write_marker = contextvars.ContextVar("request_write_marker", default=None)
+_RECENT_WRITES_PRUNE_SIZE = 10000
+_routing_lock = threading.Lock()
+_routing_stats = {
+    "replica_reads": 0,
+    "sticky_primary_reads": 0,
+    "fallback_primary_reads": 0,
+}
 
-def get_db_connection():
+
+def init_connection_pool():
+    """
+    커넥션 풀을 생성하는 함수 (이미 생성된 경우 그대로 반환)
+    풀 생성 시 DB_POOL_MIN 개의 커넥션이 미리 열립니다.
+    replica 풀은 연결 없이 생성하고, 첫 읽기 또는 warm-up 때 연결합니다.
+    """
+    global connection_pool
+    with _pool_lock:
+        if connection_pool is None:
+            connection_pool = pool.ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX,
+                                                          user=DB_ID,
+                                                          password=DB_PW,
+                                                          host=DB_HOST,
+                                                          port=PORT,
+                                                          database=DB_DATABASE)
+            replicas[:] = [_Replica(address) for address in DB_REPLICA_HOSTS]
+            _start_replica_monitor()
+            logger.info(f"Connection pool created (min={DB_POOL_MIN}, max={DB_POOL_MAX}, "
+                        f"replicas={[replica.name for replica in replicas]})")
+        return connection_pool
+
+
+def close_connection_pool():
+    """
+    커넥션 풀의 모든 커넥션을 닫는 함수 (앱 종료 시 호출)
+    """
+    global connection_pool
+    with _pool_lock:
+        if connection_pool is not None:
+            connection_pool.closeall()
+            connection_pool = None
+            _stop_replica_monitor()
+            for replica in replicas:
+                replica.pool.closeall()
+            replicas.clear()
+            logger.info("Connection pool closed")
+
+
+def mark_user_write(uid: int):
+    """
+    사용자가 쓰기를 했음을 기록하는 함수
+    이후 DB_READ_STICKY_SECONDS 동안 그 사용자의 읽기는 replica 대신 primary에서 처리합니다.
+    (쓰기 경로는 모두 user_version을 올리므로 routers.util.versioning 에서 호출)
+    요청 안에서 호출되면 응답에 쓰기 표시 쿠키를 붙이도록 기록합니다. (다른 워커로 가는 다음 요청용)
+    """
+    if not DB_REPLICA_HOSTS:
+        return
+    marker = request_write_marker.get()
+    if marker is not None:
+        marker["wrote"] = uid
+    now = time.monotonic()
+    with _routing_lock:
+        if len(_recent_writes) >= _RECENT_WRITES_PRUNE_SIZE:
+            for key in [key for key, until in _recent_writes.items() if until <= now]:
+                del _recent_writes[key]
+        _recent_writes[uid] = now + DB_READ_STICKY_SECONDS
+
+
+def _is_sticky(uid) -> bool:
+    if uid is None:
+        return False
+    marker = request_write_marker.get()
+    if marker is not None and marker["uid"] == uid and marker["until"] > time.time():
+        return True
+    with _routing_lock:
+        until = _recent_writes.get(uid)
+        return until is not None and until > time.monotonic()
+
+
+def _count_read(kind: str):
+    with _routing_lock:
+        _routing_stats[kind] += 1
+
+
+def _check_replica(replica: _Replica) -> bool:
+    """
+    replica 의 lag 를 조회하여 상태를 갱신하는 함수 (상태 확인 스레드 / warm-up 에서 호출, 요청 경로에서는 호출하지 않음)
+    :return: 연결하여 조회했으면 True (lag 가 커서 사용하지 않는 경우 포함), 연결할 수 없으면 False
+    """
+    try:
+        conn = replica.pool.getconn()
+    except pool.PoolError:
+        # replica 풀이 가득 찬 경우: 연결은 되고 있으므로 마지막 상태 유지
+        return True
+    except psycopg2.Error as e:
+        if replica.healthy:
+            logger.warning(f"Replica {replica.name} unavailable, routing reads to primary: {e}")
+        replica.healthy = False
+        replica.lag_seconds = None
+        return False
+    finally:
+        replica.checked_at = time.monotonic()
+
+    broken = False
+    try:
+        with conn.cursor() as cur:
+            cur.execute(REPLICA_LAG_SQL)
+            lag = float(cur.fetchone()[0])
+        conn.rollback()
+    except psycopg2.Error as e:
+        broken = True
+        if replica.healthy:
+            logger.warning(f"Replica {replica.name} unavailable, routing reads to primary: {e}")
+        replica.healthy = False
+        replica.lag_seconds = None
+        return False
+    finally:
+        replica.pool.putconn(conn, close=broken or conn.closed != 0)
+    if lag > DB_REPLICA_MAX_LAG_SECONDS and replica.healthy:
+        logger.warning(f"Replica {replica.name} lags {lag:.1f}s, routing reads to primary")
+    replica.lag_seconds = lag
+    replica.healthy = lag <= DB_REPLICA_MAX_LAG_SECONDS
+    return True
+
+
+def _run_replica_monitor(stop: threading.Event):
+    """
+    replica 상태 확인 스레드
+    replica 마다 DB_REPLICA_CHECK_SECONDS 간격으로 확인하며, 연결할 수 없으면 다시 확인하는 간격을
+    DB_REPLICA_CHECK_MAX_SECONDS 까지 두 배씩 늘립니다. 요청은 마지막 결과(replica.healthy)만 읽습니다.
+    """
+    while not stop.is_set():
+        for replica in list(replicas):
+            if replica.next_check_at > time.monotonic():
+                continue
+            try:
+                ok = _check_replica(replica)
+            except Exception as e:
+                logger.error(f"Replica {replica.name} check failed: {e}")
+                ok = False
+            replica.failures = 0 if ok else replica.failures + 1
+            delay = min(DB_REPLICA_CHECK_SECONDS * 2 ** min(replica.failures, 16), DB_REPLICA_CHECK_MAX_SECONDS)
+            replica.next_check_at = time.monotonic() + max(delay, DB_REPLICA_CHECK_SECONDS)
+        next_check_at = min((replica.next_check_at for replica in replicas), default=None)
+        timeout = DB_REPLICA_CHECK_SECONDS if next_check_at is None else next_check_at - time.monotonic()
+        stop.wait(max(timeout, 0.05))
+
+
+def _start_replica_monitor():
+    global _replica_monitor
+    if not replicas or _replica_monitor is not None:
+        return
+    _replica_monitor_stop.clear()
+    _replica_monitor = threading.Thread(target=_run_replica_monitor, args=(_replica_monitor_stop,),
+                                        name="replica-monitor", daemon=True)
+    _replica_monitor.start()
+
+
+def _stop_replica_monitor():
+    global _replica_monitor
+    if _replica_monitor is None:
+        return
+    _replica_monitor_stop.set()
+    _replica_monitor.join(timeout=DB_REPLICA_CONNECT_TIMEOUT + 1)
+    _replica_monitor = None
+
+
+def _get_replica_connection(uid):
+    # 사용할 수 있는 replica 커넥션을 반환 (없으면 None -> primary 사용)
+    if not replicas:
+        return None
+    if _is_sticky(uid):
+        _count_read("sticky_primary_reads")
+        return None
+
+    offset = next(_replica_round_robin)
+    for i in range(len(replicas)):
+        replica = replicas[(offset + i) % len(replicas)]
+        if not replica.healthy:
+            continue
+        try:
+            conn = replica.pool.getconn()
+        except psycopg2.Error as e:
+            # 풀이 가득 찼거나 연결 실패: 다음 replica 또는 primary 사용
+            logger.info(f"Could not get a connection from replica {replica.name}: {e}")
+            if isinstance(e, OperationalError):
+                replica.healthy = False
+            continue
+        with _routing_lock:
+            _replica_conn_owner[conn] = replica.pool
+            _routing_stats["replica_reads"] += 1
+        return conn
+
+    _count_read("fallback_primary_reads")
+    return None
+
+
+def get_db_connection(read_only: bool = False, uid: Optional[int] = None):
+    """
+    커넥션 풀에서 커넥션을 가져오는 함수
+    :param read_only: 읽기 전용 쿼리만 실행하는 경우 True - replica가 설정되어 있으면 replica 커넥션을 반환
+    :param uid: 요청한 사용자 (최근 쓰기를 한 사용자는 read-your-writes를 위해 primary 사용)
+    replica가 없거나, lag가 크거나, 연결할 수 없으면 primary 커넥션을 반환합니다.
+    """
+    if connection_pool is None:
+        # 아직 warm-up 전이거나 종료 중인 경우
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The server is starting up. Please try again later.",
+        )
+    if read_only:
+        conn = _get_replica_connection(uid)
+        if conn is not None:
+            return conn
     try:
         conn = connection_pool.getconn()
         return conn
@@ -35,6 +320,19 @@ def get_db_connection():
         ) from e  # psycopg2 예외를 함께 던집니다.
 
 def close_db_connection(conn):
+    with _routing_lock:
+        owner = _replica_conn_owner.pop(conn, None)
+    if owner is not None:
+        # replica 커넥션은 꺼내온 replica 풀로 반환 (끊어진 커넥션은 버림)
+        if owner.closed:
+            conn.close()
+        else:
+            owner.putconn(conn, close=conn.closed != 0)
+        return
+    if connection_pool is None:
+        # 종료 중 풀이 이미 닫힌 경우
+        conn.close()
+        return
     connection_pool.putconn(conn)
     """
     연결 반환 (close_db_connection):
@@ -42,8 +340,41 @@ def close_db_connection(conn):
     작업이 완료되면 close_db_connection 함수를 호출하여 연결을 반환합니다.
     이때 실제로 연결이 닫히지 않고, 연결 풀이 연결을 재사용할 수 있도록 준비 상태로 돌려놓습니다.
     connection_pool.putconn(conn)을 호출하여 연결을 반환합니다.
+    replica 커넥션은 꺼내온 replica 풀로 반환합니다.
     """
 
+
+def get_read_routing_stats():
+    """
+    읽기 라우팅 통계를 반환하는 함수 (replica 사용 횟수, primary로 처리한 이유별 횟수, replica 상태)
+    """
+    with _routing_lock:
+        result = dict(_routing_stats)
+    result["replicas"] = [
+        {"name": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds}
+        for replica in replicas
+    ]
+    return result
+
+def open_listen_connection():
+    """
+    LISTEN 전용 커넥션을 여는 함수 (워커당 하나, 커넥션 풀과 별개)
+    NOTIFY는 replica로 전달되지 않으므로 항상 primary에 연결하며, 알림을 바로 받도록 autocommit으로 설정합니다.
+    TCP keepalive로 끊어진 연결을 감지합니다.
+    """
+    conn = psycopg2.connect(user=DB_ID,
+                            password=DB_PW,
+                            host=DB_HOST,
+                            port=PORT,
+                            database=DB_DATABASE,
+                            keepalives=1,
+                            keepalives_idle=30,
+                            keepalives_interval=10,
+                            keepalives_count=3)
+    conn.autocommit = True
+    return conn
+
+
 # 예외 처리 및 연결 반환을 보장하기 위해 context manager 사용
 async def handle_database_operation():
     conn = None
@@ -54,4 +385,250 @@ async def handle_database_operation():
 
     finally:
         if conn:
-            close_db_connection(conn)
\ No newline at end of file
+            close_db_connection(conn)
+
+
+class PipelinedBatch:
+    """
+    서로 의존성이 없는 여러 쿼리를 모아 한 번의 네트워크 왕복(round trip)으로 전송하는 배치 실행기
+
+    psycopg2에는 libpq pipeline mode가 없으므로, 쿼리를 클라이언트에서 mogrify 하여
+    하나의 multi-statement 쿼리로 묶어 전송합니다.
+    - add()    : 쿼리를 모아두기만 하고 서버로 보내지 않음
+    - flush()  : 모아둔 쿼리를 한 번에 전송 (마지막 쿼리의 결과는 cur.fetchone() 등으로 조회 가능)
+    - commit() : 모아둔 쿼리를 전송하고 커밋
+
+    트랜잭션이 아직 시작되지 않은 상태에서 commit()을 호출하면 BEGIN/COMMIT 왕복 없이
+    PostgreSQL의 암묵적 트랜잭션(multi-statement simple query)으로 원자적으로 실행되므로 1 RTT로 끝납니다.
+    이미 트랜잭션 안에서 조회를 한 경우에는 flush + COMMIT 으로 2 RTT가 됩니다.
+    """
+
+    def __init__(self, cur):
+        self.cur = cur
+        self._statements = []
+
+    def __len__(self):
+        return len(self._statements)
+
+    def add(self, query, params=None):
+        # mogrify는 클라이언트 측에서 파라미터를 바인딩하므로 서버 왕복이 발생하지 않음
+        self._statements.append(self.cur.mogrify(query, params))
+
+    def flush(self):
+        if not self._statements:
+            return
+        statements, self._statements = self._statements, []
+        self.cur.execute(b";\n".join(statements))
+
+    def commit(self):
+        conn = self.cur.connection
+        if self._statements and conn.get_transaction_status() == TRANSACTION_STATUS_IDLE:
+            # autocommit 상태에서 보낸 multi-statement 쿼리는 하나의 암묵적 트랜잭션으로 실행됨
+            conn.autocommit = True
+            try:
+                self.flush()
+            finally:
+                conn.autocommit = False
+        else:
+            self.flush()
+            conn.commit()
+
+
+
+# 자주 실행되는 쿼리(hot statement)의 서버 측 prepared statement 등록부 (이름 -> 쿼리)
+PREPARED_STATEMENTS = {}
+
+# 커넥션별로 PREPARE 된 이름 목록: conn -> (backend_pid, set(names))
+# 커넥션 객체가 풀에서 폐기되면 weakref로 자동 정리됨
+_prepared_by_conn = weakref.WeakKeyDictionary()
+_prepared_stats = {}
+_prepared_lock = threading.Lock()
+
+
+def register_prepared_statement(name: str, query: str):
+    """
+    hot statement를 등록하는 함수 (모듈 로드 시 호출)
+    :param name: prepared statement 이름 (SQL 식별자)
+    :param query: %s 플레이스홀더를 사용하는 쿼리 (psycopg2 형식)
+    """
+    PREPARED_STATEMENTS[name] = query
+    _prepared_stats.setdefault(name, {
+        "prepares": 0,
+        "executions": 0,
+        "reuses": 0,
+        "fallbacks": 0,
+        "planning_ms_sample": None,
+    })
+
+
+def _to_server_placeholders(query: str) -> str:
+    # psycopg2의 %s 플레이스홀더를 PREPARE용 $1, $2 ... 로 변환
+    parts = query.split("%s")
+    return parts[0] + "".join(f"${i}{part}" for i, part in enumerate(parts[1:], start=1))
+
+
+def _sample_planning_time(cur, name, query, params):
+    # 통계용: 같은 쿼리를 매번 plan 했을 때의 planning 시간을 프로세스당 한 번 측정
+    try:
+        cur.execute("EXPLAIN (SUMMARY ON, FORMAT JSON) " + query, params)
+        plan = cur.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        with _prepared_lock:
+            _prepared_stats[name]["planning_ms_sample"] = plan[0].get("Planning Time")
+    except psycopg2.Error as e:
+        logger.warning(f"Failed to sample planning time for {name}: {e}")
+    finally:
+        # 측정용 트랜잭션은 버려서 이후 실행이 트랜잭션의 첫 쿼리가 되도록 함
+        cur.connection.rollback()
+
+
+def execute_prepared(cur, name: str, params=()):
+    """
+    등록된 hot statement를 이름으로 실행하는 함수
+    - 커넥션에서 처음 사용하는 경우 PREPARE 와 EXECUTE 를 한 번의 왕복으로 전송
+    - 이후에는 EXECUTE 만 전송하여 parse/plan 비용을 줄임
+    - 커넥션이 재활용되어(DISCARD ALL, 서버 재시작 등) prepared statement가 사라진 경우
+      일반 쿼리로 자동 fallback 후 다음 호출에서 다시 PREPARE 함
+
+    fallback은 트랜잭션을 rollback 하므로, hot statement는 트랜잭션의 첫 쿼리로 실행해야 합니다.
+    :param cur: psycopg2 커서
+    :param name: register_prepared_statement로 등록한 이름
+    :param params: 쿼리 파라미터 (순서대로)
+    """
+    conn = cur.connection
+    query = PREPARED_STATEMENTS[name]
+    params = tuple(params)
+    idle = conn.get_transaction_status() == TRANSACTION_STATUS_IDLE
+
+    with _prepared_lock:
+        backend_pid = conn.get_backend_pid()
+        entry = _prepared_by_conn.get(conn)
+        if entry is None or entry[0] != backend_pid:
+            # 새 커넥션이거나 백엔드가 바뀐 커넥션
+            entry = (backend_pid, set())
+            _prepared_by_conn[conn] = entry
+        prepared_names = entry[1]
+        is_prepared = name in prepared_names
+        sample_planning = _prepared_stats[name]["planning_ms_sample"] is None
+
+    placeholders = ", ".join(["%s"] * len(params))
+    execute_sql = f"EXECUTE {name} ({placeholders})" if params else f"EXECUTE {name}"
+
+    if sample_planning and idle:
+        _sample_planning_time(cur, name, query, params)
+
+    try:
+        if is_prepared:
+            cur.execute(execute_sql, params)
+        else:
+            cur.execute(f"PREPARE {name} AS {_to_server_placeholders(query)};\n{execute_sql}", params)
+    except (psycopg2.errors.InvalidSqlStatementName, psycopg2.errors.DuplicatePreparedStatement) as e:
+        if not idle:
+            raise
+        # 커넥션의 prepared statement 상태가 등록부와 다름: 일반 쿼리로 실행하고 다음 호출에서 다시 PREPARE
+        logger.info(f"Prepared statement {name} out of sync on backend {backend_pid}, falling back: {e}")
+        conn.rollback()
+        with _prepared_lock:
+            _prepared_stats[name]["fallbacks"] += 1
+            if isinstance(e, psycopg2.errors.DuplicatePreparedStatement):
+                prepared_names.add(name)
+            else:
+                prepared_names.discard(name)
+        cur.execute(query, params)
+        return
+
+    with _prepared_lock:
+        stats = _prepared_stats[name]
+        stats["executions"] += 1
+        if is_prepared:
+            stats["reuses"] += 1
+        else:
+            stats["prepares"] += 1
+            prepared_names.add(name)
+
+
+def get_prepared_statement_stats():
+    """
+    prepared statement 통계를 반환하는 함수
+    estimated_planning_ms_saved 는 재사용 횟수 x 측정한 planning 시간으로 계산한 추정치입니다.
+    """
+    with _prepared_lock:
+        result = {}
+        for name, stats in _prepared_stats.items():
+            sample = stats["planning_ms_sample"]
+            result[name] = {
+                **stats,
+                "estimated_planning_ms_saved": round(stats["reuses"] * sample, 3) if sample is not None else None,
+            }
+        return result
+
+
+def prepare_statements(conn):
+    """
+    등록된 hot statement 중 커넥션에 아직 PREPARE 되지 않은 것을 한 번의 왕복으로 모두 PREPARE 하는 함수
+    (warm-up 용, 실패해도 execute_prepared 가 첫 사용 시 다시 PREPARE 하므로 로그만 남김)
+    """
+    with _prepared_lock:
+        backend_pid = conn.get_backend_pid()
+        entry = _prepared_by_conn.get(conn)
+        if entry is None or entry[0] != backend_pid:
+            entry = (backend_pid, set())
+            _prepared_by_conn[conn] = entry
+        missing = [name for name in PREPARED_STATEMENTS if name not in entry[1]]
+    if not missing:
+        return
+
+    cur = conn.cursor()
+    try:
+        cur.execute(";\n".join(
+            f"PREPARE {name} AS {_to_server_placeholders(PREPARED_STATEMENTS[name])}" for name in missing
+        ))
+        # PREPARE는 세션 단위라 커밋과 무관하지만, 커넥션을 idle 상태로 돌려놓기 위해 커밋
+        conn.commit()
+        with _prepared_lock:
+            entry[1].update(missing)
+            for name in missing:
+                _prepared_stats[name]["prepares"] += 1
+    except psycopg2.Error as e:
+        conn.rollback()
+        logger.warning(f"Failed to prepare statements on backend {backend_pid}: {e}")
+    finally:
+        cur.close()
+
+
+def warm_up_pool():
+    """
+    커넥션 풀 warm-up 함수
+    - 풀을 생성하여 최소 커넥션(DB_POOL_MIN)을 미리 열고
+    - 각 커넥션에 hot statement를 미리 PREPARE 하여 첫 요청의 지연을 줄임
+    - replica도 같은 방식으로 준비 (replica 실패는 기동을 막지 않고 primary로 읽음)
+    """
+    db_pool = init_connection_pool()
+    conns = []
+    try:
+        for _ in range(DB_POOL_MIN):
+            conns.append(db_pool.getconn())
+        for conn in conns:
+            prepare_statements(conn)
+    finally:
+        for conn in conns:
+            db_pool.putconn(conn)
+
+    for replica in replicas:
+        # 상태 확인 스레드의 첫 확인을 기다리지 않도록 warm-up 에서 한 번 확인 (스레드풀에서 실행)
+        if replica.checked_at is None:
+            _check_replica(replica)
+        if not replica.healthy:
+            continue
+        conns = []
+        try:
+            for _ in range(DB_POOL_MIN):
+                conns.append(replica.pool.getconn())
+            for conn in conns:
+                prepare_statements(conn)
+        except psycopg2.Error as e:
+            logger.warning(f"Failed to warm up replica {replica.name}: {e}")
+        finally:
+            for conn in conns:
+                replica.pool.putconn(conn, close=conn.closed != 0)
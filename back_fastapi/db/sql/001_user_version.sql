@@ -0,0 +1,8 @@
+-- 사용자별 데이터 버전
+-- 스케줄/반복/반복 예외/태그/알림을 변경하는 트랜잭션마다 1씩 증가하며,
+-- 조건부 GET(ETag)과 캐시 무효화의 기준으로 사용합니다.
+CREATE TABLE IF NOT EXISTS user_version (
+    uid bigint PRIMARY KEY,
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamptz NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,2 @@
+-- 스케줄 목록 keyset 페이지네이션 (uid, start_date, id) 정렬용 인덱스
+CREATE INDEX IF NOT EXISTS schedule_uid_start_date_id_idx ON schedule (uid, start_date, id);
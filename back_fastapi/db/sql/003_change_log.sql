@@ -0,0 +1,18 @@
+-- 사용자별 변경 기록 (delta sync 용)
+-- 엔티티마다 마지막 변경만 남기며, version 은 변경한 트랜잭션의 user_version 입니다.
+-- user_version 행 잠금으로 같은 사용자의 쓰기는 버전 순서대로 커밋되므로,
+-- 클라이언트는 마지막으로 받은 버전보다 큰 행만 읽으면 그 사이의 변경을 모두 받습니다.
+-- op = 'delete' 인 행은 삭제된 엔티티의 tombstone 입니다.
+CREATE TABLE IF NOT EXISTS change_log (
+    uid bigint NOT NULL,
+    entity text NOT NULL,
+    entity_id bigint NOT NULL,
+    version bigint NOT NULL,
+    op text NOT NULL,
+    changed_at timestamptz NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (uid, entity, entity_id),
+    CHECK (entity IN ('schedule', 'tag')),
+    CHECK (op IN ('upsert', 'delete'))
+);
+
+CREATE INDEX IF NOT EXISTS change_log_uid_version_idx ON change_log (uid, version);
@@ -0,0 +1,61 @@
+-- 반복 일정 펼치기 (recurrence_engine=sql 일 때 /list, /sidebar 에서 사용)
+-- routers/util/utils.py 의 generate_recurring_events 와 같은 결과를 반환해야 합니다.
+-- - k번째 발생 = p_start + k x 주기 (UTC 기준 계산, 없는 날짜는 그 달의 마지막 날로 맞춰지며 날짜가 밀리지 않음)
+-- - p_count 는 예외로 제외된 발생도 포함한 전체 발생 횟수
+-- - p_until 이 없으면 기간 끝까지, 발생 시작 시각이 [p_window_start, p_window_end] 안에 있는 것만 반환
+-- 기간 이전의 발생은 계산하지 않도록 k 범위를 주기의 최대 / 최소 길이로 좁힌 뒤 정확한 값으로 거릅니다.
+CREATE OR REPLACE FUNCTION expand_recurrence(
+    p_start timestamptz,
+    p_frequency text,
+    p_interval integer,
+    p_until timestamptz,
+    p_count integer,
+    p_window_start timestamptz,
+    p_window_end timestamptz,
+    p_exceptions timestamptz[] DEFAULT '{}'
+) RETURNS SETOF timestamptz
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    WITH rule AS (
+        SELECT
+            CASE p_frequency
+                WHEN 'daily' THEN interval '1 day'
+                WHEN 'weekly' THEN interval '1 week'
+                WHEN 'monthly' THEN interval '1 month'
+                WHEN 'yearly' THEN interval '1 year'
+            END * COALESCE(NULLIF(p_interval, 0), 1) AS step,
+            -- 한 주기의 최대 / 최소 길이 (초)
+            CASE p_frequency
+                WHEN 'daily' THEN 86400.0
+                WHEN 'weekly' THEN 604800.0
+                WHEN 'monthly' THEN 31 * 86400.0
+                WHEN 'yearly' THEN 12 * 31 * 86400.0
+            END * COALESCE(NULLIF(p_interval, 0), 1) AS max_step_seconds,
+            CASE p_frequency
+                WHEN 'daily' THEN 86400.0
+                WHEN 'weekly' THEN 604800.0
+                WHEN 'monthly' THEN 28 * 86400.0
+                WHEN 'yearly' THEN 365 * 86400.0
+            END * COALESCE(NULLIF(p_interval, 0), 1) AS min_step_seconds,
+            LEAST(COALESCE(p_until, p_window_end), p_window_end) AS last_start
+    ), bounds AS (
+        SELECT
+            step,
+            last_start,
+            GREATEST(0, floor(EXTRACT(EPOCH FROM p_window_start - p_start) / max_step_seconds))::bigint AS first_k,
+            CASE
+                WHEN p_count IS NULL THEN ceil(EXTRACT(EPOCH FROM last_start - p_start) / min_step_seconds)
+                ELSE LEAST(ceil(EXTRACT(EPOCH FROM last_start - p_start) / min_step_seconds), p_count - 1)
+            END::bigint AS last_k
+        FROM rule
+        WHERE step IS NOT NULL AND last_start >= p_start
+    )
+    SELECT o.occurrence
+    FROM bounds,
+         generate_series(bounds.first_k, bounds.last_k) AS k,
+         LATERAL (SELECT ((p_start AT TIME ZONE 'UTC') + k * bounds.step) AT TIME ZONE 'UTC' AS occurrence) o
+    WHERE o.occurrence >= p_window_start
+      AND o.occurrence <= bounds.last_start
+      AND o.occurrence <> ALL (COALESCE(p_exceptions, '{}'))
+    ORDER BY o.occurrence
+$$;
@@ -0,0 +1,11 @@
+-- 스케줄 검색 (/api/per-schedule/search) 후보 조회용 trigram 인덱스
+-- btree_gin 으로 uid 를 같은 GIN 인덱스에 넣어, 사용자 범위 안에서만 trigram 을 찾습니다.
+-- 검색 쿼리(routers/util/search.py)의 식과 인덱스 식이 같아야 인덱스를 사용합니다.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+CREATE INDEX IF NOT EXISTS schedule_search_trgm_idx
+    ON schedule USING gin (uid, (title || ' ' || COALESCE(note, '')) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS tag_title_trgm_idx
+    ON tag USING gin (uid, title gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- 스케줄 행에 붙은 태그의 비정규화 스냅샷: [{"id": 태그 ID, "name": 태그 이름}, ...] (이름, ID 순)
+-- 사이드바 / 상세 조회가 schedule_tag, tag 를 조인하지 않고 스케줄 행만 읽도록 합니다.
+-- 태그 연결을 바꾸는 쓰기(일정 생성 / 수정 / 일괄 / 가져오기)와 태그 이름 변경이 같은 트랜잭션에서 갱신합니다.
+-- (routers/util/tag_snapshot.py)
+ALTER TABLE schedule ADD COLUMN IF NOT EXISTS tag_snapshot jsonb NOT NULL DEFAULT '[]'::jsonb;
+
+-- 기존 행은 적용 후 한 번 채워야 합니다 (청크 단위로 갱신하므로 긴 잠금 없음):
+--     python bench/check_tag_snapshots.py --rebuild
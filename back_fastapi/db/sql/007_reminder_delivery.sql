@@ -0,0 +1,26 @@
+-- 알림 메일 발송 기록 (routers/util/reminder_dispatch.py)
+-- 알림 한 건(스케줄, 몇 분 전, 발생 시작 시각)마다 한 행이며, PK 로 같은 알림을 두 번 보내지 않습니다.
+-- 보내기 전에 status = 'sending' 으로 먼저 커밋(claim)하고, SMTP 서버가 받으면 'sent' 로 바꿉니다.
+-- 'sending' 인 채로 lease 가 지난 행(보내는 중 재시작)은 같은 Message-ID 로 다시 보냅니다.
+CREATE TABLE IF NOT EXISTS reminder_delivery (
+    schedule_id bigint NOT NULL,
+    minutes_before integer NOT NULL,
+    occurrence_start timestamptz NOT NULL,
+    uid bigint NOT NULL,
+    due_at timestamptz NOT NULL,
+    status text NOT NULL DEFAULT 'sending',
+    attempts integer NOT NULL DEFAULT 1,
+    claimed_at timestamptz NOT NULL DEFAULT NOW(),
+    sent_at timestamptz,
+    PRIMARY KEY (schedule_id, minutes_before, occurrence_start),
+    CHECK (status IN ('sending', 'sent', 'failed', 'cancelled'))
+);
+
+-- lease 가 지난 발송 찾기
+CREATE INDEX IF NOT EXISTS reminder_delivery_sending_idx ON reminder_delivery (claimed_at) WHERE status = 'sending';
+-- 오래된 기록 정리
+CREATE INDEX IF NOT EXISTS reminder_delivery_due_at_idx ON reminder_delivery (due_at);
+
+-- 다음 구간(slice)의 알림 조회: 메일 알림만, 단일 일정은 시작 시각 범위로
+CREATE INDEX IF NOT EXISTS reminder_email_schedule_id_idx ON reminder (schedule_id) WHERE email;
+CREATE INDEX IF NOT EXISTS schedule_start_date_idx ON schedule (start_date);
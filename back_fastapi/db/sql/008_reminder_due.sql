@@ -0,0 +1,19 @@
+-- 다가오는 알림 인덱스 (routers/util/reminder_due.py, GET /api/per-schedule/reminders/upcoming)
+-- 사용자의 알림 시각(발생 시작 - reminder.days_before 분)을 반복 일정까지 펼쳐 (uid, fire_at) 순으로 저장하므로
+-- 다음 N 개 알림 조회는 인덱스 범위 조회 한 번입니다.
+-- reminder_due_state 에 만들 때의 user_version 과 펼친 구간의 끝을 두고, 버전이 바뀌었거나 구간이 줄어들면 사용자 단위로 다시 만듭니다.
+CREATE TABLE IF NOT EXISTS reminder_due (
+    uid bigint NOT NULL,
+    fire_at timestamptz NOT NULL,
+    schedule_id bigint NOT NULL,
+    minutes_before integer NOT NULL,
+    occurrence_start timestamptz NOT NULL,
+    PRIMARY KEY (uid, fire_at, schedule_id, minutes_before, occurrence_start)
+);
+
+CREATE TABLE IF NOT EXISTS reminder_due_state (
+    uid bigint PRIMARY KEY,
+    version bigint NOT NULL,
+    horizon_end timestamptz NOT NULL,
+    refreshed_at timestamptz NOT NULL DEFAULT NOW()
+);
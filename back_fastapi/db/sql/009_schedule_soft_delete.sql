@@ -0,0 +1,7 @@
+-- 스케줄 삭제 표시 (routers/util/schedule_purge.py)
+-- 삭제하면 deleted_at 만 채우고(모든 조회는 deleted_at IS NULL 인 행만 읽음),
+-- 태그 연결 / 알림 / 반복 / 반복 예외 / 발송 기록과 스케줄 행은 백그라운드 purger 가 작은 배치로 나누어 삭제합니다.
+ALTER TABLE schedule ADD COLUMN IF NOT EXISTS deleted_at timestamptz;
+
+-- purger 가 삭제 표시된 스케줄을 ID 순으로 찾기
+CREATE INDEX IF NOT EXISTS schedule_deleted_id_idx ON schedule (id) WHERE deleted_at IS NOT NULL;
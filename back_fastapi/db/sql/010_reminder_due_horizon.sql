@@ -0,0 +1,17 @@
+-- 알림 시각 인덱스를 쓰기 트랜잭션에서 유지 (routers/util/reminder_due.py)
+-- 사용자 단위로 읽을 때 다시 만들던 상태(reminder_due_state) 대신, 전역 구간 끝(reminder_due_horizon) 까지의 알림을
+-- 스케줄을 바꾸는 트랜잭션이 바꾼 스케줄만 다시 계산하고, 워커 하나가 구간을 늘립니다.
+DROP TABLE IF EXISTS reminder_due_state;
+
+ALTER TABLE reminder_due ADD COLUMN IF NOT EXISTS email boolean NOT NULL DEFAULT FALSE;
+-- 바뀐 스케줄의 알림 다시 계산
+CREATE INDEX IF NOT EXISTS reminder_due_schedule_id_idx ON reminder_due (schedule_id, fire_at);
+
+CREATE TABLE IF NOT EXISTS reminder_due_horizon (
+    id boolean PRIMARY KEY DEFAULT TRUE CHECK (id),
+    horizon_end timestamptz NOT NULL
+);
+
+-- 처음 적용할 때: 사용자 단위로 만든 행은 지우고 지금부터 다시 채움
+DELETE FROM reminder_due WHERE NOT EXISTS (SELECT 1 FROM reminder_due_horizon);
+INSERT INTO reminder_due_horizon (horizon_end) SELECT NOW() WHERE NOT EXISTS (SELECT 1 FROM reminder_due_horizon);
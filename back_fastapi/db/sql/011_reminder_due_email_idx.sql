@@ -0,0 +1,2 @@
+-- 알림 발송: 다음 구간의 메일 알림을 알림 시각 범위로 조회 (routers/util/reminder_dispatch.py)
+CREATE INDEX IF NOT EXISTS reminder_due_email_fire_at_idx ON reminder_due (fire_at) WHERE email;
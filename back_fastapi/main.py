@@ -1,8 +1,15 @@
+import time
+
+# 모듈 import 시간 측정 시작
+_import_started = time.perf_counter()
+
 import uvicorn
 import os
 import sys
+import asyncio
 import logging.config
 from datetime import timedelta
+from contextlib import asynccontextmanager
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -10,28 +17,105 @@ logger = logging.getLogger("Fast API in rich_schedule")
 logger.info("START Application")
 
 from fastapi import FastAPI, Security, HTTPException, status, APIRouter, Query
+from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
-from routers import register, login, per_schedule
+from starlette.concurrency import run_in_threadpool
+from routers import register, login, per_schedule, metrics, push
+from routers.util.rate_limit import AdmissionControlMiddleware
+from routers.util.read_your_writes import ReadYourWritesMiddleware
+from routers.util.push import run_change_listener
+from routers.util.reminder_dispatch import run_reminder_dispatcher
+from routers.util.schedule_purge import run_schedule_purger
+from routers.util.reminder_due import run_reminder_due_maintainer
+from db.db_conn import warm_up_pool, close_connection_pool
 from typing import List, Optional
 
+# 기동 시간 측정값 (ms)
+STARTUP_TIMINGS = {"import_ms": round((time.perf_counter() - _import_started) * 1000, 1)}
+# warm-up 실패 시 재시도 간격 (초, 실패할 때마다 두 배로 늘어나며 최대값까지)
+WARM_UP_RETRY_SECONDS = 1
+WARM_UP_RETRY_MAX_SECONDS = 30
+
+
+async def warm_up(app: FastAPI):
+    """
+    커넥션 풀 생성 및 warm-up (최소 커넥션 열기, hot statement PREPARE)
+    DB에 연결할 수 없으면 ready 상태가 되지 않은 채로 재시도합니다.
+    """
+    delay = WARM_UP_RETRY_SECONDS
+    while True:
+        started = time.perf_counter()
+        try:
+            await run_in_threadpool(warm_up_pool)
+            break
+        except Exception as e:
+            logger.error(f"Warm-up failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARM_UP_RETRY_MAX_SECONDS)
+
+    STARTUP_TIMINGS["warm_up_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    STARTUP_TIMINGS["ready_after_ms"] = round((time.perf_counter() - _import_started) * 1000, 1)
+    app.state.ready = True
+    logger.info(f"Application ready: {STARTUP_TIMINGS}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작: 요청을 받기 시작한 뒤 백그라운드에서 warm-up (완료 전까지 /ready 는 503)
+    app.state.ready = False
+    warm_up_task = asyncio.create_task(warm_up(app))
+    # 스케줄 변경 알림 수신 (워커당 LISTEN 커넥션 하나, WebSocket push 용)
+    listener_task = asyncio.create_task(run_change_listener())
+    # 알림 메일 발송 (reminder_dispatch_enabled 인 경우, advisory lock 을 잡은 워커 하나만 발송)
+    reminder_task = asyncio.create_task(run_reminder_dispatcher())
+    # 알림 시각 인덱스의 구간 연장 (advisory lock 을 잡은 워커 하나만 실행)
+    reminder_due_task = asyncio.create_task(run_reminder_due_maintainer())
+    # 삭제한 스케줄의 연관 데이터 정리 (advisory lock 을 잡은 워커 하나만 실행)
+    purge_task = asyncio.create_task(run_schedule_purger())
+    yield
+    # 종료: 새 요청을 ready로 받지 않도록 한 뒤 커넥션 풀 정리
+    app.state.ready = False
+    warm_up_task.cancel()
+    listener_task.cancel()
+    reminder_task.cancel()
+    reminder_due_task.cancel()
+    purge_task.cancel()
+    close_connection_pool()
+
+
 app = FastAPI(
     title="Fast API in rich_schedule",
     description="Fast API in rich_schedule",
     version="0.0.1",
+    lifespan=lifespan,
 )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# 요청 수 제한 (사용자 / IP / 요청 분류별) 및 DB 라우트 동시 실행 제한
+app.add_middleware(AdmissionControlMiddleware)
+# 쓰기 표시 쿠키로 다른 워커에서도 쓰기 직후의 읽기를 primary 에서 처리 (읽기 replica 를 사용하는 경우)
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Define the root endpoint
 @app.get("/")
 async def some_method():
     return {"message": "OK"}
 
+# Readiness: warm-up이 끝나야 200을 반환 (로드밸런서/오케스트레이터용)
+@app.get("/ready")
+async def readiness():
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "starting"})
+    return {"status": "ready", "timings": STARTUP_TIMINGS}
+
 # 각 라우터를 애플리케이션에 등록
 app.include_router(register.router, prefix="/api/sign/register", tags=["register"])
 app.include_router(login.router, prefix="/api/sign/login", tags=["login"])
 app.include_router(per_schedule.router, prefix="/api/per-schedule", tags = ["per_schedule"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
+app.include_router(push.router, prefix="/api/push", tags=["push"])
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="localhost", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="localhost", port=8000)
@@ -105,6 +105,28 @@ class ScheduleResponseItem(BaseModel):
     color: str = Field(..., example="orange", description="Color code of the schedule")
     dates: List[ScheduleDate] = Field(..., description="List of dates associated with the schedule")
 
+# 통합 조회(/list) 응답 스키마
+class ScheduleListResponse(BaseModel):
+    schedules: List[ScheduleResponseItem] = Field(..., description="Schedules in the requested window")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page or when limit is not used")
+
+
+# 목록 관리 화면용 스케줄 요약 스키마
+class ScheduleSummary(BaseModel):
+    id: int = Field(..., example=24, description="ID of the schedule")
+    title: str = Field(..., example="Team Lunch", description="Title of the schedule")
+    color: str = Field(..., example="orange", description="Color code of the schedule")
+    start_date: datetime = Field(..., description="Start date and time of the schedule")
+    end_date: datetime = Field(..., description="End date and time of the schedule")
+    is_repeat: bool = Field(..., description="Indicates if the schedule is recurring")
+
+
+# 목록 관리 화면용 페이지 응답 스키마
+class ScheduleSummaryPage(BaseModel):
+    items: List[ScheduleSummary] = Field(..., description="Schedules ordered by start date")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
 # 스케줄 응답 스키마
 class ScheduleResponse(BaseModel):
     title: str = Field(..., example="Meeting with Client", description="Title of the schedule")
@@ -151,4 +173,147 @@ class SidebarScheduleGroup(BaseModel):
 
 # Sidebar 일정 조회 응답 스키마
 class SidebarScheduleResponse(BaseModel):
-    side_schedules: List[SidebarScheduleGroup] = Field(..., description="List of grouped schedules by start date")
\ No newline at end of file
+    side_schedules: List[SidebarScheduleGroup] = Field(..., description="List of grouped schedules by start date")
+
+# 일괄 처리(batch) 한 번에 허용하는 최대 작업 수
+BATCH_MAX_OPERATIONS = 500
+
+
+# 일괄 처리 작업 스키마
+class BatchOperation(BaseModel):
+    op: str = Field(..., example="create", description="Operation type: create, update, delete")
+    sid: Optional[int] = Field(None, example=123456, description="Schedule ID (required for update and delete)")
+    schedule: Optional[dict] = Field(None, description="Schedule payload: CreateSchedule for create, UpdateSchedule for update")
+
+
+# 일괄 처리 요청 스키마
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=BATCH_MAX_OPERATIONS, description="Operations applied in a single transaction")
+
+
+# 일괄 처리 작업별 결과 스키마
+class BatchItemResult(BaseModel):
+    index: int = Field(..., example=0, description="Index of the operation in the request")
+    op: str = Field(..., example="create", description="Operation type")
+    id: Optional[int] = Field(None, example=123456, description="Schedule ID affected by the operation")
+    status: str = Field(..., example="created", description="Result: created, updated, deleted, invalid, not_found")
+    detail: Optional[str] = Field(None, description="Reason when the operation was rejected")
+
+
+# 일괄 처리 응답 스키마
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult] = Field(..., description="Per-operation results in request order")
+
+
+# delta sync 반복 예외 스키마
+class SyncException(BaseModel):
+    start_date: datetime = Field(..., description="Start of the excluded (or moved) occurrence")
+    end_date: datetime = Field(..., description="End of the excluded (or moved) occurrence")
+
+
+# delta sync 스케줄 스키마 (반복 일정은 펼치지 않고 반복 규칙과 예외를 그대로 전달)
+class SyncSchedule(BaseModel):
+    id: int = Field(..., example=24, description="ID of the schedule")
+    title: str = Field(..., example="Team Lunch", description="Title of the schedule")
+    note: Optional[str] = Field(None, description="Description of the schedule")
+    important: Optional[str] = Field(None, example="high", description="Important level")
+    color: str = Field(..., example="orange", description="Color code of the schedule")
+    start_date: datetime = Field(..., description="Start date and time of the schedule")
+    end_date: datetime = Field(..., description="End date and time of the schedule")
+    updated_at: Optional[datetime] = Field(None, description="Last modification time")
+    is_repeat: bool = Field(..., description="Indicates if the schedule is recurring")
+    repeat_frequency: Optional[str] = Field(None, description="Recurrence frequency")
+    repeat_interval: Optional[int] = Field(None, description="Recurrence interval")
+    repeat_end_date: Optional[datetime] = Field(None, description="Recurrence end date")
+    repeat_count: Optional[int] = Field(None, description="Number of occurrences")
+    exceptions: List[SyncException] = Field(..., description="Recurrence exceptions")
+    tag_ids: List[int] = Field(..., description="IDs of the associated tags")
+    reminders: List[int] = Field(..., description="Reminder times in minutes before the event")
+
+
+# delta sync 응답 스키마
+class SyncResponse(BaseModel):
+    token: str = Field(..., example="42", description="Change token to send as since on the next sync")
+    full: bool = Field(..., description="True when this is a full snapshot; the client replaces its local data")
+    schedules: List[SyncSchedule] = Field(..., description="Schedules created or changed since the token")
+    tags: List[Tag] = Field(..., description="Tags created or changed since the token, and tags used by the changed schedules")
+    deleted_schedule_ids: List[int] = Field(..., description="Tombstones: schedules deleted since the token")
+    deleted_tag_ids: List[int] = Field(..., description="Tombstones: tags deleted since the token")
+
+
+# 빈 시간 조회(/freebusy) 구간 스키마
+class FreeBusyInterval(BaseModel):
+    start_date: datetime = Field(..., example="2024-05-15T12:00:00Z", description="Start of the interval")
+    end_date: datetime = Field(..., example="2024-05-15T13:00:00Z", description="End of the interval")
+
+
+# 빈 시간 조회(/freebusy) 응답 스키마
+class FreeBusyResponse(BaseModel):
+    start_date: datetime = Field(..., description="Start of the requested window")
+    end_date: datetime = Field(..., description="End of the requested window")
+    uids: List[int] = Field(..., description="Users whose schedules were merged")
+    busy: List[FreeBusyInterval] = Field(..., description="Merged busy intervals of all users, ordered by start")
+    free: List[FreeBusyInterval] = Field(..., description="Free slots at least min_minutes long, ordered by start")
+
+
+# 일정 겹침 검사(check_conflicts) 결과 스키마 - 409 응답의 detail.conflicts
+class ScheduleConflict(BaseModel):
+    id: int = Field(..., example=24, description="ID of the existing schedule")
+    title: str = Field(..., example="Team Lunch", description="Title of the existing schedule")
+    start_date: datetime = Field(..., description="Start of the overlapping occurrence")
+    end_date: datetime = Field(..., description="End of the overlapping occurrence")
+
+
+# 검색(/search) 결과 아이템 스키마
+class SearchResultItem(BaseModel):
+    id: int = Field(..., example=24, description="ID of the schedule")
+    title: str = Field(..., example="Team Lunch", description="Title of the schedule")
+    note: Optional[str] = Field(None, description="Description of the schedule")
+    color: str = Field(..., example="orange", description="Color code of the schedule")
+    tags: List[str] = Field(..., description="Names of the associated tags")
+    start_date: datetime = Field(..., description="Start date and time of the schedule")
+    end_date: datetime = Field(..., description="End date and time of the schedule")
+    is_repeat: bool = Field(..., description="Indicates if the schedule is recurring")
+    next_occurrence: Optional[ScheduleDate] = Field(None, description="Next occurrence from now for recurring schedules")
+    score: float = Field(..., example=87.5, description="Relevance score (0-100)")
+
+
+# 검색(/search) 응답 스키마
+class SearchResponse(BaseModel):
+    query: str = Field(..., example="lunch", description="Normalized search query")
+    results: List[SearchResultItem] = Field(..., description="Matches ordered by score")
+
+
+# 태그 자동완성 아이템 스키마
+class TagSuggestion(BaseModel):
+    name: str = Field(..., example="Meeting", description="Name of the tag")
+    usage: int = Field(..., example=12, description="Number of schedules using the tag")
+
+
+# 태그 자동완성 응답 스키마
+class TagAutocompleteResponse(BaseModel):
+    prefix: str = Field(..., example="mee", description="Requested prefix")
+    tags: List[TagSuggestion] = Field(..., description="Tags starting with the prefix, most used first")
+
+
+# 태그 이름 변경 요청 스키마
+class RenameTag(BaseModel):
+    name: str = Field(..., min_length=1, example="Meeting", description="New name of the tag")
+
+
+# 다가오는 알림 아이템 스키마
+class UpcomingReminder(BaseModel):
+    fire_at: datetime = Field(..., example="2024-06-01T08:50:00+00:00", description="When the reminder fires")
+    schedule_id: int = Field(..., example=1, description="ID of the schedule")
+    title: str = Field(..., example="Meeting", description="Title of the schedule")
+    color: str = Field(..., example="blue", description="Color of the schedule")
+    start_date: datetime = Field(..., example="2024-06-01T09:00:00+00:00", description="Start of the occurrence")
+    end_date: datetime = Field(..., example="2024-06-01T10:00:00+00:00", description="End of the occurrence")
+    minutes_before: int = Field(..., example=10, description="Minutes before the start")
+    email: bool = Field(..., example=False, description="Whether an email is sent for this reminder")
+
+
+# 다가오는 알림 응답 스키마
+class UpcomingRemindersResponse(BaseModel):
+    until: datetime = Field(..., description="Reminders are listed up to this time")
+    reminders: List[UpcomingReminder] = Field(..., description="Upcoming reminders, earliest first")
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Response
 from pydantic import BaseModel
-from db.db_conn import get_db_connection, close_db_connection
+from db.db_conn import get_db_connection, close_db_connection, register_prepared_statement, execute_prepared
 from routers.util.jwt import create_access_token, verify_token, invalidate_token
+from routers.util.rate_limit import bcrypt_limiter
+from starlette.concurrency import run_in_threadpool
 import bcrypt
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer
@@ -10,6 +12,11 @@ router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/sign/token")
 
+register_prepared_statement(
+    "login_user_lookup",
+    "SELECT u.uid, u.nickname, la.password_hash FROM users u JOIN local_auth la ON u.uid = la.uid WHERE la.personal_id = %s"
+)
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -17,7 +24,7 @@ class LoginRequest(BaseModel):
 @router.post("/login")
 async def login(login_data: LoginRequest, response: Response):
     # 로그인 검증
-    user = authenticate_user(login_data.username, login_data.password)
+    user = await authenticate_user(login_data.username, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,7 +47,7 @@ async def login(login_data: LoginRequest, response: Response):
 
 @router.post("/token")
 async def login_for_access_token(login_data: LoginRequest, response: Response):
-    user = authenticate_user(login_data.username, login_data.password)
+    user = await authenticate_user(login_data.username, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,16 +77,12 @@ async def logout(token: str = Depends(oauth2_scheme)):
             detail="An error occurred while logging out"
         )
 
-def authenticate_user(username: str, password: str):
+async def authenticate_user(username: str, password: str):
     conn = get_db_connection()
     cur = conn.cursor()
     try:
-        cur.execute("SELECT u.uid, u.nickname, la.password_hash FROM users u JOIN local_auth la ON u.uid = la.uid WHERE la.personal_id = %s", (username,))
+        execute_prepared(cur, "login_user_lookup", (username,))
         user = cur.fetchone()
-        if user and bcrypt.checkpw(password.encode('utf-8'), user[2].encode('utf-8')):
-            return {"uid": user[0], "username": user[1]}
-        else:
-            return None
     except Exception as e:
         print(f"Error authenticating user: {e}")
         raise HTTPException(
@@ -89,3 +92,12 @@ def authenticate_user(username: str, password: str):
     finally:
         cur.close()
         close_db_connection(conn)
+
+    if not user:
+        return None
+    # 비밀번호 확인은 커넥션을 반환한 뒤, 동시 실행 수를 제한하여 스레드풀에서 실행
+    async with bcrypt_limiter:
+        matched = await run_in_threadpool(bcrypt.checkpw, password.encode('utf-8'), user[2].encode('utf-8'))
+    if matched:
+        return {"uid": user[0], "username": user[1]}
+    return None
@@ -0,0 +1,75 @@
+from fastapi import APIRouter
+from db.db_conn import get_prepared_statement_stats, get_read_routing_stats
+from .util.singleflight import get_singleflight_stats
+from .util.rate_limit import get_admission_stats
+from .util.push import hub
+from .util.interval_index import get_interval_index_stats
+from .util.utils import total_tags_cache
+from .util.tag_autocomplete import get_tag_autocomplete_stats
+from .util.tag_bitmap import get_tag_bitmap_stats
+from .util.reminder_dispatch import get_reminder_dispatch_stats
+from .util.reminder_due import get_reminder_due_stats
+from .util.schedule_purge import get_schedule_purge_stats
+
+router = APIRouter()
+
+
+@router.get("/db")
+async def db_metrics():
+    """
+    DB 계층 통계를 반환하는 엔드포인트입니다.
+    prepared statement 별 PREPARE / 재사용 / fallback 횟수와 절약한 planning 시간(추정치),
+    읽기 라우팅(replica / primary) 횟수와 replica 상태를 포함합니다.
+    """
+    return {
+        "prepared_statements": get_prepared_statement_stats(),
+        "read_routing": get_read_routing_stats(),
+    }
+
+
+@router.get("/requests")
+async def request_metrics():
+    """
+    요청 처리 통계를 반환하는 엔드포인트입니다.
+    single-flight 별 요청 수, 실제 계산 수, 병합 비율(collapse_ratio = 요청 수 / 계산 수),
+    요청 수 제한(429) / 동시 실행 제한(503) 횟수, 구간 인덱스(사용자 수, 발생 수, 적중 / 재생성 횟수), 태그 목록 캐시 / 태그 자동완성 인덱스 / 태그 비트맵 인덱스 통계를 포함합니다.
+    """
+    return {
+        "singleflight": get_singleflight_stats(),
+        "admission": get_admission_stats(),
+        "interval_index": get_interval_index_stats(),
+        "total_tags_cache": total_tags_cache.stats(),
+        "tag_autocomplete": get_tag_autocomplete_stats(),
+        "tag_bitmap": get_tag_bitmap_stats(),
+    }
+
+
+@router.get("/push")
+async def push_metrics():
+    """
+    WebSocket push 통계를 반환하는 엔드포인트입니다. (워커 프로세스 단위)
+    연결 수, 받은 알림 수, 전달한 메시지 수, 대기열이 넘쳐 resync 로 대체한 횟수, 느린 연결을 끊은 횟수를 포함합니다.
+    """
+    return hub.stats()
+
+
+@router.get("/reminders")
+async def reminder_metrics():
+    """
+    알림 통계를 반환하는 엔드포인트입니다. (워커 프로세스 단위, 발송 lock 을 잡은 워커만 active)
+    메일 발송: 읽어 둔 알림 수(pending)와 구간 끝(loaded_until), claim / 중복 / 발송 / 실패 / 재발송 / 취소 횟수
+    알림 시각 인덱스(upcoming): 조회 수, 구간 연장 횟수 / 추가한 알림 수 / 구간 끝, 지운 지난 알림 수 (구간 연장은 lock 을 잡은 워커만 active)
+    """
+    return {
+        **get_reminder_dispatch_stats(),
+        "upcoming": get_reminder_due_stats(),
+    }
+
+
+@router.get("/purge")
+async def purge_metrics():
+    """
+    삭제한 스케줄 정리 통계를 반환하는 엔드포인트입니다. (워커 프로세스 단위, purge lock 을 잡은 워커만 active)
+    정리 횟수(passes), 정리한 스케줄 수, 테이블별 지운 행 수, 오류 횟수, 마지막으로 정리한 시각을 포함합니다.
+    """
+    return get_schedule_purge_stats()
@@ -1,15 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from models.schemas import Reminder, CreateScheduleResponse, CreateSchedule, ScheduleDate, ScheduleResponseItem, SidebarScheduleGroup, ScheduleResponse,UpdateSchedule, UpdateRepeatSchedule, TotalTags, Tag, SidebarScheduleResponse
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from models.schemas import Reminder, CreateScheduleResponse, CreateSchedule, ScheduleDate, ScheduleResponseItem, SidebarScheduleGroup, ScheduleResponse,UpdateSchedule, UpdateRepeatSchedule, TotalTags, Tag, Group, SidebarScheduleResponse
+from models.schemas import BatchRequest, BatchResponse, BatchItemResult, ScheduleListResponse, ScheduleSummary, ScheduleSummaryPage
+from models.schemas import SyncResponse, SyncSchedule, SyncException, FreeBusyResponse, FreeBusyInterval, ScheduleConflict
+from models.schemas import SearchResponse, SearchResultItem, TagAutocompleteResponse, TagSuggestion, RenameTag
+from models.schemas import UpcomingRemindersResponse, UpcomingReminder
 from routers.util.jwt import verify_token
-from db.db_conn import get_db_connection, close_db_connection
+from db.db_conn import get_db_connection, close_db_connection, PipelinedBatch, register_prepared_statement, execute_prepared
 from .util.auth import extract_user_id_from_token
-from .util.utils import parse_iso_date, check_per_tags, check_color_list, generate_recurring_events
+from .util.utils import parse_iso_date, load_total_tags, check_color_list, encode_cursor, decode_cursor
+from .util.bulk_write import allocate_schedule_ids, add_link_tags, add_bulk_create, add_bulk_update, add_bulk_delete
+from .util.ical import parse_ics_events, parse_csv_events, serialize_vevent, ICS_CALENDAR_HEADER, ICS_CALENDAR_FOOTER
+from .util.schedule_import import import_schedules, validate_import_events
+from .util.versioning import bump_user_version, add_bump_user_version, get_user_version, read_user_version, GET_USER_VERSION_SQL
+from .util.singleflight import SingleFlight
+from .util.recurrence import expand_recurrences
+from .util.freebusy import build_freebusy, FREEBUSY_MAX_DAYS
+from .util.interval_index import IntervalIndex, get_interval_index
+from .util.conflicts import candidate_occurrences, find_conflicts
+from .util.search import search_schedules
+from .util.tag_autocomplete import suggest_tags, record_tag_usage, is_tag_autocomplete_cached, invalidate_tag_autocomplete, SCHEDULE_TAG_TITLES_SQL
+from .util.tag_bitmap import filter_schedule_ids_by_tags
+from .util.tag_snapshot import add_refresh_tag_snapshots, REFRESH_TAG_SNAPSHOTS_FOR_TAG_SQL
+from .util.reminder_due import list_upcoming_reminders, add_refresh_reminder_due
+from .util.schedule_purge import SOFT_DELETE_SCHEDULES_SQL, LOCK_SCHEDULE_SQL
+from .util.change_log import add_record_changes, LOG_NEW_SCHEDULE_CTE, CHANGES_SINCE_SQL, ENTITY_SCHEDULE, ENTITY_TAG, OP_DELETE
 from fastapi.security import OAuth2PasswordBearer
 import psycopg2
 from typing import List, Optional
 from datetime import datetime, timedelta
 import logging
 import pytz
+import csv
+import json
+import shutil
+import tempfile
+from email.utils import format_datetime
 
 
 
@@ -23,6 +50,95 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/sign/token")
+# 캘린더 앱 구독처럼 Authorization 헤더를 보낼 수 없는 요청용 (쿼리 파라미터 토큰 허용)
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/sign/token", auto_error=False)
+
+# 2-1. 통합 조회 쿼리: 기본 일정 및 반복 일정
+LIST_WINDOW_SQL = """
+    SELECT s.id, s.title, s.start_date, s.end_date, s.color, r.frequency, r.interval, r.until, r.count
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = %s AND s.deleted_at IS NULL
+    AND s.start_date <= %s
+    AND (
+        s.end_date IS NULL OR s.end_date >= %s
+        -- 기간 전에 시작한 반복 일정도 기간 안에 발생할 수 있음
+        OR (r.frequency IS NOT NULL AND (r.until IS NULL OR r.until >= %s))
+    )
+"""
+LIST_TAG_FILTER_SQL = """
+    AND EXISTS (
+        SELECT 1
+        FROM schedule_tag st
+        WHERE st.schedule_id = s.id
+        AND st.tag_id = ANY(%s)
+    )
+"""
+# 모든 태그가 붙은 스케줄 (태그 비트맵 인덱스를 쓸 수 없을 때: [tag_ids, 태그 수])
+LIST_ALL_TAGS_FILTER_SQL = """
+    AND (
+        SELECT COUNT(DISTINCT st.tag_id)
+        FROM schedule_tag st
+        WHERE st.schedule_id = s.id
+        AND st.tag_id = ANY(%s)
+    ) = %s
+"""
+# 태그 비트맵 인덱스로 고른 스케줄 ID
+LIST_ID_FILTER_SQL = """
+    AND s.id = ANY(%s)
+"""
+# keyset 페이지네이션: (start_date, id) 인덱스를 따라 읽으므로 깊은 페이지도 첫 페이지와 비용이 같음
+KEYSET_PAGE_SQL = """
+    AND (s.start_date, s.id) > (%s, %s)
+    ORDER BY s.start_date, s.id
+    LIMIT %s
+"""
+register_prepared_statement("list_window", LIST_WINDOW_SQL)
+register_prepared_statement("list_window_by_tags", LIST_WINDOW_SQL + LIST_TAG_FILTER_SQL)
+register_prepared_statement("list_window_page", LIST_WINDOW_SQL + KEYSET_PAGE_SQL)
+register_prepared_statement("list_window_page_by_tags", LIST_WINDOW_SQL + LIST_TAG_FILTER_SQL + KEYSET_PAGE_SQL)
+register_prepared_statement("list_window_by_all_tags", LIST_WINDOW_SQL + LIST_ALL_TAGS_FILTER_SQL)
+register_prepared_statement("list_window_page_by_all_tags", LIST_WINDOW_SQL + LIST_ALL_TAGS_FILTER_SQL + KEYSET_PAGE_SQL)
+register_prepared_statement("list_window_by_ids", LIST_WINDOW_SQL + LIST_ID_FILTER_SQL)
+register_prepared_statement("list_window_page_by_ids", LIST_WINDOW_SQL + LIST_ID_FILTER_SQL + KEYSET_PAGE_SQL)
+
+# 목록 관리 화면용 전체 조회 쿼리 (기간 조건 없음)
+register_prepared_statement("schedule_page", """
+    SELECT s.id, s.title, s.color, s.start_date, s.end_date, r.schedule_id IS NOT NULL AS is_repeat
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = %s AND s.deleted_at IS NULL
+""" + KEYSET_PAGE_SQL)
+
+# 페이지당 최대 스케줄 수
+LIST_PAGE_MAX = 500
+# 첫 페이지의 keyset 시작 위치
+KEYSET_START = (datetime.min.replace(tzinfo=pytz.utc), 0)
+
+# 2-2. 사이드바 조회 쿼리 (태그는 스케줄 행의 태그 스냅샷 - schedule_tag / tag 조인과 집계 없음)
+SIDEBAR_WINDOW_SQL = """
+    SELECT s.id, s.title, s.start_date, s.end_date, s.color, 
+           r.frequency, r.interval, r.until, r.count, 
+           s.tag_snapshot
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = %s AND s.deleted_at IS NULL
+    AND s.start_date <= %s
+    AND (
+        s.start_date >= %s
+        -- 이전 달에 시작한 반복 일정도 이번 달에 발생할 수 있음
+        OR (r.frequency IS NOT NULL AND (r.until IS NULL OR r.until >= %s))
+    )
+"""
+register_prepared_statement("sidebar_window", SIDEBAR_WINDOW_SQL)
+register_prepared_statement("sidebar_window_by_tags", SIDEBAR_WINDOW_SQL + LIST_TAG_FILTER_SQL)
+register_prepared_statement("sidebar_window_by_all_tags", SIDEBAR_WINDOW_SQL + LIST_ALL_TAGS_FILTER_SQL)
+register_prepared_statement("sidebar_window_by_ids", SIDEBAR_WINDOW_SQL + LIST_ID_FILTER_SQL)
+
+
+# 동시에 들어온 같은 조회 요청 병합 (엔드포인트별)
+list_flight = SingleFlight("list")
+sidebar_flight = SingleFlight("sidebar")
 
 
 def ensure_utc(dt: datetime) -> datetime:
@@ -30,13 +146,23 @@ def ensure_utc(dt: datetime) -> datetime:
         return pytz.utc.localize(dt)
     return dt
 # 2-1. [ 조회 ] 개인스케줄 - 통합
-@router.get("/list", response_model=ScheduleResponse)
+@router.get("/list", response_model=ScheduleListResponse)
 async def list_schedules(
     start_date: str,
     end_date: str,
     tag_ids: Optional[List[int]] = None,
+    tag_match: str = Query("any", pattern="^(any|all)$"),
+    limit: Optional[int] = Query(None, ge=1, le=LIST_PAGE_MAX),
+    cursor: Optional[str] = None,
     token: str = Depends(oauth2_scheme)
 ):
+    """
+    기간 내 스케줄을 조회하는 엔드포인트입니다.
+    tag_ids를 지정하면 태그 중 하나라도(tag_match=any, 기본) / 모두(tag_match=all) 붙은 스케줄만 반환합니다.
+    limit을 지정하면 (start_date, id) 기준 keyset 페이지네이션으로 limit 개의 스케줄만 반환하고,
+    다음 페이지가 있으면 next_cursor를 함께 반환합니다. 다음 페이지는 같은 조건에 cursor=next_cursor로 요청합니다.
+    같은 사용자의 같은 조건 요청이 동시에 들어오면 (탭 여러 개, 재시도, prefetch) 조회 한 번의 결과를 함께 받습니다.
+    """
     # JWT 토큰 검증 및 사용자 ID 추출
     try:
         uid = extract_user_id_from_token(token)
@@ -53,106 +179,180 @@ async def list_schedules(
     # 날짜 형식 검증 및 변환
     start_date_dt = datetime.fromisoformat(start_date).astimezone(pytz.utc)
     end_date_dt = datetime.fromisoformat(end_date).astimezone(pytz.utc)
+    after = (decode_cursor(cursor) if cursor else KEYSET_START) if limit else None
+    tag_filter = tuple(sorted(set(tag_ids))) if tag_ids else ()
+    match_all = tag_match == "all" and len(tag_filter) > 1
 
-    conn = get_db_connection()
+    try:
+        # 병합 키: (사용자, 정규화한 조건, 데이터 버전) - 쓰기 이후의 요청은 새로 조회
+        version = await run_in_threadpool(read_user_version, uid)
+        key = (uid, start_date_dt, end_date_dt, tag_filter, match_all, limit, after, version)
+        body = await list_flight.do(key, lambda: run_in_threadpool(
+            build_schedule_list, uid, start_date_dt, end_date_dt, list(tag_filter), limit, after, version, match_all
+        ))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching schedules: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve schedules."
+        )
+    return Response(content=body, media_type="application/json")
+
+
+def build_schedule_list(uid: int, start_date_dt: datetime, end_date_dt: datetime,
+                        tag_ids: List[int], limit: Optional[int], after, version: int,
+                        match_all: bool = False) -> bytes:
+    """
+    /list 응답을 만들어 JSON bytes로 반환하는 함수 (스레드풀에서 실행)
+    :param after: keyset 페이지네이션 시작 위치 (start_date, id) - limit이 없으면 None
+    :param version: 요청 시점의 user_version (구간 인덱스, 태그 비트맵 인덱스 검증용)
+    :param match_all: True면 모든 태그가 붙은 스케줄, False면 태그 중 하나라도 붙은 스케줄
+    """
+    # 태그 필터는 태그 비트맵 인덱스로 스케줄 ID를 먼저 고름 (인덱스가 replica 지연으로 오래되었으면 None -> SQL로 필터)
+    schedule_ids = None
+    if tag_ids:
+        schedule_ids = filter_schedule_ids_by_tags(uid, version, tag_ids, match_all)
+        if schedule_ids is not None and not schedule_ids:
+            return ScheduleListResponse(schedules=[], next_cursor=None).model_dump_json().encode("utf-8")
+
+    # 최신 구간 인덱스가 있으면 DB 조회 없이 응답 (페이지네이션이 없는 요청만)
+    if not limit and (not tag_ids or schedule_ids is not None):
+        index = get_interval_index(uid, version, start_date_dt, end_date_dt)
+        if index is not None:
+            return schedule_list_from_index(index, start_date_dt, end_date_dt,
+                                            set(schedule_ids) if schedule_ids is not None else None)
+
+    conn = get_db_connection(read_only=True, uid=uid)
     cur = conn.cursor()
 
     try:
-        # 기본 일정 및 반복 일정 조회
-        query = """
-            SELECT s.id, s.title, s.start_date, s.end_date, s.color, r.frequency, r.interval, r.until, r.count
-            FROM schedule s
-            LEFT JOIN recurrence r ON s.id = r.schedule_id
-            WHERE s.uid = %s
-            AND (s.start_date <= %s AND (s.end_date IS NULL OR s.end_date >= %s))
-        """
-        params = [uid, end_date_dt, start_date_dt]
-
-        if tag_ids:
-            query += """
-                AND EXISTS (
-                    SELECT 1
-                    FROM schedule_tag st
-                    WHERE st.schedule_id = s.id
-                    AND st.tag_id = ANY(%s)
-                )
-            """
+        # 기본 일정 및 반복 일정 조회 (태그 필터, 페이지네이션 여부에 따라 prepared statement 선택)
+        statement = "list_window"
+        params = [uid, end_date_dt, start_date_dt, start_date_dt]
+        if limit:
+            statement += "_page"
+        if schedule_ids is not None:
+            statement += "_by_ids"
+            params.append(schedule_ids)
+        elif match_all:
+            statement += "_by_all_tags"
+            params.extend([tag_ids, len(tag_ids)])
+        elif tag_ids:
+            statement += "_by_tags"
             params.append(tag_ids)
-
-        cur.execute(query, params)
+        if limit:
+            # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+            params.extend([after[0], after[1], limit + 1])
+        execute_prepared(cur, statement, params)
         rows = cur.fetchall()
 
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][2], rows[-1][0])
+
+        # 반복 일정은 설정된 엔진(python / sql)으로 쿼리 한 번에 펼침 (스케줄별 예외 조회 없음)
+        occurrences = expand_recurrences(
+            cur,
+            [(row[0], row[2], row[5], row[6], row[7], row[8]) for row in rows if row[5]],
+            start_date_dt,
+            end_date_dt,
+        )
+
         schedules = []
 
-        for row in rows:
-            try:
-                schedule_id, title, start_date, end_date, color, frequency, interval, until, count = row
-                start_date = ensure_utc(start_date)
-                end_date = ensure_utc(end_date)
-                until = ensure_utc(until) if until else None
-                requested_start = ensure_utc(start_date_dt)
-                requested_end = ensure_utc(end_date_dt)
-
-                logger.debug(f"Processing schedule_id={schedule_id}, frequency={frequency}, interval={interval}, until={until}, count={count}")
-
-                # 반복 일정이 있는 경우, 해당 기간 동안 발생하는 모든 일정을 계산
-                if frequency:
-                    interval = interval or 1  # interval이 None일 경우 기본값 1로 설정
-                    until = until or end_date_dt  # until이 None이면 요청된 기간의 끝으로 설정
-
-                    logger.info(f"Schedule {schedule_id} has recurrence with frequency={frequency}, interval={interval}, until={until}, count={count}")
-
-                    # 예외 일정 조회
-                    cur.execute("""
-                        SELECT start_date FROM recurrence_exception
-                        WHERE recurrence_id = (
-                            SELECT id FROM recurrence WHERE schedule_id = %s
-                        )
-                    """, [schedule_id])
-                    exception_rows = cur.fetchall()
-                    exceptions = {ensure_utc(exception_date[0]) for exception_date in exception_rows}
-
-                    if exceptions:
-                        logger.info(f"Schedule {schedule_id} has recurrence exceptions: {exceptions}")
-
-                    # 반복 일정 생성 (예외 일정을 고려)
-                    events = generate_recurring_events(
-                        start_date=start_date,
-                        frequency=frequency,
-                        interval=interval,
-                        until=until,
-                        count=count,
-                        requested_start=requested_start,
-                        requested_end=requested_end,
-                        exceptions=exceptions  # 예외 일정 전달
-                    )
+        for schedule_id, title, start_date, end_date, color, frequency, interval, until, count in rows:
+            start_date = ensure_utc(start_date)
+            end_date = ensure_utc(end_date)
 
-                    # 날짜 리스트로 변환
-                    dates = [ScheduleDate(start_date=event, end_date=event + (end_date - start_date)) for event in events]
+            if frequency:
+                events = occurrences[schedule_id]
+                if not events:
+                    # 기간 안에 발생하지 않는 반복 일정 (기간 전에 끝났거나 모두 예외)
+                    continue
+                dates = [ScheduleDate(start_date=event, end_date=event + (end_date - start_date)) for event in events]
+            else:
+                # 반복이 아닌 단일 일정
+                dates = [ScheduleDate(start_date=start_date, end_date=end_date)]
 
-                    schedules.append(ScheduleResponseItem(
-                        id=schedule_id,
-                        title=title,
-                        color=color,
-                        dates=dates
-                    ))
-                    logger.debug(f"Added event: {schedules[-1]}")
-                else:
-                    # 반복이 아닌 단일 일정 추가
-                    schedules.append(ScheduleResponseItem(
-                        id=schedule_id,
-                        title=title,
-                        color=color,
-                        dates=[ScheduleDate(start_date=start_date, end_date=end_date)]
-                    ))
-                    logger.debug(f"Added single schedule: {schedules[-1]}")
-
-            except Exception as e:
-                logger.error(f"Error processing row {row}: {e}")
-                raise
-
-        return ScheduleResponse(schedules=schedules)
+            schedules.append(ScheduleResponseItem(
+                id=schedule_id,
+                title=title,
+                color=color,
+                dates=dates
+            ))
+
+        return ScheduleListResponse(schedules=schedules, next_cursor=next_cursor).model_dump_json().encode("utf-8")
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+def schedule_list_from_index(index: IntervalIndex, start_date_dt: datetime, end_date_dt: datetime,
+                             schedule_ids: Optional[set] = None) -> bytes:
+    """
+    구간 인덱스로 /list 응답을 만드는 함수 (SQL 조회와 같은 결과)
+    단일 일정은 기간과 겹치는 것, 반복 일정은 기간 안에서 시작하는 발생만 포함합니다.
+    :param schedule_ids: 태그 필터로 고른 스케줄 ID (None이면 모든 스케줄)
+    """
+    dates_by_schedule = {}
+    for i in index.search(start_date_dt, end_date_dt):
+        if index.recurring[i] and index.starts[i] < start_date_dt:
+            continue
+        if schedule_ids is not None and index.schedule_ids[i] not in schedule_ids:
+            continue
+        dates_by_schedule.setdefault(index.schedule_ids[i], []).append(
+            ScheduleDate(start_date=ensure_utc(index.starts[i]), end_date=ensure_utc(index.ends[i]))
+        )
+
+    schedules = []
+    for schedule_id, dates in dates_by_schedule.items():
+        title, color, _, _ = index.schedules[schedule_id]
+        schedules.append(ScheduleResponseItem(id=schedule_id, title=title, color=color, dates=dates))
+    return ScheduleListResponse(schedules=schedules, next_cursor=None).model_dump_json().encode("utf-8")
+
+## 2-14. [ 조회 ] 개인스케줄 - 목록 관리 (기간 조건 없는 전체 목록)
+@router.get("/list-all", response_model=ScheduleSummaryPage)
+async def list_all_schedules(
+    limit: int = Query(50, ge=1, le=LIST_PAGE_MAX),
+    cursor: Optional[str] = None,
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    사용자의 모든 스케줄을 시작 시각 순으로 페이지 단위 조회하는 엔드포인트입니다. (반복 일정은 펼치지 않음)
+    (start_date, id) 기준 keyset 페이지네이션을 사용하며, 다음 페이지는 cursor=next_cursor로 요청합니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+    after_start, after_id = decode_cursor(cursor) if cursor else KEYSET_START
+
+    # replica 커넥션은 새로 연결할 수 있으므로 이벤트 루프를 막지 않도록 스레드풀에서 가져옴
+    conn = await run_in_threadpool(get_db_connection, read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        execute_prepared(cur, "schedule_page", (uid, after_start, after_id, limit + 1))
+        rows = cur.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][3], rows[-1][0])
+
+        items = [
+            ScheduleSummary(
+                id=schedule_id,
+                title=title,
+                color=color,
+                start_date=ensure_utc(start_date),
+                end_date=ensure_utc(end_date),
+                is_repeat=is_repeat
+            )
+            for schedule_id, title, color, start_date, end_date, is_repeat in rows
+        ]
+        return ScheduleSummaryPage(items=items, next_cursor=next_cursor)
     except Exception as e:
+        logger.error(f"Error fetching schedule page: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve schedules."
@@ -166,6 +366,7 @@ async def list_schedules(
 async def get_sidebar_schedules(
     selected_date: str,
     tag_ids: Optional[List[int]] = None,
+    tag_match: str = Query("any", pattern="^(any|all)$"),
     token: str = Depends(oauth2_scheme)
 ):
     try:
@@ -193,73 +394,80 @@ async def get_sidebar_schedules(
     next_month = (first_day_of_month + timedelta(days=32)).replace(day=1)
     last_day_of_month = next_month - timedelta(days=1)
 
-    conn = get_db_connection()
+    tag_filter = tuple(sorted(set(tag_ids))) if tag_ids else ()
+    match_all = tag_match == "all" and len(tag_filter) > 1
+
+    try:
+        # 병합 키: (사용자, 조회 월, 정규화한 태그 필터, 데이터 버전)
+        version = await run_in_threadpool(read_user_version, uid)
+        key = (uid, first_day_of_month, tag_filter, match_all, version)
+        body = await sidebar_flight.do(key, lambda: run_in_threadpool(
+            build_sidebar_schedules, uid, first_day_of_month, last_day_of_month, list(tag_filter), version, match_all
+        ))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching schedules: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve sidebar schedules."
+        )
+    return Response(content=body, media_type="application/json")
+
+
+def build_sidebar_schedules(uid: int, first_day_of_month: datetime, last_day_of_month: datetime,
+                            tag_ids: List[int], version: int, match_all: bool = False) -> bytes:
+    """
+    /sidebar 응답을 만들어 JSON bytes로 반환하는 함수 (스레드풀에서 실행)
+    :param version: 요청 시점의 user_version (태그 비트맵 인덱스 검증용)
+    """
+    # 태그 필터는 태그 비트맵 인덱스로 스케줄 ID를 먼저 고름 (인덱스가 replica 지연으로 오래되었으면 None -> SQL로 필터)
+    schedule_ids = None
+    if tag_ids:
+        schedule_ids = filter_schedule_ids_by_tags(uid, version, tag_ids, match_all)
+        if schedule_ids is not None and not schedule_ids:
+            return SidebarScheduleResponse(side_schedules=[]).model_dump_json().encode("utf-8")
+
+    conn = get_db_connection(read_only=True, uid=uid)
     cur = conn.cursor()
 
     try:
-        # Schedule 데이터 조회 쿼리
-        query = """
-            SELECT s.id, s.title, s.start_date, s.end_date, s.color, 
-                   r.frequency, r.interval, r.until, r.count, 
-                   array_agg(st.tag_id) as tag_ids, array_agg(t.title) as tag_names
-            FROM schedule s
-            LEFT JOIN recurrence r ON s.id = r.schedule_id
-            LEFT JOIN schedule_tag st ON s.id = st.schedule_id
-            LEFT JOIN tag t ON st.tag_id = t.id
-            WHERE s.uid = %s
-            AND s.start_date >= %s
-            AND s.start_date <= %s
-            GROUP BY s.id, r.frequency, r.interval, r.until, r.count
-        """
-        params = [uid, first_day_of_month, last_day_of_month]
-
-        # 태그 필터링 추가
-        if tag_ids:
-            query += " HAVING array_agg(st.tag_id) && %s"
+        # Schedule 데이터 조회 (태그 필터 여부에 따라 prepared statement 선택)
+        params = [uid, last_day_of_month, first_day_of_month, first_day_of_month]
+        if schedule_ids is not None:
+            params.append(schedule_ids)
+            execute_prepared(cur, "sidebar_window_by_ids", params)
+        elif match_all:
+            params.extend([tag_ids, len(tag_ids)])
+            execute_prepared(cur, "sidebar_window_by_all_tags", params)
+        elif tag_ids:
             params.append(tag_ids)
-
-        cur.execute(query, params)
+            execute_prepared(cur, "sidebar_window_by_tags", params)
+        else:
+            execute_prepared(cur, "sidebar_window", params)
         rows = cur.fetchall()
 
+        # 반복 일정은 설정된 엔진(python / sql)으로 쿼리 한 번에 펼침 (스케줄별 예외 조회 없음)
+        occurrences = expand_recurrences(
+            cur,
+            [(row[0], row[2], row[5], row[6], row[7], row[8]) for row in rows if row[5]],
+            first_day_of_month,
+            last_day_of_month,
+        )
+
         schedules_by_date = {}
 
         for row in rows:
-            schedule_id, title, start_date, end_date, color, frequency, interval, until, count, tag_id_list, tag_name_list = row
+            schedule_id, title, start_date, end_date, color, frequency, interval, until, count, tag_snapshot = row
             is_group = False
             start_date = ensure_utc(start_date)
             end_date = ensure_utc(end_date)
-            until = ensure_utc(until) if until else None
 
             schedule_type = "group" if is_group else "personal"
 
-            # Recurrence 예외 처리
-            cur.execute("""
-                SELECT exception_date FROM recurrence_exception
-                WHERE recurrence_id = (
-                    SELECT id FROM recurrence WHERE schedule_id = %s
-                )
-            """, [schedule_id])
-            exception_rows = cur.fetchall()
-            exceptions = {ensure_utc(exception_date[0]) for exception_date in exception_rows}
-
             # Recurrence 처리
             if frequency:
-                interval = interval or 1
-                until = until or last_day_of_month
-
-                events = generate_recurring_events(
-                    start_date=start_date,
-                    frequency=frequency,
-                    interval=interval,
-                    until=until,
-                    count=count,
-                    requested_start=first_day_of_month,
-                    requested_end=last_day_of_month,
-                    exceptions=exceptions
-                )
-
-                for event in events:
-                    event = ensure_utc(event)
+                for event in occurrences[schedule_id]:
                     if event not in schedules_by_date:
                         schedules_by_date[event] = []
 
@@ -270,7 +478,7 @@ async def get_sidebar_schedules(
                         "end_date": end_date,
                         "color": color,
                         "type": schedule_type,
-                        "tags": [{"id": tag_id, "name": tag_name} for tag_id, tag_name in zip(tag_id_list, tag_name_list) if tag_id is not None and tag_name is not None]
+                        "tags": tag_snapshot
                     })
             else:
                 # Non-recurring event 처리
@@ -284,7 +492,7 @@ async def get_sidebar_schedules(
                     "end_date": end_date,
                     "color": color,
                     "type": schedule_type,
-                    "tags": [{"id": tag_id, "name": tag_name} for tag_id, tag_name in zip(tag_id_list, tag_name_list) if tag_id is not None and tag_name is not None]
+                    "tags": tag_snapshot
                 })
 
         # Response로 side_schedules 변환
@@ -296,14 +504,7 @@ async def get_sidebar_schedules(
             for start_date, schedules in sorted(schedules_by_date.items())
         ]
 
-        return SidebarScheduleResponse(side_schedules=side_schedules)
-
-    except Exception as e:
-        logger.error(f"Error fetching schedules: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve sidebar schedules."
-        )
+        return SidebarScheduleResponse(side_schedules=side_schedules).model_dump_json().encode("utf-8")
     finally:
         cur.close()
         close_db_connection(conn)
@@ -328,54 +529,445 @@ async def total_tags(token: str = Depends(oauth2_scheme)):
             detail="An internal error occurred during token validation."
         )
     
+    try:
+        # 개인 태그와 그룹 태그를 커넥션 하나, 쿼리 한 번으로 가져오기 (사용자별 캐시)
+        personal_tags, group_tags = await run_in_threadpool(load_total_tags, uid)
+
+        per_tags = [Tag(**tag) for tag in personal_tags]
+        group_list = [Group(id=group["id"], name=group["name"], tags=[Tag(**tag) for tag in group["tags"]])
+                      for group in group_tags]
+
+        return TotalTags(per_tags=per_tags, groups=group_list)
+
+    except Exception as e:
+        print(f"Error fetching total tags: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch total tags."
+        )
+
+## 2-13. [ 내보내기 ] 개인스케줄 - iCalendar 피드
+# 서버 측 커서에서 한 번에 가져오는 행 수
+EXPORT_CHUNK_SIZE = 500
+EXPORT_FEED_SQL = """
+    SELECT s.id, s.title, s.note, s.start_date, s.end_date, s.updated_at,
+           r.frequency, r.interval, r.until, r.count,
+           COALESCE((
+               SELECT array_agg(e.start_date ORDER BY e.start_date)
+               FROM recurrence_exception e WHERE e.recurrence_id = r.id
+           ), '{}') AS exdates,
+           COALESCE((
+               SELECT array_agg(t.title ORDER BY t.title)
+               FROM schedule_tag st JOIN tag t ON t.id = st.tag_id
+               WHERE st.schedule_id = s.id
+           ), '{}') AS tags,
+           COALESCE((
+               SELECT array_agg(days_before ORDER BY days_before)
+               FROM reminder WHERE schedule_id = s.id
+           ), '{}') AS reminders
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = %s AND s.deleted_at IS NULL
+    ORDER BY s.id
+"""
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/export.ics")
+async def export_schedules_feed(
+    request: Request,
+    feed_token: Optional[str] = None,
+    token: Optional[str] = Depends(oauth2_scheme_optional)
+):
+    """
+    사용자의 일정을 구독 가능한 iCalendar(.ics) 피드로 내보내는 엔드포인트입니다.
+    - 반복 일정은 펼치지 않고 RRULE / EXDATE 로 내보냄
+    - 서버 측 커서(named cursor)에서 EXPORT_CHUNK_SIZE 단위로 읽어 스트리밍하므로 메모리 사용량이 일정
+    - ETag는 사용자 데이터 버전(user_version)이며, If-None-Match가 일치하면 버전 조회 한 번으로 304를 반환
+    - 버전은 짧게 빌린 커넥션으로 조회하고, 본문용 커넥션은 스트림 안에서 가져옴 (본문을 시작하지 않고 끊어져도 커넥션이 남지 않음)
+      본문은 버전 조회 이후의 스냅샷이므로 ETag 보다 새로울 수는 있어도 오래되지는 않음 (다음 요청에서 다시 받을 뿐)
+    캘린더 앱 구독 URL에서는 Authorization 헤더 대신 feed_token 쿼리 파라미터로 토큰을 전달할 수 있습니다.
+    """
+    token = token or feed_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+
     conn = get_db_connection()
     cur = conn.cursor()
     try:
-        # 개인 태그 가져오기
-        print(f"Fetching personal tags for user ID: {uid}")  # 로깅 추가
-        personal_tags = check_per_tags(uid)
-        print(f"Personal tags fetched: {personal_tags}")  # 로깅 추가
-
-        # 검증: personal_tags가 올바르게 반환되는지 확인
-        if not personal_tags:
-            print(f"No personal tags found for user ID: {uid}")  # 로깅 추가
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No personal tags found."
+        version, updated_at = get_user_version(cur, uid)
+        conn.rollback()
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error reading user version: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to export schedules",
+        )
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+    etag = f'W/"{uid}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if updated_at:
+        headers["Last-Modified"] = format_datetime(updated_at.astimezone(pytz.utc), usegmt=True)
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    def feed_stream():
+        # 커넥션은 스트림을 시작할 때 가져오고 끝나면(오류 / 연결 종료 포함) 반환
+        feed_conn = get_db_connection()
+        feed_cur = feed_conn.cursor(name=f"ics_export_{uid}")
+        feed_cur.itersize = EXPORT_CHUNK_SIZE
+        try:
+            yield ICS_CALENDAR_HEADER.encode("utf-8")
+            feed_cur.execute(EXPORT_FEED_SQL, (uid,))
+            while True:
+                rows = feed_cur.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield "".join(serialize_vevent(*row) for row in rows).encode("utf-8")
+            yield ICS_CALENDAR_FOOTER.encode("utf-8")
+        except Exception as e:
+            logger.error(f"Error streaming schedule feed for user {uid}: {e}")
+            raise
+        finally:
+            feed_cur.close()
+            feed_conn.rollback()
+            close_db_connection(feed_conn)
+
+    return StreamingResponse(feed_stream(), media_type="text/calendar; charset=utf-8", headers=headers)
+
+## 2-15. [ 동기화 ] 개인스케줄 - 변경분(delta) 동기화
+SYNC_SCHEDULES_SQL = """
+    SELECT s.id, s.title, s.note, s.important, s.color, s.start_date, s.end_date, s.updated_at,
+           r.frequency, r.interval, r.until, r.count,
+           COALESCE((
+               SELECT array_agg(e.start_date ORDER BY e.start_date)
+               FROM recurrence_exception e WHERE e.recurrence_id = r.id
+           ), '{}') AS exception_starts,
+           COALESCE((
+               SELECT array_agg(e.end_date ORDER BY e.start_date)
+               FROM recurrence_exception e WHERE e.recurrence_id = r.id
+           ), '{}') AS exception_ends,
+           COALESCE((
+               SELECT array_agg(st.tag_id ORDER BY st.tag_id)
+               FROM schedule_tag st WHERE st.schedule_id = s.id
+           ), '{}') AS tag_ids,
+           COALESCE((
+               SELECT array_agg(days_before ORDER BY days_before)
+               FROM reminder WHERE schedule_id = s.id
+           ), '{}') AS reminders
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = %s AND s.deleted_at IS NULL
+"""
+
+
+def parse_sync_token(since: Optional[str]) -> Optional[int]:
+    if since is None or since == "":
+        return None
+    try:
+        version = int(since)
+    except ValueError:
+        version = -1
+    if version < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token.")
+    return version
+
+
+@router.get("/sync", response_model=SyncResponse)
+async def sync_schedules(since: Optional[str] = None, token: str = Depends(oauth2_scheme)):
+    """
+    마지막 동기화 이후 바뀐 스케줄(반복 규칙, 반복 예외, 태그, 알림 포함)과 태그, 삭제된 항목(tombstone)을 반환하는 엔드포인트입니다.
+    - since 없이 요청하면 전체 스냅샷(full=true)을 반환
+    - 응답의 token을 저장해 두었다가 다음 요청의 since로 전달
+    - since가 서버의 버전보다 크면(데이터 복구 등) 전체 스냅샷으로 응답
+    반복 일정은 펼치지 않으므로, 전송량은 바뀐 행 수에만 비례합니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+    since_version = parse_sync_token(since)
+
+    # replica 커넥션은 새로 연결할 수 있으므로 이벤트 루프를 막지 않도록 스레드풀에서 가져옴
+    conn = await run_in_threadpool(get_db_connection, read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        # 스냅샷을 고정하여 반환하는 token(버전)과 내용이 항상 일치하도록 함
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;\n" + GET_USER_VERSION_SQL, (uid,))
+        row = cur.fetchone()
+        version = row[0] if row else 0
+        full = since_version is None or since_version > version
+
+        deleted_schedule_ids, deleted_tag_ids = [], []
+        if full:
+            cur.execute(SYNC_SCHEDULES_SQL, (uid,))
+            schedule_rows = cur.fetchall()
+            cur.execute("SELECT id, title FROM tag WHERE uid = %s", (uid,))
+            tag_rows = cur.fetchall()
+        else:
+            cur.execute(CHANGES_SINCE_SQL, (uid, since_version))
+            changed_schedule_ids, changed_tag_ids = [], []
+            for entity, entity_id, op in cur.fetchall():
+                if entity == ENTITY_SCHEDULE:
+                    (deleted_schedule_ids if op == OP_DELETE else changed_schedule_ids).append(entity_id)
+                elif entity == ENTITY_TAG:
+                    (deleted_tag_ids if op == OP_DELETE else changed_tag_ids).append(entity_id)
+
+            schedule_rows = []
+            if changed_schedule_ids:
+                cur.execute(SYNC_SCHEDULES_SQL + " AND s.id = ANY(%s)", (uid, changed_schedule_ids))
+                schedule_rows = cur.fetchall()
+            # 바뀐 태그 + 바뀐 스케줄이 사용하는 태그 (새 태그는 스케줄과 함께 생성됨)
+            tag_ids = set(changed_tag_ids)
+            for row in schedule_rows:
+                tag_ids.update(row[14])
+            tag_rows = []
+            if tag_ids:
+                cur.execute("SELECT id, title FROM tag WHERE uid = %s AND id = ANY(%s)", (uid, list(tag_ids)))
+                tag_rows = cur.fetchall()
+
+        schedules = [
+            SyncSchedule(
+                id=schedule_id,
+                title=title,
+                note=note,
+                important=important,
+                color=color,
+                start_date=ensure_utc(start_date),
+                end_date=ensure_utc(end_date),
+                updated_at=updated_at,
+                is_repeat=frequency is not None,
+                repeat_frequency=frequency,
+                repeat_interval=interval,
+                repeat_end_date=until,
+                repeat_count=count,
+                exceptions=[SyncException(start_date=ensure_utc(start), end_date=ensure_utc(end))
+                            for start, end in zip(exception_starts, exception_ends)],
+                tag_ids=tag_id_list,
+                reminders=reminders,
             )
+            for (schedule_id, title, note, important, color, start_date, end_date, updated_at,
+                 frequency, interval, until, count, exception_starts, exception_ends, tag_id_list, reminders) in schedule_rows
+        ]
+        return SyncResponse(
+            token=str(version),
+            full=full,
+            schedules=schedules,
+            tags=[Tag(id=tag_id, name=title) for tag_id, title in tag_rows],
+            deleted_schedule_ids=deleted_schedule_ids,
+            deleted_tag_ids=deleted_tag_ids,
+        )
+    except Exception as e:
+        logger.error(f"Error syncing schedules: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to sync schedules."
+        )
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
 
-        # per_tags 생성
-        print("Formatting personal tags")  # 로깅 추가
-        per_tags = [Tag(id=t[0], name=t[1]) for t in personal_tags]
-        # print(f"Formatted per_tags: {per_tags}")  # 로깅 추가
+## 2-16. [ 조회 ] 개인/그룹 - 빈 시간 (free/busy)
+@router.get("/freebusy", response_model=FreeBusyResponse)
+async def get_freebusy(
+    start_date: str,
+    end_date: str,
+    min_minutes: int = Query(30, ge=1, le=24 * 60),
+    uids: Optional[List[int]] = Query(None),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    기간 안의 바쁜 구간과 min_minutes 이상인 빈 구간을 반환하는 엔드포인트입니다.
+    반복 일정은 발생별로 펼쳐 포함하며, uids를 지정하면 같은 그룹 멤버들의 일정까지 합쳐 모두가 비어 있는 시간을 찾습니다.
+    기간은 최대 freebusy_max_days 일이며, 조회가 freebusy_timeout_ms 를 넘기면 503을 반환합니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
 
-        # 그룹 정보는 아직 정의되지 않았으므로 빈 리스트로 반환
-        group_list = []
-        # print("Group list initialized as empty.")  # 로깅 추가
+    try:
+        window_start = datetime.fromisoformat(start_date).astimezone(pytz.utc)
+        window_end = datetime.fromisoformat(end_date).astimezone(pytz.utc)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date format.")
+    if window_end <= window_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must be after start_date.")
+    if window_end - window_start > timedelta(days=FREEBUSY_MAX_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The window can be at most {FREEBUSY_MAX_DAYS} days."
+        )
 
-        # TotalTags 객체 생성
-        print("Creating TotalTags object")  # 로깅 추가
-        total_tags = TotalTags(per_tags=per_tags, groups=group_list)
-        # print(f"TotalTags object created: {total_tags}")  # 로깅 추가
-        
-        # TotalTags 객체를 직접 반환
-        # print("Returning TotalTags object")  # 로깅 추가
-        return total_tags
+    try:
+        queried_uids, busy, free = await run_in_threadpool(
+            build_freebusy, uid, uids or [], window_start, window_end, timedelta(minutes=min_minutes)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching free/busy: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve free/busy."
+        )
 
+    return FreeBusyResponse(
+        start_date=window_start,
+        end_date=window_end,
+        uids=queried_uids,
+        busy=[FreeBusyInterval(start_date=start, end_date=end) for start, end in busy],
+        free=[FreeBusyInterval(start_date=start, end_date=end) for start, end in free],
+    )
+
+## 2-17. [ 검색 ] 개인스케줄 - 제목 / 메모 / 태그 검색
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    스케줄 제목, 메모, 태그 이름을 오타를 허용해 검색하는 엔드포인트입니다.
+    trigram 인덱스로 후보를 찾고 점수(score) 순으로 정렬하며, 반복 일정은 지금 이후의 다음 발생(next_occurrence)을 함께 반환합니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+
+    query = " ".join(q.split())
+    if not query:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search query is empty.")
+
+    try:
+        results = await run_in_threadpool(search_schedules, uid, query, limit)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error fetching total tags: {e}")
+        logger.error(f"Error searching schedules: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch total tags."
+            detail="Failed to search schedules."
+        )
+    return SearchResponse(query=query, results=[SearchResultItem(**result) for result in results])
+
+## 2-18. [ 조회 ] 태그 자동완성
+@router.get("/tags/autocomplete", response_model=TagAutocompleteResponse)
+async def autocomplete_tags(
+    prefix: str = Query("", max_length=50),
+    limit: int = Query(10, ge=1, le=50),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    입력 중인 접두사로 시작하는 태그를 사용 횟수 순으로 반환하는 엔드포인트입니다. (대소문자 구분 없음)
+    접두사가 비어 있으면 가장 많이 사용한 태그를 반환합니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+
+    try:
+        suggestions = await run_in_threadpool(suggest_tags, uid, prefix.strip(), limit)
+    except Exception as e:
+        logger.error(f"Error autocompleting tags: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to autocomplete tags."
+        )
+    return TagAutocompleteResponse(
+        prefix=prefix,
+        tags=[TagSuggestion(name=name, usage=usage) for name, usage in suggestions]
+    )
+
+## 2-19. [ 수정 ] 개인 태그 - 이름 변경
+@router.patch("/tags/{tag_id}", response_model=Tag)
+async def rename_tag(tag_id: int, tag_update: RenameTag, token: str = Depends(oauth2_scheme)):
+    """
+    개인 태그의 이름을 바꾸는 엔드포인트입니다.
+    태그가 붙은 스케줄의 태그 스냅샷도 같은 트랜잭션에서 갱신합니다. 같은 이름의 태그가 이미 있으면 409를 반환합니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+    name = tag_update.name.strip()
+    if not name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tag name must not be empty.")
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        # 태그 행을 잠가, 이 태그를 동시에 연결하는 트랜잭션(schedule_tag 외래 키 검사)과 순서대로 실행되도록 함
+        # (연결하는 쪽의 스냅샷 갱신이 바뀐 이름을, 이름 변경 쪽의 스냅샷 갱신이 새 연결을 보게 됨)
+        cur.execute("SELECT title FROM tag WHERE id = %s AND uid = %s AND is_personal FOR UPDATE", (tag_id, uid))
+        row = cur.fetchone()
+        if not row:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found")
+
+        if row[0] != name:
+            cur.execute("SELECT 1 FROM tag WHERE uid = %s AND title = %s AND id <> %s", (uid, name, tag_id))
+            if cur.fetchone():
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A tag with this name already exists.")
+
+            # 이름 변경, 태그 스냅샷 갱신, 버전 증가와 변경 기록을 한 번의 왕복으로 커밋
+            batch = PipelinedBatch(cur)
+            batch.add("UPDATE tag SET title = %s WHERE id = %s", (name, tag_id))
+            batch.add(REFRESH_TAG_SNAPSHOTS_FOR_TAG_SQL, {"tag_id": tag_id})
+            add_bump_user_version(batch, uid)
+            add_record_changes(batch, uid, ENTITY_TAG, [tag_id])
+            batch.commit()
+            invalidate_tag_autocomplete(uid)
+        return Tag(id=tag_id, name=name)
+    except HTTPException:
+        conn.rollback()
+        raise
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error renaming tag: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to rename tag."
         )
     finally:
-        # print("Closing database connection")  # 로깅 추가
         cur.close()
         close_db_connection(conn)
 
+def raise_on_conflicts(cur, uid: int, candidates, exclude_id: Optional[int] = None):
+    """
+    새 일정의 발생과 겹치는 기존 일정이 있으면 409 (detail.conflicts: 겹치는 발생 목록)
+    """
+    conflicts = find_conflicts(cur, uid, candidates, exclude_id=exclude_id)
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "The schedule overlaps existing schedules.",
+                "conflicts": [
+                    ScheduleConflict(id=schedule_id, title=title, start_date=start, end_date=end).model_dump(mode="json")
+                    for schedule_id, title, start, end in conflicts
+                ],
+            },
+        )
+
 ## 2-4. [생성] 개인스케줄 - 일정생성
 @router.post("/create-schedule", response_model=CreateScheduleResponse)
-async def create_schedule(schedule: CreateSchedule, token: str = Depends(oauth2_scheme)):
+async def create_schedule(schedule: CreateSchedule, check_conflicts: bool = False, token: str = Depends(oauth2_scheme)):
+    """
+    일정을 생성하는 엔드포인트입니다.
+    check_conflicts=true 이면 기존 일정(반복 일정의 발생 포함, 예외 제외)과 겹치는지 먼저 검사하고,
+    겹치면 생성하지 않고 409와 겹치는 발생 목록(detail.conflicts)을 반환합니다.
+    """
+    conn = cur = None
     try:
         # JWT 토큰 검증 및 사용자 ID 추출
         uid = extract_user_id_from_token(token)
@@ -389,6 +981,17 @@ async def create_schedule(schedule: CreateSchedule, token: str = Depends(oauth2_
             
         conn = get_db_connection()
         cur = conn.cursor()
+
+        # 겹침 검사
+        if check_conflicts:
+            raise_on_conflicts(cur, uid, candidate_occurrences(
+                schedule.start_date,
+                schedule.end_date,
+                schedule.repeat_frequency if schedule.is_repeat else None,
+                schedule.repeat_interval,
+                schedule.repeat_end_date,
+                schedule.repeat_count,
+            ))
         
         # 일정 테이블에 데이터 삽입
         cur.execute(
@@ -448,33 +1051,220 @@ async def create_schedule(schedule: CreateSchedule, token: str = Depends(oauth2_
                 )
             )
 
-        # 알림 설정
+        # 알림 설정 (email: 알림 메일 발송 여부)
         if schedule.reminders:
             for reminder in schedule.reminders:
                 cur.execute(
                     """
-                    INSERT INTO reminder (days_before, schedule_id)
-                    VALUES (%s, %s)
+                    INSERT INTO reminder (days_before, schedule_id, email)
+                    VALUES (%s, %s, %s)
                     """,
                     (
                         reminder,
-                        schedule_id
+                        schedule_id,
+                        bool(schedule.reminder_email_noti)
                     )
                 )
 
-        conn.commit()
+        # 태그 스냅샷 갱신, 버전 증가와 변경 기록은 커밋과 함께 전송
+        batch = PipelinedBatch(cur)
+        if schedule.tags:
+            add_refresh_tag_snapshots(batch, [schedule_id])
+        add_bump_user_version(batch, uid)
+        add_record_changes(batch, uid, ENTITY_SCHEDULE, [schedule_id])
+        add_refresh_reminder_due(batch, uid)
+        batch.commit()
+        record_tag_usage(uid, schedule.tags)
         return {"id": schedule_id}
+    except HTTPException:
+        if conn:
+            conn.rollback()
+        raise
     except Exception as e:
-        conn.rollback()
+        if conn:
+            conn.rollback()
         print(f"Error creating schedule: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create schedule",
         )
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            close_db_connection(conn)
+
+## 2-11. [ 일괄 ] 개인스케줄 - 일괄 생성/수정/삭제
+@router.post("/batch", response_model=BatchResponse)
+async def batch_schedules(batch_request: BatchRequest, token: str = Depends(oauth2_scheme)):
+    """
+    여러 개의 생성/수정/삭제 작업을 하나의 트랜잭션으로 처리하는 엔드포인트입니다.
+    모든 작업을 먼저 검증하고, 하나라도 잘못된 작업이 있으면 아무것도 반영하지 않고 작업별 결과를 422로 반환합니다.
+    검증을 통과하면 작업 개수와 상관없이 일정한 개수의 일괄(bulk) 쿼리로 반영합니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+
+    # 1. 요청 형식 검증 (DB 접근 없이)
+    results = []
+    creates, updates, deletes = [], [], []
+    target_sids = set()
+    for index, operation in enumerate(batch_request.operations):
+        result = BatchItemResult(index=index, op=operation.op, id=operation.sid, status="pending")
+        try:
+            if operation.op == "create":
+                creates.append((index, CreateSchedule.model_validate(operation.schedule or {})))
+            elif operation.op in ("update", "delete"):
+                if operation.sid is None:
+                    raise ValueError(f"sid is required for {operation.op}")
+                if operation.sid in target_sids:
+                    raise ValueError(f"Duplicate sid {operation.sid} in batch")
+                target_sids.add(operation.sid)
+                if operation.op == "update":
+                    updates.append((index, operation.sid, UpdateSchedule.model_validate(operation.schedule or {})))
+                else:
+                    deletes.append((index, operation.sid))
+            else:
+                raise ValueError(f"Invalid op: {operation.op}")
+        except ValueError as e:  # pydantic ValidationError 포함
+            result.status = "invalid"
+            result.detail = str(e)
+        results.append(result)
+
+    def reject():
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Batch rejected. No operation was applied.",
+                "results": [r.model_dump() for r in results],
+            }
+        )
+
+    if any(r.status == "invalid" for r in results):
+        reject()
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        # 2. 수정/삭제 대상 스케줄의 소유권 확인
+        if target_sids:
+            # (삭제와 동시에 실행되어 삭제된 스케줄에 자식 행을 다시 만들지 않도록 행을 잠금)
+            cur.execute("SELECT id FROM schedule WHERE uid = %s AND id = ANY(%s) AND deleted_at IS NULL ORDER BY id FOR UPDATE",
+                        (uid, list(target_sids)))
+            owned = {row[0] for row in cur.fetchall()}
+            for result in results:
+                if result.op in ("update", "delete") and result.id not in owned:
+                    result.status = "not_found"
+                    result.detail = "Schedule not found"
+            if len(owned) != len(target_sids):
+                conn.rollback()
+                reject()
+
+        # 3. 생성할 스케줄 ID를 미리 발급한 뒤 모든 작업을 한 번에 전송하고 커밋
+        new_ids = allocate_schedule_ids(cur, len(creates))
+        batch = PipelinedBatch(cur)
+        add_bulk_create(batch, uid, new_ids, [schedule for _, schedule in creates])
+        add_bulk_update(batch, uid, [sid for _, sid, _ in updates], [update for _, _, update in updates])
+        add_bulk_delete(batch, uid, [sid for _, sid in deletes])
+        add_bump_user_version(batch, uid)
+        add_record_changes(batch, uid, ENTITY_SCHEDULE, new_ids + [sid for _, sid, _ in updates])
+        add_record_changes(batch, uid, ENTITY_SCHEDULE, [sid for _, sid in deletes], op=OP_DELETE)
+        add_refresh_reminder_due(batch, uid)
+        batch.commit()
+
+        for (index, _), new_id in zip(creates, new_ids):
+            results[index].id = new_id
+            results[index].status = "created"
+        for index, _, _ in updates:
+            results[index].status = "updated"
+        for index, _ in deletes:
+            results[index].status = "deleted"
+
+        logger.info(f"Batch applied for user {uid}: {len(creates)} created, {len(updates)} updated, {len(deletes)} deleted")
+        return BatchResponse(results=results)
+    except HTTPException:
+        raise
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error applying schedule batch: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to apply schedule batch",
+        )
     finally:
         cur.close()
         close_db_connection(conn)
 
+## 2-12. [ 가져오기 ] 개인스케줄 - iCalendar / CSV 가져오기
+@router.post("/import")
+async def import_schedules_file(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = None,
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    업로드한 .ics 또는 .csv 파일의 일정을 가져오는 엔드포인트입니다.
+    파일은 한 줄씩 파싱하여 청크 단위로 COPY 하므로 파일 크기와 상관없이 메모리 사용량이 일정합니다.
+    스트리밍 전에 파일 전체를 한 번 파싱하여, 읽을 수 없거나 일정이 없거나 해석할 수 없는 일정이 있으면
+    아무것도 가져오지 않고 400 / 422 (detail.errors: 행 번호와 오류)를 반환합니다.
+    응답은 NDJSON 스트림으로, 청크마다 진행 상황(status=progress)을 보내고 마지막에 status=done 또는 status=error 를 보냅니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+
+    file_format = (file_format or (file.filename or "").rsplit(".", 1)[-1]).lower()
+    if file_format not in ("ics", "csv"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file format. Upload an .ics or .csv file."
+        )
+
+    # 업로드 파일은 엔드포인트 반환 시 닫히므로, 스트리밍 응답에서 읽을 수 있도록 디스크 임시 파일로 옮김
+    spooled = tempfile.TemporaryFile()
+    await run_in_threadpool(shutil.copyfileobj, file.file, spooled)
+    spooled.seek(0)
+
+    def parse_events():
+        return parse_ics_events(spooled) if file_format == "ics" else parse_csv_events(spooled)
+
+    # 스트리밍 응답(200)을 시작하기 전에 파일을 검사하여 잘못된 파일은 4xx 로 거절
+    try:
+        processed, errors = await run_in_threadpool(lambda: validate_import_events(parse_events()))
+    except (UnicodeDecodeError, csv.Error) as e:
+        spooled.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unreadable {file_format} file: {e}")
+    if not processed or errors:
+        spooled.close()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Some schedules could not be parsed. No schedule was imported." if errors
+                else "The file contains no schedules.",
+                "errors": errors,
+            },
+        )
+    spooled.seek(0)
+
+    def progress_stream():
+        # 커넥션은 스트림을 시작할 때 가져오고 끝나면 반환 (본문을 시작하지 않고 끊어져도 커넥션이 남지 않음)
+        conn = None
+        try:
+            try:
+                conn = get_db_connection()
+            except HTTPException as e:
+                yield json.dumps({"status": "error", "processed": 0, "imported": 0, "skipped": 0,
+                                  "detail": e.detail}, ensure_ascii=False) + "\n"
+                return
+            events = parse_events()
+            for progress in import_schedules(conn, uid, events):
+                yield json.dumps(progress, ensure_ascii=False) + "\n"
+        finally:
+            if conn is not None:
+                close_db_connection(conn)
+            spooled.close()
+
+    return StreamingResponse(progress_stream(), media_type="application/x-ndjson")
+
 ## 2-3. [ 조회 ] (detail)개인스케줄 - 일정조회
 @router.get("/{sid}", response_model=ScheduleResponse)
 async def get_schedule(sid: int, token: str = Depends(oauth2_scheme)):
@@ -482,7 +1272,8 @@ async def get_schedule(sid: int, token: str = Depends(oauth2_scheme)):
         # JWT 토큰 검증 및 사용자 ID 추출
         uid = extract_user_id_from_token(token)
         
-        conn = get_db_connection()
+        # replica 커넥션은 새로 연결할 수 있으므로 이벤트 루프를 막지 않도록 스레드풀에서 가져옴
+        conn = await run_in_threadpool(get_db_connection, read_only=True, uid=uid)
         cur = conn.cursor()
 
         # 개인 스케줄 데이터 조회
@@ -496,10 +1287,11 @@ async def get_schedule(sid: int, token: str = Depends(oauth2_scheme)):
                    ), '{}') as reminders, 
                    EXISTS(
                        SELECT 1 FROM reminder WHERE schedule_id = s.id AND email = true
-                   ) as reminder_email_noti
+                   ) as reminder_email_noti,
+                   s.tag_snapshot
             FROM schedule s
             LEFT JOIN recurrence r ON s.id = r.schedule_id
-            WHERE s.id = %s AND s.uid = %s
+            WHERE s.id = %s AND s.uid = %s AND s.deleted_at IS NULL
             """,
             (sid, uid)
         )
@@ -513,20 +1305,9 @@ async def get_schedule(sid: int, token: str = Depends(oauth2_scheme)):
             )
 
         # 스케줄 정보 매핑
-        title, note, color, start_date, end_date, important, repeat_frequency, repeat_interval, repeat_end_date, repeat_count, reminders, reminder_email_noti = schedule
+        title, note, color, start_date, end_date, important, repeat_frequency, repeat_interval, repeat_end_date, repeat_count, reminders, reminder_email_noti, tag_list = schedule
         print(title, note, color, start_date, end_date, important, repeat_frequency, repeat_interval, repeat_end_date, repeat_count, reminders, reminder_email_noti)
-        # 태그 데이터 조회
-        cur.execute(
-            """
-            SELECT t.id, t.title 
-            FROM tag t
-            JOIN schedule_tag st ON t.id = st.tag_id
-            WHERE st.schedule_id = %s
-            """,
-            (sid,)
-        )
-        tags = cur.fetchall()
-        tag_list = [{"id": tag_id, "name": tag_name} for tag_id, tag_name in tags]
+        # 태그는 스케줄 행의 태그 스냅샷 ([{"id", "name"}]) 을 그대로 사용
         if repeat_count:
             repeat_end_option = "count"
             repeat_end_date = None
@@ -572,8 +1353,14 @@ async def get_schedule(sid: int, token: str = Depends(oauth2_scheme)):
 async def update_schedule(
     sid: int,
     schedule_update: UpdateSchedule,
+    check_conflicts: bool = False,
     token: str = Depends(oauth2_scheme)
 ):
+    """
+    일정을 수정하는 엔드포인트입니다.
+    check_conflicts=true 이면 수정 후의 일정이 다른 일정과 겹치는지 먼저 검사하고, 겹치면 수정하지 않고 409를 반환합니다.
+    """
+    conn = cur = None
     try:
         # JWT 토큰 검증 및 사용자 ID 추출
         uid = extract_user_id_from_token(token)
@@ -582,6 +1369,31 @@ async def update_schedule(
         conn = get_db_connection()
         cur = conn.cursor()
 
+        # 수정할 스케줄 행을 잠그고 확인 (삭제와 동시에 실행되어 삭제된 스케줄에 자식 행을 다시 만들지 않도록)
+        cur.execute(LOCK_SCHEDULE_SQL, (sid, uid))
+        if not cur.fetchone():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+
+        # 겹침 검사 (바뀌지 않는 값은 현재 일정 기준)
+        if check_conflicts:
+            cur.execute("""
+                SELECT s.start_date, s.end_date, r.frequency, r.interval, r.until, r.count
+                FROM schedule s
+                LEFT JOIN recurrence r ON s.id = r.schedule_id
+                WHERE s.id = %s AND s.uid = %s AND s.deleted_at IS NULL
+            """, (sid, uid))
+            current = cur.fetchone()
+            if current:
+                start_date, end_date, frequency, interval, until, count = current
+                if schedule_update.is_repeat:
+                    frequency, interval = schedule_update.repeat_frequency, schedule_update.repeat_interval
+                    until, count = schedule_update.repeat_end_date, schedule_update.repeat_count
+                raise_on_conflicts(cur, uid, candidate_occurrences(
+                    schedule_update.start_date or start_date,
+                    schedule_update.end_date or end_date,
+                    frequency, interval, until, count,
+                ), exclude_id=sid)
+
         # 기본 일정 정보 수정
         update_fields = []
         update_values = []
@@ -610,34 +1422,52 @@ async def update_schedule(
             update_fields.append("important = %s")
             update_values.append(schedule_update.important)
 
+        # 태그 자동완성 인덱스가 있는 사용자는 수정 전 태그의 사용 횟수를 줄이기 위해 조회
+        previous_tags = []
+        if schedule_update.tags is not None and is_tag_autocomplete_cached(uid):
+            cur.execute(SCHEDULE_TAG_TITLES_SQL, (sid,))
+            previous_tags = [row[0] for row in cur.fetchall()]
+
+        # 서로 의존성이 없는 쿼리들은 한 번의 왕복으로 전송
+        batch = PipelinedBatch(cur)
+
         if update_fields:
             update_query = f"""
                 UPDATE schedule 
                 SET {", ".join(update_fields)}, updated_at = NOW()
-                WHERE id = %s AND uid = %s
+                WHERE id = %s AND uid = %s AND deleted_at IS NULL
             """
             update_values.extend([sid, uid])
             logger.info(f"Executing update query: {update_query} with values: {tuple(update_values)}")
-            cur.execute(update_query, tuple(update_values))
+            batch.add(update_query, tuple(update_values))
 
         # 태그 수정
         if schedule_update.tags is not None:  # None 체크
-            cur.execute("DELETE FROM schedule_tag WHERE schedule_id = %s", (sid,))
-            for tag in schedule_update.tags:
-                # tag는 이제 문자열이므로, 태그 ID를 직접 추가하는 방식으로 변경 필요
-                cur.execute("INSERT INTO schedule_tag (tag_id, schedule_id) VALUES ((SELECT id FROM tags WHERE name = %s), %s)", (tag, sid))
-        # 알림 수정
+            batch.add("DELETE FROM schedule_tag WHERE schedule_id = %s", (sid,))
+            # 없는 태그는 생성하고, 태그 연결은 하나의 쿼리로 처리
+            add_link_tags(batch, uid, [sid], [schedule_update.tags])
+            add_refresh_tag_snapshots(batch, [sid])
+        # 알림 수정 (메일 발송 여부가 없으면 기존 알림의 값 유지)
         if schedule_update.reminders:
             logger.info(f"Updating reminders: {schedule_update.reminders}")
-            cur.execute("DELETE FROM reminder WHERE schedule_id = %s", (sid,))
-            for reminder in schedule_update.reminders:
-                logger.info(f"Inserting reminder: {reminder}")
-                cur.execute("INSERT INTO reminder (days_before, schedule_id) VALUES (%s, %s)", (reminder, sid))
+            batch.add(
+                """
+                WITH previous AS (
+                    DELETE FROM reminder WHERE schedule_id = %s RETURNING email
+                )
+                INSERT INTO reminder (days_before, schedule_id, email)
+                SELECT days_before, %s, COALESCE(%s, (SELECT bool_or(email) FROM previous), FALSE)
+                FROM unnest(%s::int[]) AS days_before
+                """,
+                (sid, sid, schedule_update.reminder_email_noti, schedule_update.reminders)
+            )
+        elif schedule_update.reminder_email_noti is not None:
+            batch.add("UPDATE reminder SET email = %s WHERE schedule_id = %s", (schedule_update.reminder_email_noti, sid))
 
         # 반복 일정 정보가 있는 경우
         if schedule_update.is_repeat:
             logger.info(f"Updating recurrence: frequency='{schedule_update.repeat_frequency}' interval={schedule_update.repeat_interval} until={schedule_update.repeat_end_date} count={schedule_update.repeat_count}")
-            cur.execute(
+            batch.add(
                 """
                 INSERT INTO recurrence (frequency, interval, until, count, schedule_id)
                 VALUES (%s, %s, %s, %s, %s)
@@ -652,9 +1482,18 @@ async def update_schedule(
                     sid
                 )
             )
-        conn.commit()
+        add_bump_user_version(batch, uid)
+        add_record_changes(batch, uid, ENTITY_SCHEDULE, [sid])
+        add_refresh_reminder_due(batch, uid)
+        batch.commit()
+        if schedule_update.tags is not None:
+            record_tag_usage(uid, schedule_update.tags, previous_tags)
         return {"status": "success", "message": "Schedule updated successfully"}
-    
+
+    except HTTPException:
+        if conn:
+            conn.rollback()
+        raise
     except Exception as e:
         logger.error(f"Error occurred: {e}", exc_info=True)  # 에러 로그 기록
         if conn:
@@ -668,8 +1507,86 @@ async def update_schedule(
             close_db_connection(conn)
         
 ## 2-6. [ 수정 ] 개인스케줄 -  일정정보삭제
+@router.delete("/{sid}")
+async def delete_schedule(sid: int, token: str = Depends(oauth2_scheme)):
+    """
+    일정을 삭제하는 엔드포인트입니다. (반복 일정은 모든 발생)
+    스케줄 행에 삭제 표시만 하므로 바로 조회되지 않으며, 태그 연결 / 알림 / 반복 / 반복 예외는 백그라운드에서 나누어 지웁니다.
+    """
+    conn = cur = None
+    try:
+        # JWT 토큰 검증 및 사용자 ID 추출
+        uid = extract_user_id_from_token(token)
+
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        cur.execute(SOFT_DELETE_SCHEDULES_SQL, ([sid], uid))
+        if not cur.fetchone():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+
+        # 태그 자동완성 인덱스가 있는 사용자는 삭제한 스케줄의 태그 사용 횟수를 줄이기 위해 조회
+        previous_tags = []
+        if is_tag_autocomplete_cached(uid):
+            cur.execute(SCHEDULE_TAG_TITLES_SQL, (sid,))
+            previous_tags = [row[0] for row in cur.fetchall()]
+
+        batch = PipelinedBatch(cur)
+        add_bump_user_version(batch, uid)
+        add_record_changes(batch, uid, ENTITY_SCHEDULE, [sid], op=OP_DELETE)
+        add_refresh_reminder_due(batch, uid)
+        batch.commit()
+        record_tag_usage(uid, [], previous_tags)
+        return {"status": "success", "message": "Schedule deleted successfully"}
+
+    except HTTPException:
+        if conn:
+            conn.rollback()
+        raise
+    except Exception as e:
+        logger.error(f"Error occurred: {e}", exc_info=True)  # 에러 로그 기록
+        if conn:
+            conn.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete schedule")
+
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            close_db_connection(conn)
 
 ## 2-7. [ 조회 ] 개인스케줄 - 알림
+@router.get("/reminders/upcoming", response_model=UpcomingRemindersResponse)
+async def get_upcoming_reminders(
+    limit: int = Query(10, ge=1, le=100),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    지금 이후의 알림을 알림 시각 순으로 limit 개 반환하는 엔드포인트입니다. (반복 일정은 발생마다)
+    쓰기 트랜잭션에서 유지하는 알림 시각 인덱스(reminder_due)를 범위 조회만 하며, 반복 일정을 펼치지 않습니다.
+    until 이후의 알림은 포함하지 않습니다.
+    """
+    # JWT 토큰 검증 및 사용자 ID 추출
+    uid = extract_user_id_from_token(token)
+
+    try:
+        until, rows = await run_in_threadpool(list_upcoming_reminders, uid, limit)
+    except Exception as e:
+        logger.error(f"Error loading upcoming reminders: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load upcoming reminders."
+        )
+    return UpcomingRemindersResponse(
+        until=until,
+        reminders=[
+            UpcomingReminder(
+                fire_at=fire_at, schedule_id=schedule_id, title=title, color=color,
+                start_date=start_date, end_date=end_date, minutes_before=minutes_before, email=email
+            )
+            for fire_at, schedule_id, minutes_before, start_date, end_date, title, color, email in rows
+        ]
+    )
 
 
 
@@ -680,6 +1597,7 @@ async def modify_repeat_schedule(
     schedule_update: UpdateRepeatSchedule,  # UpdateRepeatSchedule 모델 사용
     token: str = Depends(oauth2_scheme)
 ):
+    conn = cur = None
     try:
         # JWT 토큰 검증 및 사용자 ID 추출
         uid = extract_user_id_from_token(token)
@@ -688,56 +1606,69 @@ async def modify_repeat_schedule(
         conn = get_db_connection()
         cur = conn.cursor()
 
+        # 수정할 스케줄 행을 잠그고 확인 (삭제와 동시에 실행되어 삭제된 스케줄에 자식 행을 다시 만들지 않도록)
+        cur.execute(LOCK_SCHEDULE_SQL, (sid, uid))
+        if not cur.fetchone():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
+
         # 현재 날짜 가져오기
         current_date = datetime.now()
 
+        # 서로 의존성이 없는 쿼리들은 한 번의 왕복으로 전송
+        # (마지막 쿼리의 결과를 읽는 경우가 있으므로 버전 증가를 가장 먼저 추가)
+        batch = PipelinedBatch(cur)
+        add_bump_user_version(batch, uid)
+        add_record_changes(batch, uid, ENTITY_SCHEDULE, [sid])
+
         # 1. only일 경우
         if schedule_update.modify_type == "only":
             logger.info(f"Modifying recurrence only for schedule ID {sid}")
 
-            # 중복 확인 쿼리: start_date, end_date, recurrence_id로 확인
-            cur.execute(
+            # 중복 확인(start_date, end_date, recurrence_id), 예외 등록, 새로운 스케줄 등록(create-schedule)을
+            # 하나의 쿼리로 처리: 예외가 새로 등록된 경우에만 스케줄을 생성함
+            batch.add(
                 """
-                SELECT COUNT(*) FROM recurrence_exception 
-                WHERE start_date = %s AND end_date = %s 
-                AND recurrence_id = (SELECT id FROM recurrence WHERE schedule_id = %s)
+                WITH new_exception AS (
+                    INSERT INTO recurrence_exception (exception_date, start_date, end_date, recurrence_id)
+                    SELECT %s, %s, %s, r.id
+                    FROM recurrence r
+                    WHERE r.schedule_id = %s
+                    AND NOT EXISTS (
+                        SELECT 1 FROM recurrence_exception e
+                        WHERE e.recurrence_id = r.id AND e.start_date = %s AND e.end_date = %s
+                    )
+                    RETURNING id
+                ), new_schedule AS (
+                    INSERT INTO schedule (title, note, important, color, start_date, end_date, uid)
+                    SELECT %s, %s, %s, %s, %s, %s, %s
+                    WHERE EXISTS (SELECT 1 FROM new_exception)
+                    RETURNING id
+                ), """ + LOG_NEW_SCHEDULE_CTE + """
+                SELECT id FROM new_schedule
                 """,
-                (schedule_update.start_date, schedule_update.end_date, sid)
+                (current_date, schedule_update.start_date, schedule_update.end_date, sid,
+                 schedule_update.start_date, schedule_update.end_date,
+                 schedule_update.title, schedule_update.note, schedule_update.important,
+                 schedule_update.color, schedule_update.start_date, schedule_update.end_date, uid,
+                 uid)
             )
-            exists = cur.fetchone()[0] > 0
+            # 새 스케줄 ID 를 읽은 뒤 (새 스케줄을 포함해) 알림 시각을 다시 계산
+            batch.flush()
+            new_schedule = cur.fetchone()
+            add_refresh_reminder_due(batch, uid)
+            batch.commit()
 
-            if not exists:
-                # 중복되지 않으면 삽입
-                cur.execute(
-                    """
-                    INSERT INTO recurrence_exception (exception_date, start_date, end_date, recurrence_id)
-                    VALUES (%s, %s, %s, (SELECT id FROM recurrence WHERE schedule_id = %s))
-                    """,
-                    (current_date, schedule_update.start_date, schedule_update.end_date, sid)
-                )
-            else:
+            if not new_schedule:
                 logger.info("Recurrence exception already exists, skipping insertion.")
                 return {"status": "success", "message": "Recurrence exception already exists."}
-
-
-            # 해당 스케줄을 새로운 스케줄로 등록 (create-schedule)
-            cur.execute(
-                """
-                INSERT INTO schedule (title, note, important, color, start_date, end_date, uid)
-                VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
-                """,
-                (schedule_update.title, schedule_update.note, schedule_update.important, 
-                schedule_update.color, schedule_update.start_date, schedule_update.end_date, uid)
-            )
-            new_schedule_id = cur.fetchone()[0]
-            logger.info(f"New schedule created with ID {new_schedule_id}")
+            logger.info(f"New schedule created with ID {new_schedule[0]}")
 
         # 2. after_all일 경우
         elif schedule_update.modify_type == "after_all":
             logger.info(f"Modifying recurrence after existing for schedule ID {sid}")
 
             # 반복 테이블의 end_date 수정
-            cur.execute(
+            batch.add(
                 """
                 UPDATE recurrence 
                 SET until = %s 
@@ -747,46 +1678,39 @@ async def modify_repeat_schedule(
             )
 
             # 수정된 반복 일정을 새로운 스케줄로 등록 (create-schedule)
-            cur.execute(
+            # (신) 반복 일정과 (신) 알림은 새 스케줄 ID가 필요하므로 같은 쿼리의 CTE에서 함께 생성
+            batch.add(
                 """
-                INSERT INTO schedule (title, note, important, color, start_date, end_date, uid)
-                VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
+                WITH new_schedule AS (
+                    INSERT INTO schedule (title, note, important, color, start_date, end_date, uid)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
+                ), new_recurrence AS (
+                    INSERT INTO recurrence (frequency, interval, until, count, schedule_id)
+                    SELECT %s, %s, %s, %s, id FROM new_schedule
+                    WHERE %s
+                ), new_reminder AS (
+                    -- 메일 발송 여부가 없으면 기존 반복 일정의 알림 값 유지
+                    INSERT INTO reminder (days_before, schedule_id, email)
+                    SELECT days_before, new_schedule.id,
+                           COALESCE(%s, (SELECT bool_or(email) FROM reminder WHERE schedule_id = %s), FALSE)
+                    FROM new_schedule, unnest(%s::int[]) AS days_before
+                ), """ + LOG_NEW_SCHEDULE_CTE + """
+                SELECT id FROM new_schedule
                 """,
-                (schedule_update.title, schedule_update.note, schedule_update.important, 
-                schedule_update.color, schedule_update.start_date, schedule_update.end_date, uid)
+                (schedule_update.title, schedule_update.note, schedule_update.important,
+                 schedule_update.color, schedule_update.start_date, schedule_update.end_date, uid,
+                 schedule_update.repeat_frequency, schedule_update.repeat_interval,
+                 schedule_update.repeat_end_date, schedule_update.repeat_count,
+                 bool(schedule_update.is_repeat),
+                 schedule_update.reminder_email_noti, sid,
+                 schedule_update.reminders or [],
+                 uid)
             )
+            batch.flush()
             new_schedule_id = cur.fetchone()[0]
+            add_refresh_reminder_due(batch, uid)
+            batch.commit()
             logger.info(f"New schedule created with ID {new_schedule_id}")
-            
-                # (신) 반복 일정 추가
-            if schedule_update.is_repeat:
-                cur.execute(
-                    """
-                    INSERT INTO recurrence (frequency, interval, until, count, schedule_id)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    (
-                        schedule_update.repeat_frequency,
-                        schedule_update.repeat_interval,
-                        schedule_update.repeat_end_date,
-                        schedule_update.repeat_count,
-                        new_schedule_id
-                    )
-                )
-                logger.info(f"New recurrence created for schedule ID {new_schedule_id}")
-
-            # (신) 알림 기능 추가
-            if schedule_update.reminders:
-                for reminder in schedule_update.reminders:
-                    cur.execute(
-                        """
-                        INSERT INTO reminder (days_before, schedule_id)
-                        VALUES (%s, %s)
-                        """,
-                        (reminder, new_schedule_id)
-                    )
-                    logger.info(f"Reminder added: {reminder} days before for schedule ID {new_schedule_id}")
-
             logger.info(f"Schedule modification after_all completed for schedule ID {sid}")
 
         # 3. all일 경우
@@ -794,7 +1718,7 @@ async def modify_repeat_schedule(
             logger.info(f"Modifying all recurrences for schedule ID {sid}")
 
             # 반복 테이블 수정
-            cur.execute(
+            batch.add(
                 """
                 UPDATE recurrence
                 SET frequency = %s, interval = %s, until = %s, count = %s
@@ -808,18 +1732,26 @@ async def modify_repeat_schedule(
                     sid
                 )
             )
+            add_refresh_reminder_due(batch, uid)
+            batch.commit()
 
         else:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid modify_type")
 
-        conn.commit()
         return {"status": "success", "message": "Repeat schedule modified successfully"}
 
+    except HTTPException:
+        if conn:
+            conn.rollback()
+        raise
     except Exception as e:
-        conn.rollback()
         logger.error(f"Error occurred: {e}")
+        if conn:
+            conn.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to modify repeat schedule")
 
     finally:
-        cur.close()
-        close_db_connection(conn)
+        if cur:
+            cur.close()
+        if conn:
+            close_db_connection(conn)
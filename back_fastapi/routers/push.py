@@ -0,0 +1,83 @@
+import asyncio
+import time
+from typing import Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, status
+from .util.auth import verify_token
+from .util.push import hub, PUSH_SEND_TIMEOUT_SECONDS
+
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _token_from_websocket(websocket: WebSocket, token: Optional[str]) -> Optional[str]:
+    # 브라우저 WebSocket은 헤더를 보낼 수 없으므로 쿼리 파라미터 token도 허용
+    authorization = websocket.headers.get("authorization")
+    if authorization and authorization[:7].lower() == "bearer ":
+        return authorization[7:]
+    return token
+
+
+@router.websocket("/ws")
+async def schedule_changes(websocket: WebSocket, token: Optional[str] = None):
+    """
+    스케줄 변경 알림 WebSocket 엔드포인트입니다.
+    - 인증: Authorization: Bearer <JWT> 헤더 또는 ?token=<JWT>
+    - {"type": "changed", "version": N}: 변경이 있음 -> GET /api/per-schedule/sync?since=<token> 으로 변경분 조회
+    - {"type": "resync"}: 알림이 누락되었을 수 있음 (느린 연결, 서버 재연결) -> sync 로 다시 맞춤
+    토큰이 만료되면 연결을 닫습니다. (code 1008, 새 토큰으로 다시 연결)
+    """
+    try:
+        payload = verify_token(_token_from_websocket(websocket, token) or "")
+        uid = payload.get("uid")
+        if not isinstance(uid, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token payload")
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    if hub.is_full():
+        hub.rejected += 1
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    await websocket.accept()
+    subscriber = hub.subscribe(uid)
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+
+    async def send_loop():
+        while True:
+            message = await subscriber.queue.get()
+            try:
+                await asyncio.wait_for(websocket.send_text(message), PUSH_SEND_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                # 받지 못하는 클라이언트: 연결을 끊어 버퍼가 쌓이지 않도록 함
+                hub.slow_disconnects += 1
+                logger.info(f"Closing slow push connection for user {uid}")
+                return status.WS_1013_TRY_AGAIN_LATER
+
+    async def receive_loop():
+        # 클라이언트가 보내는 메시지는 사용하지 않고, 연결 종료만 감지
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            return None
+
+    tasks = [asyncio.ensure_future(send_loop()), asyncio.ensure_future(receive_loop())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=expires_in, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            # 토큰 만료
+            close_code = status.WS_1008_POLICY_VIOLATION
+        else:
+            close_code = next(iter(done)).result()
+        if close_code is not None:
+            await websocket.close(code=close_code)
+    except Exception as e:
+        logger.info(f"Push connection for user {uid} closed: {e}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        hub.unsubscribe(subscriber)
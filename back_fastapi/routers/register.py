@@ -3,7 +3,9 @@ from datetime import datetime
 import base64
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel
-from db.db_conn import get_db_connection
+from starlette.concurrency import run_in_threadpool
+from db.db_conn import get_db_connection, close_db_connection
+from routers.util.rate_limit import bcrypt_limiter
 import bcrypt
 
 router = APIRouter()
@@ -23,8 +25,9 @@ async def register_user(user: UserCreate):
     새로운 사용자를 등록하는 엔드포인트입니다.
     사용자 정보(이메일, 닉네임, 비밀번호, 프로필)를 받아서 데이터베이스에 저장합니다.
     """
-    # 비밀번호 해싱
-    password_hash = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    # 비밀번호 해싱 (CPU를 많이 쓰므로 동시 실행 수를 제한하고 스레드풀에서 실행)
+    async with bcrypt_limiter:
+        password_hash = (await run_in_threadpool(bcrypt.hashpw, user.password.encode('utf-8'), bcrypt.gensalt())).decode('utf-8')
     
     conn = get_db_connection()
     cur = conn.cursor()
@@ -45,7 +48,7 @@ async def register_user(user: UserCreate):
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         cur.close()
-        conn.close()
+        close_db_connection(conn)
 
 @router.post("/check-username")
 async def check_user(check_user: CheckUser):
@@ -67,4 +70,4 @@ async def check_user(check_user: CheckUser):
         raise HTTPException(status_code=500, detail="Internal server error")
     finally:
         cur.close()
-        conn.close()
+        close_db_connection(conn)
@@ -0,0 +1,241 @@
+from typing import List, Optional, Sequence
+from db.db_conn import PipelinedBatch
+from .tag_snapshot import add_refresh_tag_snapshots
+from .schedule_purge import SOFT_DELETE_SCHEDULES_SQL
+
+"""
+스케줄 일괄 쓰기용 쿼리 모음
+각 함수는 PipelinedBatch에 쿼리를 추가만 하며, 전송과 커밋은 호출하는 쪽에서 batch.commit()으로 처리합니다.
+행 단위 반복 대신 배열 파라미터를 unnest 하여 작업 개수와 상관없이 쿼리 개수가 일정하도록 합니다.
+"""
+
+# (schedule_id, 태그 이름) 쌍으로 schedule_tag를 연결하는 쿼리 (없는 개인 태그는 생성)
+# new_tag CTE에서 생성된 태그는 본 쿼리의 스냅샷에 보이지 않으므로 UNION ALL로 중복 없이 합쳐짐
+LINK_SCHEDULE_TAGS_SQL = """
+    WITH pair AS (
+        SELECT * FROM unnest(%(schedule_ids)s::bigint[], %(titles)s::text[]) AS p(schedule_id, title)
+    ), new_tag AS (
+        INSERT INTO tag (title, is_personal, uid)
+        SELECT DISTINCT p.title, TRUE, %(uid)s
+        FROM pair p
+        WHERE NOT EXISTS (SELECT 1 FROM tag t WHERE t.title = p.title AND t.uid = %(uid)s)
+        RETURNING id, title
+    ), all_tag AS (
+        SELECT id, title FROM new_tag
+        UNION ALL
+        SELECT id, title FROM tag WHERE uid = %(uid)s AND title IN (SELECT title FROM pair)
+    )
+    INSERT INTO schedule_tag (tag_id, schedule_id, is_personal)
+    SELECT a.id, p.schedule_id, TRUE
+    FROM pair p
+    JOIN all_tag a ON a.title = p.title
+"""
+
+
+def allocate_schedule_ids(cur, n: int) -> List[int]:
+    """
+    새 스케줄 ID를 미리 발급하는 함수
+    ID를 먼저 받아두면 태그/반복/알림 INSERT를 RETURNING 결과를 기다리지 않고 한 번에 보낼 수 있습니다.
+    """
+    if n <= 0:
+        return []
+    cur.execute(
+        "SELECT nextval(pg_get_serial_sequence('schedule', 'id')) FROM generate_series(1, %s)",
+        (n,)
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def add_link_tags(batch: PipelinedBatch, uid: int, schedule_ids: Sequence[int], tag_lists: Sequence[Optional[List[str]]]):
+    """
+    스케줄별 태그 이름 목록을 schedule_tag에 연결하는 쿼리를 추가하는 함수
+    :param schedule_ids: 스케줄 ID 목록
+    :param tag_lists: schedule_ids와 같은 순서의 태그 이름 목록 (None 또는 빈 목록은 무시)
+    """
+    pair_ids, pair_titles = [], []
+    for schedule_id, tags in zip(schedule_ids, tag_lists):
+        for title in dict.fromkeys(tags or []):
+            pair_ids.append(schedule_id)
+            pair_titles.append(title)
+    if pair_ids:
+        batch.add(LINK_SCHEDULE_TAGS_SQL, {"uid": uid, "schedule_ids": pair_ids, "titles": pair_titles})
+
+
+def add_insert_reminders(batch: PipelinedBatch, schedule_ids: Sequence[int], reminder_lists: Sequence[Optional[List[int]]],
+                         email_flags: Optional[Sequence[Optional[bool]]] = None):
+    """
+    스케줄별 알림 목록을 reminder 테이블에 추가하는 쿼리를 추가하는 함수
+    :param email_flags: schedule_ids와 같은 순서의 알림 메일 발송 여부 (None이면 컬럼 기본값)
+    """
+    pair_ids, pair_days, pair_emails = [], [], []
+    for i, (schedule_id, reminders) in enumerate(zip(schedule_ids, reminder_lists)):
+        for reminder in reminders or []:
+            pair_ids.append(schedule_id)
+            pair_days.append(reminder)
+            pair_emails.append(bool(email_flags[i]) if email_flags is not None else None)
+    if not pair_ids:
+        return
+    if email_flags is None:
+        batch.add(
+            """
+            INSERT INTO reminder (days_before, schedule_id)
+            SELECT * FROM unnest(%s::int[], %s::bigint[])
+            """,
+            (pair_days, pair_ids)
+        )
+    else:
+        batch.add(
+            """
+            INSERT INTO reminder (days_before, schedule_id, email)
+            SELECT * FROM unnest(%s::int[], %s::bigint[], %s::boolean[])
+            """,
+            (pair_days, pair_ids, pair_emails)
+        )
+
+
+def add_upsert_recurrences(batch: PipelinedBatch, schedule_ids: Sequence[int], schedules: Sequence):
+    """
+    반복 설정(is_repeat)이 있는 스케줄의 recurrence를 생성/수정하는 쿼리를 추가하는 함수
+    :param schedules: CreateSchedule 또는 UpdateSchedule 목록 (schedule_ids와 같은 순서)
+    """
+    rows = [(sid, s) for sid, s in zip(schedule_ids, schedules) if s.is_repeat]
+    if not rows:
+        return
+    batch.add(
+        """
+        INSERT INTO recurrence (frequency, interval, until, count, schedule_id)
+        SELECT * FROM unnest(%s::text[], %s::int[], %s::timestamptz[], %s::int[], %s::bigint[])
+        ON CONFLICT (schedule_id) DO UPDATE
+        SET frequency = EXCLUDED.frequency, interval = EXCLUDED.interval, until = EXCLUDED.until, count = EXCLUDED.count
+        """,
+        (
+            [s.repeat_frequency for _, s in rows],
+            [s.repeat_interval for _, s in rows],
+            [s.repeat_end_date for _, s in rows],
+            [s.repeat_count for _, s in rows],
+            [sid for sid, _ in rows],
+        )
+    )
+
+
+def add_bulk_create(batch: PipelinedBatch, uid: int, schedule_ids: Sequence[int], schedules: Sequence):
+    """
+    미리 발급한 ID로 스케줄을 일괄 생성하는 쿼리를 추가하는 함수 (태그, 반복, 알림 포함)
+    :param schedules: CreateSchedule 목록 (schedule_ids와 같은 순서)
+    """
+    if not schedule_ids:
+        return
+    batch.add(
+        """
+        INSERT INTO schedule (id, title, note, color, start_date, end_date, important, uid, created_at, updated_at)
+        SELECT v.*, %s, NOW(), NOW()
+        FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::text[], %s::timestamptz[], %s::timestamptz[], %s::text[])
+            AS v(id, title, note, color, start_date, end_date, important)
+        """,
+        (
+            uid,
+            list(schedule_ids),
+            [s.title for s in schedules],
+            [s.note for s in schedules],
+            [s.color for s in schedules],
+            [s.start_date for s in schedules],
+            [s.end_date for s in schedules],
+            [s.important for s in schedules],
+        )
+    )
+    add_link_tags(batch, uid, schedule_ids, [s.tags for s in schedules])
+    add_refresh_tag_snapshots(batch, [sid for sid, s in zip(schedule_ids, schedules) if s.tags])
+    add_upsert_recurrences(batch, schedule_ids, schedules)
+    add_insert_reminders(batch, schedule_ids, [s.reminders for s in schedules], [s.reminder_email_noti for s in schedules])
+
+
+def add_bulk_update(batch: PipelinedBatch, uid: int, schedule_ids: Sequence[int], updates: Sequence):
+    """
+    스케줄을 일괄 수정하는 쿼리를 추가하는 함수
+    update_schedule과 동일하게 값이 없는(falsy) 필드는 수정하지 않습니다.
+    :param updates: UpdateSchedule 목록 (schedule_ids와 같은 순서)
+    """
+    if not schedule_ids:
+        return
+    batch.add(
+        """
+        UPDATE schedule s
+        SET title = COALESCE(v.title, s.title),
+            note = COALESCE(v.note, s.note),
+            color = COALESCE(v.color, s.color),
+            start_date = COALESCE(v.start_date, s.start_date),
+            end_date = COALESCE(v.end_date, s.end_date),
+            important = COALESCE(v.important, s.important),
+            updated_at = NOW()
+        FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::text[], %s::timestamptz[], %s::timestamptz[], %s::text[])
+            AS v(id, title, note, color, start_date, end_date, important)
+        WHERE s.id = v.id AND s.uid = %s
+        """,
+        (
+            list(schedule_ids),
+            [u.title or None for u in updates],
+            [u.note or None for u in updates],
+            [u.color or None for u in updates],
+            [u.start_date or None for u in updates],
+            [u.end_date or None for u in updates],
+            [u.important or None for u in updates],
+            uid,
+        )
+    )
+
+    # 태그 수정 (tags가 주어진 스케줄만 교체)
+    tagged = [(sid, u.tags) for sid, u in zip(schedule_ids, updates) if u.tags is not None]
+    if tagged:
+        batch.add("DELETE FROM schedule_tag WHERE schedule_id = ANY(%s)", ([sid for sid, _ in tagged],))
+        add_link_tags(batch, uid, [sid for sid, _ in tagged], [tags for _, tags in tagged])
+        add_refresh_tag_snapshots(batch, [sid for sid, _ in tagged])
+
+    # 알림 수정 (reminders가 주어진 스케줄만 교체, update_schedule 과 같이 메일 발송 여부가 없으면 기존 알림의 값 유지)
+    reminded = [(sid, u) for sid, u in zip(schedule_ids, updates) if u.reminders]
+    if reminded:
+        pair_ids, pair_days = [], []
+        for sid, u in reminded:
+            pair_ids.extend([sid] * len(u.reminders))
+            pair_days.extend(u.reminders)
+        batch.add(
+            """
+            WITH v AS (
+                SELECT * FROM unnest(%s::bigint[], %s::boolean[]) AS v(schedule_id, email)
+            ), previous AS (
+                DELETE FROM reminder r USING v WHERE r.schedule_id = v.schedule_id
+                RETURNING r.schedule_id, r.email
+            ), previous_email AS (
+                SELECT schedule_id, bool_or(email) AS email FROM previous GROUP BY schedule_id
+            )
+            INSERT INTO reminder (days_before, schedule_id, email)
+            SELECT p.days_before, p.schedule_id, COALESCE(v.email, pe.email, FALSE)
+            FROM unnest(%s::int[], %s::bigint[]) AS p(days_before, schedule_id)
+            JOIN v USING (schedule_id)
+            LEFT JOIN previous_email pe USING (schedule_id)
+            """,
+            ([sid for sid, _ in reminded], [u.reminder_email_noti for _, u in reminded], pair_days, pair_ids)
+        )
+    # 알림은 그대로 두고 메일 발송 여부만 바꾸는 스케줄
+    flagged = [(sid, u.reminder_email_noti) for sid, u in zip(schedule_ids, updates)
+               if not u.reminders and u.reminder_email_noti is not None]
+    if flagged:
+        batch.add(
+            """
+            UPDATE reminder r SET email = v.email
+            FROM unnest(%s::bigint[], %s::boolean[]) AS v(schedule_id, email)
+            WHERE r.schedule_id = v.schedule_id
+            """,
+            ([sid for sid, _ in flagged], [email for _, email in flagged])
+        )
+
+    add_upsert_recurrences(batch, schedule_ids, updates)
+
+
+def add_bulk_delete(batch: PipelinedBatch, uid: int, schedule_ids: Sequence[int]):
+    """
+    스케줄을 일괄 삭제 표시하는 쿼리를 추가하는 함수
+    연관 데이터(태그 연결, 알림, 반복, 반복 예외)와 스케줄 행은 백그라운드 purger 가 지웁니다. (schedule_purge.py)
+    """
+    if not schedule_ids:
+        return
+    batch.add(SOFT_DELETE_SCHEDULES_SQL, (list(schedule_ids), uid))
@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+"""
+프로세스 내 캐시 유틸리티
+"""
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    최대 크기가 정해진 LRU 캐시 (thread-safe)
+    가득 찬 상태에서 새 키를 넣으면 가장 오래 사용하지 않은 키를 버리므로 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable):
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[Any] = None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Optional[Any] = None):
+        """LRU 순서와 통계를 바꾸지 않고 조회"""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def values(self) -> list:
+        with self._lock:
+            return list(self._data.values())
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Optional[Any] = None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,66 @@
+from typing import Sequence
+from db.db_conn import PipelinedBatch
+
+"""
+사용자별 변경 기록(change_log) - delta sync 용
+쓰기 트랜잭션 안에서 user_version 을 올린 뒤 기록해야 하며, 기록되는 버전은 그 트랜잭션의 새 user_version 입니다.
+엔티티마다 마지막 변경 하나만 남기므로 (PK: uid, entity, entity_id) 로그 크기는 엔티티 수를 넘지 않습니다.
+"""
+
+ENTITY_SCHEDULE = "schedule"
+ENTITY_TAG = "tag"
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+RECORD_CHANGES_SQL = """
+    INSERT INTO change_log (uid, entity, entity_id, version, op, changed_at)
+    SELECT v.uid, %(entity)s, entity_id, v.version, %(op)s, NOW()
+    FROM user_version v, unnest(%(ids)s::bigint[]) AS entity_id
+    WHERE v.uid = %(uid)s
+    ON CONFLICT (uid, entity, entity_id) DO UPDATE
+    SET version = EXCLUDED.version, op = EXCLUDED.op, changed_at = EXCLUDED.changed_at
+"""
+
+# 같은 쿼리의 new_schedule CTE에서 생성한 스케줄을 기록하는 CTE 조각 (파라미터: uid 하나)
+# 예: WITH new_schedule AS (... RETURNING id), ... , """ + LOG_NEW_SCHEDULE_CTE + """ SELECT id FROM new_schedule
+LOG_NEW_SCHEDULE_CTE = """
+    logged_schedule AS (
+        INSERT INTO change_log (uid, entity, entity_id, version, op, changed_at)
+        SELECT v.uid, 'schedule', new_schedule.id, v.version, 'upsert', NOW()
+        FROM new_schedule, user_version v
+        WHERE v.uid = %s
+        ON CONFLICT (uid, entity, entity_id) DO UPDATE
+        SET version = EXCLUDED.version, op = EXCLUDED.op, changed_at = EXCLUDED.changed_at
+    )
+"""
+
+# 가져오기(import)로 만든 스케줄을 기록하는 쿼리 (schedule_import 에서 커밋 직전에 버전을 올린 뒤 실행)
+LOG_IMPORTED_SCHEDULES_SQL = """
+    INSERT INTO change_log (uid, entity, entity_id, version, op, changed_at)
+    SELECT v.uid, 'schedule', s.schedule_id, v.version, 'upsert', NOW()
+    FROM import_done_stage s, user_version v
+    WHERE v.uid = %(uid)s
+"""
+
+# 변경 조회: 클라이언트가 가진 버전 이후에 바뀐 엔티티
+CHANGES_SINCE_SQL = """
+    SELECT entity, entity_id, op
+    FROM change_log
+    WHERE uid = %s AND version > %s
+"""
+
+
+def record_changes(cur, uid: int, entity: str, ids: Sequence[int], op: str = OP_UPSERT):
+    """
+    변경된 엔티티를 기록하는 함수 (쓰기 트랜잭션 안에서 user_version 을 올린 뒤 호출)
+    """
+    if ids:
+        cur.execute(RECORD_CHANGES_SQL, {"uid": uid, "entity": entity, "ids": list(ids), "op": op})
+
+
+def add_record_changes(batch: PipelinedBatch, uid: int, entity: str, ids: Sequence[int], op: str = OP_UPSERT):
+    """
+    PipelinedBatch에 변경 기록 쿼리를 추가하는 함수 (add_bump_user_version 보다 뒤에 추가해야 함)
+    """
+    if ids:
+        batch.add(RECORD_CHANGES_SQL, {"uid": uid, "entity": entity, "ids": list(ids), "op": op})
@@ -0,0 +1,88 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import pytz
+from .utils import generate_recurring_events
+from .interval_index import get_interval_index, load_interval_index
+
+"""
+일정 겹침(conflict) 검사 - 일정 생성 / 수정의 check_conflicts 옵션
+- 새 일정(반복 일정은 horizon 안의 발생)과 겹치는 기존 일정의 발생(반복 예외 제외)을 찾음
+- 기존 일정은 새 일정의 기간만큼만 구간 인덱스(routers.util.interval_index)로 만들고 (최신 인덱스가 있으면 그대로 사용),
+  새 일정의 발생마다 겹침 조회 - O(m log n + k), 일정 쌍을 모두 비교하지 않음
+- 검사 전에 사용자의 user_version 행을 잠그므로 같은 사용자의 겹침 검사 + 쓰기는 한 번에 하나씩 실행됨
+  (잠금은 쓰기 트랜잭션이 커밋 / 롤백될 때 풀리며, 먼저 커밋된 일정도 검사함)
+"""
+
+# 반복 일정의 발생을 검사하는 기간 (시작일 기준 일 수)
+CONFLICT_HORIZON_DAYS = int(os.environ.get("conflict_horizon_days", 366))
+# 응답에 포함하는 최대 겹침 수
+CONFLICT_MAX_RESULTS = int(os.environ.get("conflict_max_results", 100))
+
+# 사용자의 버전 행을 잠그고 버전 조회 (행이 없는 사용자는 버전 0 으로 만들어 잠금)
+LOCK_USER_VERSION_SQL = """
+    INSERT INTO user_version (uid, version, updated_at)
+    VALUES (%s, 0, NOW())
+    ON CONFLICT (uid) DO UPDATE SET version = user_version.version
+    RETURNING version
+"""
+
+# (schedule_id, title, start_date, end_date)
+Conflict = Tuple[int, str, datetime, datetime]
+
+
+def candidate_occurrences(start_date: datetime, end_date: datetime, frequency: Optional[str] = None,
+                          interval: Optional[int] = None, until: Optional[datetime] = None,
+                          count: Optional[int] = None) -> List[Tuple[datetime, datetime]]:
+    """
+    검사할 새 일정의 발생 구간 목록 (반복 일정은 시작일부터 CONFLICT_HORIZON_DAYS 안의 발생, 시간대가 없으면 UTC)
+    """
+    start_date, end_date = (pytz.utc.localize(dt) if dt.tzinfo is None else dt for dt in (start_date, end_date))
+    if not frequency:
+        return [(start_date, end_date)]
+    duration = end_date - start_date
+    events = generate_recurring_events(
+        start_date=start_date,
+        frequency=frequency,
+        interval=interval or 1,
+        until=until,
+        count=count,
+        requested_start=start_date,
+        requested_end=start_date + timedelta(days=CONFLICT_HORIZON_DAYS),
+    )
+    return [(event, event + duration) for event in events]
+
+
+def find_conflicts(cur, uid: int, candidates: List[Tuple[datetime, datetime]],
+                   exclude_id: Optional[int] = None) -> List[Conflict]:
+    """
+    새 일정의 발생 구간들과 겹치는(맞닿는 것은 제외) 기존 일정의 발생을 시작 시각 순으로 반환하는 함수
+    쓰기 트랜잭션의 커서로 호출하므로 primary 의 최신 데이터로 검사하며,
+    user_version 행을 잠그므로 같은 트랜잭션에서 쓰기까지 마쳐야 합니다. (검사와 쓰기 사이에 다른 요청이 끼어들지 않음)
+    :param exclude_id: 수정 중인 스케줄 ID (자기 자신과의 겹침 제외)
+    """
+    if not candidates:
+        return []
+    window_start = min(start for start, _ in candidates)
+    window_end = max(end for _, end in candidates)
+
+    # 잠금을 얻은 뒤의 문장은 새 스냅샷으로 읽으므로 먼저 커밋된 다른 요청의 일정도 보임
+    cur.execute(LOCK_USER_VERSION_SQL, (uid,))
+    version = cur.fetchone()[0]
+    index = get_interval_index(uid, version, window_start, window_end)
+    if index is None:
+        index = load_interval_index(cur, uid, version, window_start, window_end, exclude_id=exclude_id)
+
+    found = set()
+    for start, end in candidates:
+        found.update(index.overlaps(start, end))
+
+    conflicts = []
+    for i in sorted(found):
+        schedule_id = index.schedule_ids[i]
+        if schedule_id == exclude_id:
+            continue
+        conflicts.append((schedule_id, index.schedules[schedule_id][0], index.starts[i], index.ends[i]))
+        if len(conflicts) >= CONFLICT_MAX_RESULTS:
+            break
+    return conflicts
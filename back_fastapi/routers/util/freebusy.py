@@ -0,0 +1,116 @@
+import os
+from datetime import datetime, timedelta
+from typing import List
+import psycopg2
+from fastapi import HTTPException, status
+from db.db_conn import get_db_connection, close_db_connection
+from .recurrence import expand_recurrences
+from .intervals import merge_intervals, free_slots
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+빈 시간 조회 (free/busy)
+- 기간 안의 스케줄을 한 번에 가져와 반복 일정을 반복 일정 엔진(routers.util.recurrence)으로 펼친 뒤
+  모든 사용자의 바쁜 구간을 sweep 으로 합치고, 그 사이의 빈 구간을 반환
+- 다른 사용자는 같은 그룹(community_member)에 속한 경우에만 조회 가능
+- 조회 시간은 statement_timeout 으로 제한하며, 넘기면 503
+"""
+
+# 한 번에 조회할 수 있는 최대 기간 (일)
+FREEBUSY_MAX_DAYS = int(os.environ.get("freebusy_max_days", 366))
+# 한 번에 조회할 수 있는 최대 사용자 수 (본인 포함)
+FREEBUSY_MAX_USERS = int(os.environ.get("freebusy_max_users", 50))
+# 쿼리 시간 제한 (ms)
+FREEBUSY_TIMEOUT_MS = int(os.environ.get("freebusy_timeout_ms", 2000))
+
+# 기간과 겹치는 스케줄 (기간 전에 시작해 기간 안까지 이어지는 발생이 있는 반복 일정 포함)
+FREEBUSY_WINDOW_SQL = """
+    SELECT s.id, s.start_date, s.end_date, r.frequency, r.interval, r.until, r.count
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = ANY(%(uids)s) AND s.deleted_at IS NULL
+    AND s.start_date <= %(window_end)s
+    AND (
+        s.end_date >= %(window_start)s
+        OR (r.frequency IS NOT NULL AND (r.until IS NULL OR r.until >= %(window_start)s - (s.end_date - s.start_date)))
+    )
+"""
+
+# 요청한 사용자와 같은 그룹에 속한 사용자
+SHARED_GROUP_MEMBERS_SQL = """
+    SELECT DISTINCT other.uid
+    FROM community_member me
+    JOIN community_member other ON other.community_id = me.community_id
+    WHERE me.uid = %s AND other.uid = ANY(%s)
+"""
+
+
+def resolve_freebusy_uids(cur, uid: int, uids: List[int]) -> List[int]:
+    """
+    조회할 사용자 목록을 정리하는 함수 (본인 포함, 중복 제거)
+    같은 그룹에 속하지 않은 사용자가 있으면 403
+    """
+    others = sorted(set(uids) - {uid})
+    if len(others) + 1 > FREEBUSY_MAX_USERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {FREEBUSY_MAX_USERS} users can be queried at once."
+        )
+    if others:
+        cur.execute(SHARED_GROUP_MEMBERS_SQL, (uid, others))
+        allowed = {row[0] for row in cur.fetchall()}
+        if allowed != set(others):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Free/busy is only available for members of your groups."
+            )
+    return [uid] + others
+
+
+def build_freebusy(uid: int, uids: List[int], window_start: datetime, window_end: datetime,
+                   min_length: timedelta):
+    """
+    사용자들의 바쁜 구간(합친 것)과 빈 구간을 계산하는 함수 (스레드풀에서 실행)
+    :return: (조회한 사용자 목록, 바쁜 구간 목록, 빈 구간 목록)
+    """
+    conn = get_db_connection(read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        # 트랜잭션 안의 모든 쿼리에 시간 제한 적용
+        cur.execute("SET LOCAL statement_timeout = %s", (FREEBUSY_TIMEOUT_MS,))
+        uids = resolve_freebusy_uids(cur, uid, uids)
+        cur.execute(FREEBUSY_WINDOW_SQL, {"uids": uids, "window_start": window_start, "window_end": window_end})
+        rows = cur.fetchall()
+
+        busy = []
+        series = []
+        lookback = timedelta(0)
+        for schedule_id, start_date, end_date, frequency, interval, until, count in rows:
+            if frequency:
+                series.append((schedule_id, start_date, frequency, interval, until, count))
+                lookback = max(lookback, end_date - start_date)
+            else:
+                busy.append((start_date, end_date))
+
+        # 기간 전에 시작해 기간 안까지 이어지는 발생도 포함하도록, 가장 긴 일정 길이만큼 앞에서부터 펼침
+        occurrences = expand_recurrences(cur, series, window_start - lookback, window_end)
+        durations = {row[0]: row[2] - row[1] for row in rows}
+        for schedule_id, events in occurrences.items():
+            duration = durations[schedule_id]
+            busy.extend((event, event + duration) for event in events)
+
+        merged = merge_intervals(busy, window_start, window_end)
+        return uids, merged, free_slots(merged, window_start, window_end, min_length)
+    except psycopg2.extensions.QueryCanceledError:
+        logger.warning(f"Free/busy lookup for user {uid} exceeded {FREEBUSY_TIMEOUT_MS}ms")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Free/busy lookup took too long. Try a shorter window or fewer users."
+        )
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
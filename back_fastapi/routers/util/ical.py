@@ -0,0 +1,396 @@
+import csv
+import io
+import re
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+import pytz
+from models.schemas import CreateSchedule
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# iCalendar FREQ <-> recurrence.frequency
+ICS_FREQUENCIES = {
+    "DAILY": "daily",
+    "WEEKLY": "weekly",
+    "MONTHLY": "monthly",
+    "YEARLY": "yearly",
+}
+
+# 가져오기 시 값이 없을 때 사용하는 기본값
+DEFAULT_IMPORT_COLOR = "blue"
+DEFAULT_IMPORT_IMPORTANT = "medium"
+
+_DURATION_RE = re.compile(
+    r"^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+
+class ImportParseError(ValueError):
+    """가져오기 파일의 한 일정을 해석할 수 없을 때 발생하는 예외"""
+
+
+def _unescape_text(value: str) -> str:
+    # RFC 5545 TEXT 이스케이프 해제
+    return (value.replace("\\n", "\n").replace("\\N", "\n")
+            .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def _split_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    """
+    'NAME;PARAM=VALUE:content' 형식의 한 줄을 (NAME, {PARAM: VALUE}, content)로 분리하는 함수
+    """
+    in_quotes = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ":" and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        raise ImportParseError(f"Invalid content line: {line[:80]}")
+
+    name, *raw_params = head.split(";")
+    params = {}
+    for raw in raw_params:
+        key, _, val = raw.partition("=")
+        params[key.upper()] = val.strip('"')
+    return name.upper(), params, value
+
+
+def parse_ics_datetime(value: str, params: Optional[Dict[str, str]] = None) -> datetime:
+    """
+    iCalendar DATE / DATE-TIME 값을 UTC datetime으로 변환하는 함수
+    - 20240510T100000Z      : UTC
+    - TZID=Asia/Seoul 지정   : 해당 시간대 기준
+    - 시간대 없음(floating)   : UTC로 간주
+    - VALUE=DATE (20240510) : 해당 날짜 00:00 UTC
+    """
+    params = params or {}
+    value = value.strip()
+    try:
+        if params.get("VALUE") == "DATE" or len(value) == 8:
+            return pytz.utc.localize(datetime.strptime(value, "%Y%m%d"))
+        if value.endswith("Z"):
+            return pytz.utc.localize(datetime.strptime(value[:-1], "%Y%m%dT%H%M%S"))
+        naive = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    except ValueError:
+        raise ImportParseError(f"Invalid date value: {value}")
+
+    tzid = params.get("TZID")
+    if tzid:
+        try:
+            return pytz.timezone(tzid).localize(naive).astimezone(pytz.utc)
+        except pytz.UnknownTimeZoneError:
+            logger.warning(f"Unknown TZID {tzid}, treating {value} as UTC")
+    return pytz.utc.localize(naive)
+
+
+def parse_ics_duration(value: str) -> timedelta:
+    """
+    iCalendar DURATION 값(예: PT1H30M, -PT15M, P1D)을 timedelta로 변환하는 함수
+    """
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        raise ImportParseError(f"Invalid duration: {value}")
+    parts = {k: int(v) for k, v in match.groupdict().items() if k != "sign" and v}
+    duration = timedelta(
+        weeks=parts.get("weeks", 0),
+        days=parts.get("days", 0),
+        hours=parts.get("hours", 0),
+        minutes=parts.get("minutes", 0),
+        seconds=parts.get("seconds", 0),
+    )
+    return -duration if match.group("sign") == "-" else duration
+
+
+def parse_rrule(value: str) -> Dict[str, object]:
+    """
+    RRULE 값을 recurrence 테이블 컬럼(frequency, interval, until, count)으로 변환하는 함수
+    FREQ/INTERVAL/UNTIL/COUNT 이외의 규칙(BYDAY 등)은 지원하지 않으므로 무시하고 로그를 남깁니다.
+    """
+    rule = {}
+    for part in value.split(";"):
+        key, _, val = part.partition("=")
+        rule[key.upper()] = val
+
+    frequency = ICS_FREQUENCIES.get(rule.get("FREQ", "").upper())
+    if not frequency:
+        raise ImportParseError(f"Unsupported RRULE frequency: {rule.get('FREQ')}")
+
+    ignored = set(rule) - {"FREQ", "INTERVAL", "UNTIL", "COUNT", "WKST"}
+    if ignored:
+        logger.info(f"Ignoring unsupported RRULE parts: {sorted(ignored)}")
+
+    try:
+        return {
+            "repeat_frequency": frequency,
+            "repeat_interval": int(rule["INTERVAL"]) if rule.get("INTERVAL") else 1,
+            "repeat_end_date": parse_ics_datetime(rule["UNTIL"]) if rule.get("UNTIL") else None,
+            "repeat_count": int(rule["COUNT"]) if rule.get("COUNT") else None,
+        }
+    except ValueError:
+        raise ImportParseError(f"Invalid RRULE: {value}")
+
+
+def iter_ics_lines(stream: BinaryIO) -> Iterator[str]:
+    """
+    .ics 바이너리 스트림을 한 줄씩 읽어 접힌 줄(folded line)을 펼쳐서 반환하는 함수
+    파일 전체를 메모리에 올리지 않습니다.
+    """
+    pending = None
+    for raw in stream:
+        line = raw.decode("utf-8-sig", errors="replace").rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            # 이전 줄의 연속
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+
+def _build_ics_event(props: Dict[str, Tuple[Dict[str, str], str]], categories: List[str],
+                     exdates: List[datetime], reminders: List[int]) -> Tuple[CreateSchedule, List[datetime]]:
+    if "DTSTART" not in props:
+        raise ImportParseError("VEVENT without DTSTART")
+    dtstart_params, dtstart_value = props["DTSTART"]
+    start_date = parse_ics_datetime(dtstart_value, dtstart_params)
+    if "DTEND" in props:
+        end_date = parse_ics_datetime(props["DTEND"][1], props["DTEND"][0])
+    elif "DURATION" in props:
+        end_date = start_date + parse_ics_duration(props["DURATION"][1])
+    elif dtstart_params.get("VALUE") == "DATE":
+        end_date = start_date + timedelta(days=1)
+    else:
+        end_date = start_date
+
+    recurrence = parse_rrule(props["RRULE"][1]) if "RRULE" in props else {}
+    schedule = CreateSchedule(
+        title=_unescape_text(props["SUMMARY"][1]) if "SUMMARY" in props else "(제목 없음)",
+        note=_unescape_text(props["DESCRIPTION"][1]) if "DESCRIPTION" in props else None,
+        important=DEFAULT_IMPORT_IMPORTANT,
+        color=DEFAULT_IMPORT_COLOR,
+        tags=list(dict.fromkeys(categories)),
+        start_date=start_date,
+        end_date=end_date,
+        is_repeat=bool(recurrence),
+        reminders=reminders or None,
+        **recurrence,
+    )
+    return schedule, exdates
+
+
+def parse_ics_events(stream: BinaryIO) -> Iterator[Tuple[Optional[CreateSchedule], List[datetime], Optional[str]]]:
+    """
+    .ics 스트림의 VEVENT를 하나씩 CreateSchedule로 변환하여 반환하는 제너레이터
+    :return: (스케줄, EXDATE 목록, 오류 메시지) - 해석할 수 없는 일정은 스케줄이 None이고 오류 메시지가 채워짐
+    """
+    in_event = in_alarm = False
+    props, categories, exdates, reminders = {}, [], [], []
+    alarm_trigger = None
+
+    for line in iter_ics_lines(stream):
+        if not line:
+            continue
+        try:
+            name, params, value = _split_property(line)
+        except ImportParseError as e:
+            if in_event:
+                logger.debug(f"Skipping invalid line in VEVENT: {e}")
+            continue
+
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            in_event, in_alarm = True, False
+            props, categories, exdates, reminders = {}, [], [], []
+        elif not in_event:
+            continue
+        elif name == "BEGIN" and value.upper() == "VALARM":
+            in_alarm, alarm_trigger = True, None
+        elif name == "END" and value.upper() == "VALARM":
+            in_alarm = False
+            # 일정 시작 기준 상대 알림(-PT15M 등)만 '몇 분 전' 알림으로 가져옴
+            if alarm_trigger is not None:
+                reminders.append(alarm_trigger)
+        elif in_alarm:
+            if name == "TRIGGER" and params.get("VALUE", "DURATION") == "DURATION" and params.get("RELATED", "START") == "START":
+                try:
+                    offset = parse_ics_duration(value)
+                    if offset <= timedelta(0):
+                        alarm_trigger = int(-offset.total_seconds() // 60)
+                except ImportParseError:
+                    pass
+        elif name == "END" and value.upper() == "VEVENT":
+            in_event = False
+            try:
+                schedule, event_exdates = _build_ics_event(props, categories, exdates, reminders)
+                yield schedule, event_exdates, None
+            except ValueError as e:  # ImportParseError, pydantic ValidationError 포함
+                yield None, [], str(e)
+        elif name == "CATEGORIES":
+            categories.extend(_unescape_text(c).strip() for c in re.split(r"(?<!\\),", value) if c.strip())
+        elif name == "EXDATE":
+            try:
+                exdates.extend(parse_ics_datetime(v, params) for v in value.split(","))
+            except ImportParseError as e:
+                logger.debug(f"Skipping invalid EXDATE: {e}")
+        else:
+            props.setdefault(name, (params, value))
+
+
+# CSV 가져오기 컬럼 (첫 줄은 헤더)
+# 날짜는 ISO 8601, 태그/예외일/알림은 ';'로 구분
+CSV_COLUMNS = [
+    "title", "note", "start_date", "end_date", "color", "important", "tags",
+    "repeat_frequency", "repeat_interval", "repeat_end_date", "repeat_count",
+    "exdates", "reminders",
+]
+
+
+def _parse_csv_datetime(value: str) -> datetime:
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise ImportParseError(f"Invalid date value: {value}")
+    return pytz.utc.localize(dt) if dt.tzinfo is None else dt.astimezone(pytz.utc)
+
+
+def parse_csv_events(stream: BinaryIO) -> Iterator[Tuple[Optional[CreateSchedule], List[datetime], Optional[str]]]:
+    """
+    CSV 스트림의 각 행을 CreateSchedule로 변환하여 반환하는 제너레이터 (컬럼은 CSV_COLUMNS 참고)
+    :return: (스케줄, 예외일 목록, 오류 메시지)
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        for row in csv.DictReader(text):
+            row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+            try:
+                split = lambda key: [v.strip() for v in row.get(key, "").split(";") if v.strip()]
+                frequency = row.get("repeat_frequency") or None
+                schedule = CreateSchedule(
+                    title=row.get("title") or "(제목 없음)",
+                    note=row.get("note") or None,
+                    important=row.get("important") or DEFAULT_IMPORT_IMPORTANT,
+                    color=row.get("color") or DEFAULT_IMPORT_COLOR,
+                    tags=list(dict.fromkeys(split("tags"))),
+                    start_date=_parse_csv_datetime(row.get("start_date", "")),
+                    end_date=_parse_csv_datetime(row.get("end_date") or row.get("start_date", "")),
+                    is_repeat=frequency is not None,
+                    repeat_frequency=frequency,
+                    repeat_interval=int(row["repeat_interval"]) if row.get("repeat_interval") else (1 if frequency else None),
+                    repeat_end_date=_parse_csv_datetime(row["repeat_end_date"]) if row.get("repeat_end_date") else None,
+                    repeat_count=int(row["repeat_count"]) if row.get("repeat_count") else None,
+                    reminders=[int(r) for r in split("reminders")] or None,
+                )
+                if frequency and frequency not in ICS_FREQUENCIES.values():
+                    raise ImportParseError(f"Unsupported repeat_frequency: {frequency}")
+                yield schedule, [_parse_csv_datetime(d) for d in split("exdates")], None
+            except ValueError as e:  # ImportParseError, pydantic ValidationError 포함
+                yield None, [], str(e)
+    finally:
+        # 업로드 파일은 호출한 쪽에서 닫으므로 래퍼만 분리
+        text.detach()
+
+
+# ---- 내보내기 (iCalendar 직렬화) ----
+
+ICS_PRODID = "-//Sche-Zoom//Schedule Feed//KO"
+ICS_CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    f"PRODID:{ICS_PRODID}\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:PUBLISH\r\n"
+)
+ICS_CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+_ICS_FREQUENCY_NAMES = {v: k for k, v in ICS_FREQUENCIES.items()}
+
+
+def format_ics_datetime(value: datetime) -> str:
+    """datetime을 UTC DATE-TIME 값(20240510T100000Z)으로 변환하는 함수 (시간대 없는 값은 UTC로 간주)"""
+    if value.tzinfo is None:
+        value = pytz.utc.localize(value)
+    return value.astimezone(pytz.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _escape_text(value: str) -> str:
+    # RFC 5545 TEXT 이스케이프
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold_line(line: str) -> str:
+    # RFC 5545: 한 줄은 75 octet을 넘지 않도록 접고, 이어지는 줄은 공백으로 시작
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, current, limit = [], b"", 75
+    for ch in line:
+        b = ch.encode("utf-8")
+        if len(current) + len(b) > limit:
+            parts.append(current.decode("utf-8"))
+            current, limit = b"", 74
+        current += b
+    parts.append(current.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def serialize_vevent(
+    schedule_id: int,
+    title: str,
+    note: Optional[str],
+    start_date: datetime,
+    end_date: datetime,
+    updated_at: Optional[datetime],
+    frequency: Optional[str] = None,
+    interval: Optional[int] = None,
+    until: Optional[datetime] = None,
+    count: Optional[int] = None,
+    exdates: Optional[List[datetime]] = None,
+    tags: Optional[List[str]] = None,
+    reminders: Optional[List[int]] = None,
+) -> str:
+    """
+    스케줄 한 건을 VEVENT 문자열로 변환하는 함수
+    반복 일정은 펼치지 않고 RRULE / EXDATE 로 내보냅니다.
+    """
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:schedule-{schedule_id}@sche-zoom",
+        f"DTSTAMP:{format_ics_datetime(updated_at or start_date)}",
+        f"DTSTART:{format_ics_datetime(start_date)}",
+        f"DTEND:{format_ics_datetime(end_date or start_date)}",
+        f"SUMMARY:{_escape_text(title or '')}",
+    ]
+    if note:
+        lines.append(f"DESCRIPTION:{_escape_text(note)}")
+    if tags:
+        lines.append("CATEGORIES:" + ",".join(_escape_text(t) for t in tags))
+    if frequency in _ICS_FREQUENCY_NAMES:
+        rule = [f"FREQ={_ICS_FREQUENCY_NAMES[frequency]}", f"INTERVAL={interval or 1}"]
+        if count:
+            rule.append(f"COUNT={count}")
+        elif until:
+            rule.append(f"UNTIL={format_ics_datetime(until)}")
+        lines.append("RRULE:" + ";".join(rule))
+        for exdate in exdates or []:
+            lines.append(f"EXDATE:{format_ics_datetime(exdate)}")
+    for minutes in reminders or []:
+        lines.extend([
+            "BEGIN:VALARM",
+            "ACTION:DISPLAY",
+            f"DESCRIPTION:{_escape_text(title or '')}",
+            f"TRIGGER:-PT{int(minutes)}M",
+            "END:VALARM",
+        ])
+    lines.append("END:VEVENT")
+    return "".join(_fold_line(line) for line in lines)
@@ -0,0 +1,261 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+import pytz
+from db.db_conn import get_db_connection, close_db_connection
+from .cache import LRUCache
+from .recurrence import expand_recurrences
+from .versioning import GET_USER_VERSION_SQL
+from .push import hub
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+사용자별 메모리 구간 인덱스 (interval index)
+- 사용자의 일정을 기준 시각 앞뒤 일정 기간(horizon) 동안 발생별로 펼쳐, 시작 시각으로 정렬한 배열 + 서브트리 최대 종료 시각
+  (정렬 배열 위의 암묵적 이진 트리, augmented interval tree)으로 보관
+- 기간 조회 / 겹침 조회: O(log n + k)
+- 인덱스는 만들 때의 user_version 을 가지며, 현재 버전과 같을 때만 사용 (다른 워커의 쓰기도 반영)
+- 변경 알림(LISTEN)을 받으면 인덱스가 있는 사용자는 백그라운드에서 다시 만듦
+- 사용자 수는 LRU 로 제한하며 (오래 조회하지 않은 사용자부터 제거), 발생 수가 너무 많은 사용자는 인덱스를 만들지 않음
+"""
+
+INTERVAL_INDEX_ENABLED = os.environ.get("interval_index_enabled", "false").lower() == "true"
+# 인덱스를 보관할 최대 사용자 수 (워커별)
+INTERVAL_INDEX_MAX_USERS = int(os.environ.get("interval_index_max_users", 1000))
+# 사용자 한 명의 최대 발생 수 (넘으면 인덱스를 만들지 않고 SQL 로 조회)
+INTERVAL_INDEX_MAX_ITEMS = int(os.environ.get("interval_index_max_items", 20000))
+# 인덱스가 다루는 기간: 만든 날 기준 과거 / 미래 일 수
+INTERVAL_INDEX_PAST_DAYS = int(os.environ.get("interval_index_past_days", 366))
+INTERVAL_INDEX_FUTURE_DAYS = int(os.environ.get("interval_index_future_days", 366))
+
+# horizon 과 겹치는 사용자의 모든 일정 (horizon 전에 시작해 horizon 안까지 이어지는 발생이 있는 반복 일정 포함)
+INDEX_SOURCE_SQL = """
+    SELECT s.id, s.title, s.color, s.start_date, s.end_date, r.frequency, r.interval, r.until, r.count
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = %(uid)s AND s.deleted_at IS NULL
+    AND s.start_date <= %(horizon_end)s
+    AND (
+        s.end_date >= %(horizon_start)s
+        OR (r.frequency IS NOT NULL AND (r.until IS NULL OR r.until >= %(horizon_start)s - (s.end_date - s.start_date)))
+    )
+"""
+
+
+class IntervalIndex:
+    """
+    한 사용자의 발생 구간 인덱스 (만든 뒤에는 바뀌지 않으므로 잠금 없이 여러 스레드에서 조회 가능)
+    - starts / ends / schedule_ids / recurring: 시작 시각 순으로 정렬한 발생별 배열
+    - max_end[mid]: 구간 [lo, hi) 의 가운데 mid 를 루트로 하는 서브트리의 최대 종료 시각
+    """
+
+    def __init__(self, version: int, horizon_start: datetime, horizon_end: datetime,
+                 items: List[Tuple[datetime, datetime, int, bool]], schedules: Dict[int, tuple]):
+        items.sort()
+        self.version = version
+        self.horizon_start = horizon_start
+        self.horizon_end = horizon_end
+        self.starts = [item[0] for item in items]
+        self.ends = [item[1] for item in items]
+        self.schedule_ids = [item[2] for item in items]
+        self.recurring = [item[3] for item in items]
+        # schedule_id -> (title, color, start_date, end_date)
+        self.schedules = schedules
+        self.max_end = list(self.ends)
+        self._build(0, len(items))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _build(self, lo: int, hi: int) -> Optional[datetime]:
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        best = self.ends[mid]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > best:
+                best = child
+        self.max_end[mid] = best
+        return best
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.horizon_start <= start and end <= self.horizon_end
+
+    def search(self, start: datetime, end: datetime) -> List[int]:
+        """기간 [start, end] 와 겹치는(경계 포함) 발생의 index 목록 (시작 시각 순)"""
+        out: List[int] = []
+        self._collect(0, len(self.starts), start, end, False, out)
+        return out
+
+    def overlaps(self, start: datetime, end: datetime) -> List[int]:
+        """구간 (start, end) 와 실제로 겹치는(맞닿는 것은 제외) 발생의 index 목록 (시작 시각 순)"""
+        out: List[int] = []
+        self._collect(0, len(self.starts), start, end, True, out)
+        return out
+
+    def _collect(self, lo: int, hi: int, start: datetime, end: datetime, strict: bool, out: List[int]):
+        # 중위 순회: 서브트리 최대 종료 시각이 start 이전이면 서브트리 전체를, 시작 시각이 end 이후이면 오른쪽을 건너뜀
+        while lo < hi:
+            mid = (lo + hi) // 2
+            max_end = self.max_end[mid]
+            if max_end < start or (strict and max_end == start):
+                return
+            self._collect(lo, mid, start, end, strict, out)
+            item_start = self.starts[mid]
+            if item_start > end or (strict and item_start == end):
+                return
+            item_end = self.ends[mid]
+            if item_end > start or (not strict and item_end == start):
+                out.append(mid)
+            lo = mid + 1
+
+
+_indexes = LRUCache(INTERVAL_INDEX_MAX_USERS)
+_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interval-index")
+_pending = set()
+_pending_lock = threading.Lock()
+# 발생 수가 너무 많아 인덱스를 만들지 않은 사용자 -> 그때의 버전 (같은 버전이면 다시 만들지 않음)
+_too_large = LRUCache(INTERVAL_INDEX_MAX_USERS)
+_stats = {"builds": 0, "too_large": 0, "stale": 0, "build_errors": 0}
+
+
+def _horizon(now: datetime) -> Tuple[datetime, datetime]:
+    today = now.astimezone(pytz.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=INTERVAL_INDEX_PAST_DAYS), today + timedelta(days=INTERVAL_INDEX_FUTURE_DAYS + 1)
+
+
+def load_interval_index(cur, uid: int, version: int, horizon_start: datetime, horizon_end: datetime,
+                        exclude_id: Optional[int] = None, max_items: Optional[int] = None) -> Optional[IntervalIndex]:
+    """
+    기간 [horizon_start, horizon_end] 에 대한 사용자의 구간 인덱스를 DB 에서 읽어 만드는 함수
+    :param exclude_id: 제외할 스케줄 ID (수정 중인 스케줄)
+    :return: 발생 수가 max_items 를 넘으면 None
+    """
+    query = INDEX_SOURCE_SQL
+    params = {"uid": uid, "horizon_start": horizon_start, "horizon_end": horizon_end}
+    if exclude_id is not None:
+        query += " AND s.id <> %(exclude_id)s"
+        params["exclude_id"] = exclude_id
+    cur.execute(query, params)
+    rows = cur.fetchall()
+
+    items, series, schedules = [], [], {}
+    lookback = timedelta(0)
+    for schedule_id, title, color, start_date, end_date, frequency, interval, until, count in rows:
+        schedules[schedule_id] = (title, color, start_date, end_date)
+        if frequency:
+            series.append((schedule_id, start_date, frequency, interval, until, count))
+            lookback = max(lookback, end_date - start_date)
+        else:
+            items.append((start_date, end_date, schedule_id, False))
+
+    # horizon 전에 시작해 horizon 안까지 이어지는 발생도 포함하도록, 가장 긴 일정 길이만큼 앞에서부터 펼침
+    occurrences = expand_recurrences(cur, series, horizon_start - lookback, horizon_end)
+    for schedule_id, events in occurrences.items():
+        _, _, start_date, end_date = schedules[schedule_id]
+        duration = end_date - start_date
+        items.extend((event, event + duration, schedule_id, True) for event in events)
+        if max_items is not None and len(items) > max_items:
+            return None
+    if max_items is not None and len(items) > max_items:
+        return None
+    return IntervalIndex(version, horizon_start, horizon_end, items, schedules)
+
+
+def build_interval_index(uid: int) -> Union[IntervalIndex, int]:
+    """
+    사용자의 구간 인덱스를 만드는 함수 (버전과 일정을 같은 스냅샷에서 읽음)
+    :return: 발생 수가 INTERVAL_INDEX_MAX_ITEMS 를 넘으면 인덱스 대신 그때의 버전
+    """
+    horizon_start, horizon_end = _horizon(datetime.now(pytz.utc))
+    conn = get_db_connection(read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;\n" + GET_USER_VERSION_SQL, (uid,))
+        row = cur.fetchone()
+        version = row[0] if row else 0
+        index = load_interval_index(cur, uid, version, horizon_start, horizon_end, max_items=INTERVAL_INDEX_MAX_ITEMS)
+        return version if index is None else index
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
+
+
+def _build_and_store(uid: int):
+    try:
+        index = build_interval_index(uid)
+        _stats["builds"] += 1
+        if isinstance(index, int):
+            _stats["too_large"] += 1
+            _indexes.pop(uid)
+            _too_large.set(uid, index)
+        else:
+            _indexes.set(uid, index)
+            _too_large.pop(uid)
+    except Exception as e:
+        _stats["build_errors"] += 1
+        logger.error(f"Failed to build interval index for user {uid}: {e}")
+    finally:
+        with _pending_lock:
+            _pending.discard(uid)
+
+
+def schedule_index_build(uid: int):
+    """사용자의 인덱스를 백그라운드에서 (다시) 만들도록 예약하는 함수 (이미 예약되어 있으면 무시)"""
+    with _pending_lock:
+        if uid in _pending:
+            return
+        _pending.add(uid)
+    _builder.submit(_build_and_store, uid)
+
+
+def get_interval_index(uid: int, version: int, start: datetime, end: datetime) -> Optional[IntervalIndex]:
+    """
+    기간 [start, end] 를 조회할 수 있는 최신(version 과 같은) 인덱스를 반환하는 함수
+    없거나 오래된 경우에는 None 을 반환하고 백그라운드에서 다시 만들도록 예약합니다. (호출한 요청은 SQL 로 조회)
+    """
+    if not INTERVAL_INDEX_ENABLED:
+        return None
+    index = _indexes.get(uid)
+    if index is not None and index.version == version:
+        if index.covers(start, end):
+            return index
+        # 날짜가 바뀌어 horizon 이 옮겨진 경우에만 다시 만듦 (horizon 밖의 기간은 SQL 로 조회)
+        if (index.horizon_start, index.horizon_end) != _horizon(datetime.now(pytz.utc)):
+            schedule_index_build(uid)
+        return None
+    if index is not None:
+        _stats["stale"] += 1
+    if _too_large.peek(uid) != version:
+        schedule_index_build(uid)
+    return None
+
+
+def _on_user_changed(uid: Optional[int], version: Optional[int]):
+    # 인덱스가 있는 사용자가 바뀌면 다음 조회 전에 다시 만들어 둠 (인덱스가 없는 사용자는 조회할 때 만듦)
+    # 전체 다시 읽기(uid=None)는 무시 - 인덱스는 조회할 때 버전으로 검증하므로 누락된 알림은 미리 만들지 못할 뿐임
+    if uid is None:
+        return
+    index = _indexes.peek(uid)
+    if index is not None and index.version < version:
+        schedule_index_build(uid)
+
+
+if INTERVAL_INDEX_ENABLED:
+    hub.add_change_listener(_on_user_changed)
+
+
+def get_interval_index_stats() -> dict:
+    return {
+        "enabled": INTERVAL_INDEX_ENABLED,
+        "users": _indexes.stats(),
+        "items": sum(len(index) for index in _indexes.values()),
+        "pending_builds": len(_pending),
+        **_stats,
+    }
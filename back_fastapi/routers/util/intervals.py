@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+"""
+시간 구간(interval) 계산 유틸 - 빈 시간 조회(/freebusy) 용
+- merge_intervals: 시작 시각으로 정렬한 뒤 한 번 훑으며(sweep) 겹치거나 맞닿은 구간을 합침 - O(n log n)
+- free_slots: 합친 바쁜 구간 사이의 빈 구간 중 최소 길이 이상인 것 - O(n)
+"""
+
+Interval = Tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval], window_start: datetime, window_end: datetime) -> List[Interval]:
+    """
+    구간들을 기간 [window_start, window_end] 로 자른 뒤, 겹치거나 맞닿은 구간을 합쳐 시작 시각 순으로 반환하는 함수
+    (기간 밖이거나 길이가 0인 구간은 제외)
+    """
+    clipped = []
+    for start, end in intervals:
+        start, end = max(start, window_start), min(end, window_end)
+        if start < end:
+            clipped.append((start, end))
+    clipped.sort()
+
+    merged: List[Interval] = []
+    for start, end in clipped:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_slots(busy: List[Interval], window_start: datetime, window_end: datetime,
+               min_length: timedelta) -> List[Interval]:
+    """
+    merge_intervals 로 합친 바쁜 구간 사이의 빈 구간 중 길이가 min_length 이상인 것을 반환하는 함수
+    """
+    slots: List[Interval] = []
+    cursor = window_start
+    for start, end in busy:
+        if start - cursor >= min_length:
+            slots.append((cursor, start))
+        cursor = max(cursor, end)
+    if window_end - cursor >= min_length:
+        slots.append((cursor, window_end))
+    return slots
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 import jwt
 from fastapi import HTTPException, status
-from db.db_conn import get_db_connection, close_db_connection
+from db.db_conn import get_db_connection, close_db_connection, register_prepared_statement, execute_prepared
 from jwt import PyJWTError
 
 # JWT 설정 상수
@@ -9,6 +9,9 @@ SECRET_KEY = "JeonKinSong"  # 실제 시크릿 키로 교체
 ALGORITHM = "HS256"  # 사용하고자 하는 알고리즘으로 교체
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 토큰 만료 시간 (분)
 
+# 모든 인증 요청마다 실행되는 블랙리스트 조회 쿼리
+register_prepared_statement("token_blacklist_lookup", "SELECT 1 FROM blacklisted_tokens WHERE token = %s")
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     # 현재 UTC 시간 + 만료 시간 (60분)
@@ -83,10 +86,7 @@ def is_token_blacklisted(token: str):
     conn = get_db_connection()  # 데이터베이스 연결
     cur = conn.cursor()
     try:
-        cur.execute(
-            "SELECT 1 FROM blacklisted_tokens WHERE token = %s",
-            (token,)
-        )  # 블랙리스트 테이블에서 토큰 존재 확인 쿼리 실행
+        execute_prepared(cur, "token_blacklist_lookup", (token,))  # 블랙리스트 테이블에서 토큰 존재 확인 쿼리 실행
         result = cur.fetchone()  # 결과 가져오기
         
         return result is not None  # 결과가 있으면 블랙리스트에 있음
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import os
+from typing import Callable, Dict, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+from db.db_conn import open_listen_connection
+from .versioning import CHANGE_NOTIFY_CHANNEL
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+스케줄 변경 push (LISTEN/NOTIFY fan-out)
+- 쓰기 트랜잭션은 user_version 을 올릴 때 "uid:version" 을 NOTIFY (routers.util.versioning)
+- 워커마다 LISTEN 커넥션 하나(ChangeListener)가 알림을 받아, 해당 사용자의 WebSocket들에 전달(PushHub)
+- 메시지는 버전만 알리며, 클라이언트는 GET /api/per-schedule/sync?since=<token> 으로 변경분을 가져옴
+- 느린 소비자: 연결별 대기열이 가득 차면 밀린 메시지를 버리고 resync 메시지 하나로 대체 (메모리 사용량 일정)
+"""
+
+# 연결별 대기 메시지 수 (넘치면 resync 로 대체)
+PUSH_QUEUE_SIZE = int(os.environ.get("push_queue_size", 16))
+# 메시지 하나를 보내는 최대 시간 (초) - 넘기면 연결을 끊음
+PUSH_SEND_TIMEOUT_SECONDS = float(os.environ.get("push_send_timeout_seconds", 10))
+# 워커당 최대 WebSocket 연결 수
+PUSH_MAX_CONNECTIONS = int(os.environ.get("push_max_connections", 10000))
+# LISTEN 커넥션이 끊어졌을 때 재연결 간격 (초, 실패할 때마다 두 배로 늘어나며 최대값까지)
+LISTEN_RETRY_SECONDS = 1
+LISTEN_RETRY_MAX_SECONDS = 30
+
+# 알림이 누락되었을 수 있으므로 전체 변경분을 다시 가져오라는 메시지
+RESYNC_MESSAGE = json.dumps({"type": "resync"})
+
+
+class Subscriber:
+    """WebSocket 연결 하나의 대기열"""
+
+    def __init__(self, uid: int):
+        self.uid = uid
+        self.queue = asyncio.Queue(maxsize=PUSH_QUEUE_SIZE)
+        self.overflows = 0
+
+    def offer(self, message: str) -> bool:
+        """
+        메시지를 대기열에 넣는 함수 (이벤트 루프 안에서만 호출)
+        :return: 대기열이 넘쳐 resync 로 대체했으면 False
+        """
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_MESSAGE)
+            self.overflows += 1
+            return False
+
+
+class PushHub:
+    """사용자별 WebSocket 구독 목록 (워커 프로세스 단위, 이벤트 루프 안에서만 사용)"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._change_listeners: List[Callable[[Optional[int], Optional[int]], None]] = []
+        self.connections = 0
+        self.notifications = 0
+        self.delivered = 0
+        self.overflowed = 0
+        self.rejected = 0
+        self.slow_disconnects = 0
+        self.listener_reconnects = 0
+
+    def subscribe(self, uid: int) -> Subscriber:
+        subscriber = Subscriber(uid)
+        self._subscribers.setdefault(uid, set()).add(subscriber)
+        self.connections += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self._subscribers.get(subscriber.uid)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[subscriber.uid]
+        self.connections -= 1
+
+    def is_full(self) -> bool:
+        return self.connections >= PUSH_MAX_CONNECTIONS
+
+    def add_change_listener(self, listener: Callable[[Optional[int], Optional[int]], None]):
+        """
+        모든 변경 알림마다 listener(uid, version) 를 호출하도록 등록 (WebSocket 구독과 무관, 워커 내 캐시 갱신용)
+        LISTEN 을 (다시) 시작할 때마다 listener(None, None) 을 호출하며, 이때는 알림이 누락되었을 수 있으므로 전체를 다시 읽어야 합니다.
+        이벤트 루프 안에서 호출되므로 listener 는 바로 반환해야 합니다.
+        """
+        self._change_listeners.append(listener)
+
+    def resync_listeners(self):
+        """모든 change listener 에 전체 다시 읽기(uid=None)를 알림"""
+        for listener in self._change_listeners:
+            try:
+                listener(None, None)
+            except Exception as e:
+                logger.error(f"Change listener failed to resync: {e}")
+
+    def publish(self, uid: int, message: str):
+        """사용자의 모든 연결에 메시지 전달 (메시지는 한 번만 인코딩하여 공유)"""
+        for subscriber in self._subscribers.get(uid, ()):
+            if subscriber.offer(message):
+                self.delivered += 1
+            else:
+                self.overflowed += 1
+
+    def publish_all(self, message: str):
+        for uid in list(self._subscribers):
+            self.publish(uid, message)
+
+    def dispatch_notification(self, payload: str):
+        # NOTIFY payload: "uid:version"
+        self.notifications += 1
+        try:
+            uid, version = (int(value) for value in payload.split(":", 1))
+        except ValueError:
+            logger.warning(f"Ignoring malformed change notification: {payload!r}")
+            return
+        for listener in self._change_listeners:
+            try:
+                listener(uid, version)
+            except Exception as e:
+                logger.error(f"Change listener failed for user {uid}: {e}")
+        if uid in self._subscribers:
+            self.publish(uid, json.dumps({"type": "changed", "version": version}))
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "users": len(self._subscribers),
+            "max_connections": PUSH_MAX_CONNECTIONS,
+            "notifications": self.notifications,
+            "delivered": self.delivered,
+            "overflowed": self.overflowed,
+            "rejected": self.rejected,
+            "slow_disconnects": self.slow_disconnects,
+            "listener_reconnects": self.listener_reconnects,
+        }
+
+
+hub = PushHub()
+
+
+async def _consume_notifications(conn):
+    # LISTEN 커넥션의 소켓이 읽기 가능해질 때마다 알림을 꺼내 전달 (커넥션이 끊어지면 예외로 종료)
+    loop = asyncio.get_running_loop()
+    closed = loop.create_future()
+    fd = conn.fileno()
+
+    def on_readable():
+        try:
+            conn.poll()
+        except Exception as e:
+            loop.remove_reader(fd)
+            if not closed.done():
+                closed.set_exception(e)
+            return
+        while conn.notifies:
+            hub.dispatch_notification(conn.notifies.pop(0).payload)
+
+    loop.add_reader(fd, on_readable)
+    try:
+        await closed
+    finally:
+        loop.remove_reader(fd)
+
+
+async def run_change_listener():
+    """
+    워커당 하나의 LISTEN 커넥션을 유지하는 task (앱 lifespan에서 시작, 종료 시 cancel)
+    재연결한 경우에는 끊어진 동안의 알림이 누락되었을 수 있으므로 모든 연결에 resync 를 보냅니다.
+    change listener 에는 처음 연결할 때도 (시작 전의 알림) 전체 다시 읽기를 알립니다.
+    """
+    delay = LISTEN_RETRY_SECONDS
+    connected_before = False
+    while True:
+        conn = None
+        try:
+            conn = await run_in_threadpool(open_listen_connection)
+            conn.cursor().execute(f"LISTEN {CHANGE_NOTIFY_CHANNEL}")
+            logger.info(f"Listening for {CHANGE_NOTIFY_CHANNEL} notifications")
+            hub.resync_listeners()
+            if connected_before:
+                hub.listener_reconnects += 1
+                hub.publish_all(RESYNC_MESSAGE)
+            connected_before = True
+            delay = LISTEN_RETRY_SECONDS
+            await _consume_notifications(conn)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Change listener failed, reconnecting in {delay}s: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, LISTEN_RETRY_MAX_SECONDS)
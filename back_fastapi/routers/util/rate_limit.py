@@ -0,0 +1,280 @@
+import asyncio
+import math
+import os
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+import jwt
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from db.db_conn import DB_POOL_MAX
+from .auth import SECRET_KEY, ALGORITHM
+from .cache import LRUCache
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+요청 수 제한 (admission control)
+- 토큰 버킷: 요청 분류(auth / read / write) x 기준(uid / ip) 별로 초당 요청 수와 순간 최대 요청 수(burst)를 제한하고,
+  초과하면 429 + Retry-After 를 반환
+- 동시 실행 제한: bcrypt 해싱과 DB를 사용하는 라우트의 동시 실행 수를 제한하여,
+  커넥션 풀이 바닥나기 전에 대기열이 넘치는 요청을 503 + Retry-After 로 거절 (load shedding)
+상태는 워커 프로세스 메모리에만 두며, 버킷 수는 LRU로 제한합니다.
+"""
+
+
+def _read_limit(name: str, default: Tuple[float, int]) -> Tuple[float, int]:
+    # 환경 변수 형식: "초당 요청 수,burst" (예: rate_limit_read_uid=20,60)
+    value = os.environ.get(name)
+    if not value:
+        return default
+    rate, burst = value.split(",")
+    return float(rate), int(burst)
+
+
+# (요청 분류, 기준) -> (초당 토큰 충전량, 버킷 크기)
+RATE_LIMITS = {
+    ("auth", "ip"): _read_limit("rate_limit_auth_ip", (0.5, 10)),
+    ("read", "uid"): _read_limit("rate_limit_read_uid", (20.0, 60)),
+    ("read", "ip"): _read_limit("rate_limit_read_ip", (50.0, 150)),
+    ("write", "uid"): _read_limit("rate_limit_write_uid", (5.0, 30)),
+    ("write", "ip"): _read_limit("rate_limit_write_ip", (20.0, 60)),
+}
+RATE_LIMIT_ENABLED = os.environ.get("rate_limit_enabled", "true").lower() != "false"
+# 메모리에 유지하는 최대 버킷 수 (초과 시 가장 오래 사용하지 않은 버킷부터 버림)
+RATE_LIMIT_MAX_BUCKETS = int(os.environ.get("rate_limit_max_buckets", 100000))
+
+# bcrypt 동시 실행 수 (CPU 코어 수 이상으로 늘려도 처리량은 늘지 않고 지연만 늘어남)
+BCRYPT_CONCURRENCY = int(os.environ.get("bcrypt_concurrency", os.cpu_count() or 1))
+# DB 사용 라우트 동시 실행 수 (기본: 워커 커넥션 풀 크기)
+DB_ROUTE_CONCURRENCY = int(os.environ.get("db_route_concurrency", DB_POOL_MAX))
+# 동시 실행 수를 넘은 요청이 기다릴 수 있는 최대 수 / 최대 시간 (초)
+CONCURRENCY_MAX_WAITING = int(os.environ.get("concurrency_max_waiting", 2 * DB_ROUTE_CONCURRENCY))
+CONCURRENCY_WAIT_SECONDS = float(os.environ.get("concurrency_wait_seconds", 2))
+
+# 경로 접두어 -> 요청 분류 (목록에 없는 경로는 제한하지 않음)
+AUTH_PATH_PREFIX = "/api/sign/"
+DB_PATH_PREFIXES = ("/api/per-schedule/",)
+READ_METHODS = ("GET", "HEAD")
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: int, now: float):
+        self.tokens = float(burst)
+        self.updated = now
+
+    def refill(self, rate: float, burst: int, now: float):
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+
+class ConcurrencyLimiter:
+    """
+    동시 실행 수 제한 (이벤트 루프 안에서만 사용)
+    limit 개를 넘는 요청은 최대 max_waiting 개까지 timeout 초 동안 기다리고, 그 이상은 바로 거절합니다.
+    """
+
+    def __init__(self, name: str, limit: int, max_waiting: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    async def acquire(self) -> bool:
+        if self._semaphore.locked() and self.waiting >= self.max_waiting:
+            self.shed += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        if not await self.acquire():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The server is busy. Please try again later.",
+                headers={"Retry-After": str(math.ceil(self.timeout))},
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+bcrypt_limiter = ConcurrencyLimiter("bcrypt", BCRYPT_CONCURRENCY, CONCURRENCY_MAX_WAITING, CONCURRENCY_WAIT_SECONDS)
+db_route_limiter = ConcurrencyLimiter("db_routes", DB_ROUTE_CONCURRENCY, CONCURRENCY_MAX_WAITING, CONCURRENCY_WAIT_SECONDS)
+
+_buckets = LRUCache(RATE_LIMIT_MAX_BUCKETS)
+_rate_limit_stats: Dict[str, Dict[str, int]] = {
+    route_class: {"allowed": 0, "limited": 0} for route_class in ("auth", "read", "write")
+}
+
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    """
+    요청 분류를 반환하는 함수 (auth / read / write, 제한하지 않는 경로는 None)
+    """
+    if path.startswith(AUTH_PATH_PREFIX):
+        return "auth"
+    if path.startswith(DB_PATH_PREFIXES):
+        return "read" if method in READ_METHODS else "write"
+    return None
+
+
+def peek_user_id(authorization: Optional[str], feed_token: Optional[str] = None) -> Optional[int]:
+    """
+    요청 수 제한용으로 토큰에서 사용자 ID만 꺼내는 함수
+    서명과 만료만 확인하고 DB(블랙리스트)는 조회하지 않으며, 잘못된 토큰이면 None (IP 기준으로만 제한)
+    """
+    token = None
+    if authorization and authorization[:7].lower() == "bearer ":
+        token = authorization[7:]
+    token = token or feed_token
+    if not token:
+        return None
+    try:
+        uid = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("uid")
+    except Exception:
+        return None
+    return uid if isinstance(uid, int) else None
+
+
+def check_rate_limit(route_class: str, uid: Optional[int], ip: Optional[str]) -> float:
+    """
+    요청을 허용할 수 있는지 확인하는 함수
+    적용되는 모든 버킷(uid, ip)에 토큰이 있을 때만 토큰을 하나씩 사용합니다.
+    :return: 0 이면 허용, 0보다 크면 다시 시도할 수 있을 때까지의 시간 (초)
+    """
+    now = time.monotonic()
+    buckets = []
+    for scope, ident in (("uid", uid), ("ip", ip)):
+        limit = RATE_LIMITS.get((route_class, scope))
+        if limit is None or ident is None:
+            continue
+        rate, burst = limit
+        key = (route_class, scope, ident)
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(burst, now)
+            _buckets.set(key, bucket)
+        bucket.refill(rate, burst, now)
+        buckets.append((bucket, rate))
+
+    retry_after = max((((1 - bucket.tokens) / rate) for bucket, rate in buckets if bucket.tokens < 1), default=0.0)
+    if retry_after > 0:
+        _rate_limit_stats[route_class]["limited"] += 1
+        return retry_after
+    for bucket, _ in buckets:
+        bucket.tokens -= 1
+    _rate_limit_stats[route_class]["allowed"] += 1
+    return 0.0
+
+
+def _too_many_requests(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests. Please try again later."},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _busy() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "The server is busy. Please try again later."},
+        headers={"Retry-After": str(max(1, math.ceil(CONCURRENCY_WAIT_SECONDS)))},
+    )
+
+
+class AdmissionControlMiddleware:
+    """
+    요청 수 제한 + DB 라우트 동시 실행 제한 ASGI 미들웨어
+    라우트 처리 전에 거절하므로 거절된 요청은 커넥션 풀이나 bcrypt를 사용하지 않습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        route_class = classify_request(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        authorization = headers.get(b"authorization", b"").decode("latin-1") or None
+        feed_token = None
+        if not authorization and b"feed_token=" in scope.get("query_string", b""):
+            feed_token = parse_qs(scope["query_string"].decode("latin-1")).get("feed_token", [None])[0]
+        uid = peek_user_id(authorization, feed_token) if route_class != "auth" else None
+        ip = scope["client"][0] if scope.get("client") else None
+
+        retry_after = check_rate_limit(route_class, uid, ip)
+        if retry_after > 0:
+            await _too_many_requests(retry_after)(scope, receive, send)
+            return
+
+        if route_class == "auth":
+            # 인증 라우트는 bcrypt_limiter 로 라우트 안에서 제한
+            await self.app(scope, receive, send)
+            return
+
+        if not await db_route_limiter.acquire():
+            await _busy()(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            db_route_limiter.release()
+
+
+def get_admission_stats() -> dict:
+    """
+    요청 수 제한 / 동시 실행 제한 통계를 반환하는 함수
+    """
+    return {
+        "rate_limit": {
+            "enabled": RATE_LIMIT_ENABLED,
+            "buckets": len(_buckets),
+            "max_buckets": RATE_LIMIT_MAX_BUCKETS,
+            "evictions": _buckets.evictions,
+            "by_class": {route_class: dict(counts) for route_class, counts in _rate_limit_stats.items()},
+        },
+        "concurrency": {
+            limiter.name: limiter.stats() for limiter in (bcrypt_limiter, db_route_limiter)
+        },
+    }
@@ -0,0 +1,104 @@
+import hashlib
+import hmac
+import time
+from http.cookies import SimpleCookie, CookieError
+from typing import Optional, Tuple
+from db.db_conn import DB_REPLICA_HOSTS, DB_READ_STICKY_SECONDS, request_write_marker, mark_user_write
+from .auth import SECRET_KEY
+from .push import hub
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+워커 프로세스를 넘어서는 read-your-writes (읽기 replica 를 사용하는 경우)
+- 쓰기 응답에 서명한 쿠키(사용자, 만료 시각)를 붙이고, 같은 클라이언트의 다음 요청은 어느 워커로 가도
+  만료 전까지 그 사용자의 읽기를 primary 에서 처리 (db.db_conn 의 request_write_marker 로 전달)
+- 쿠키를 보내지 않는 클라이언트를 위해, 변경 알림(NOTIFY)을 받은 모든 워커도 그 사용자를 db_read_sticky_seconds 동안 primary 로 읽음
+- 응답 헤더를 보낸 뒤에 커밋하는 쓰기(가져오기 스트림)는 쿠키를 붙이지 못하며 변경 알림으로만 전달됨
+"""
+
+WRITE_MARKER_COOKIE = "rw_until"
+
+
+def _signature(payload: str) -> str:
+    return hmac.new(SECRET_KEY.encode(), payload.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def sign_write_marker(uid: int, until: float) -> str:
+    """쓰기 표시 쿠키 값 (uid.만료 epoch 초.서명)"""
+    payload = f"{uid}.{int(until)}"
+    return f"{payload}.{_signature(payload)}"
+
+
+def parse_write_marker(value: str) -> Optional[Tuple[int, float]]:
+    """
+    쓰기 표시 쿠키 값을 검증하는 함수
+    :return: (uid, 만료 epoch 초) - 서명이 맞지 않거나 형식이 잘못되면 None
+    """
+    uid, _, rest = value.partition(".")
+    until, _, signature = rest.partition(".")
+    if not uid.isdigit() or not until.isdigit():
+        return None
+    if not hmac.compare_digest(signature, _signature(f"{uid}.{until}")):
+        return None
+    return int(uid), float(until)
+
+
+def _read_cookie(headers) -> Optional[Tuple[int, float]]:
+    for name, value in headers:
+        if name != b"cookie":
+            continue
+        try:
+            cookie = SimpleCookie(value.decode("latin-1"))
+        except CookieError:
+            continue
+        if WRITE_MARKER_COOKIE in cookie:
+            return parse_write_marker(cookie[WRITE_MARKER_COOKIE].value)
+    return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    쓰기 표시 쿠키를 읽고 쓰는 ASGI 미들웨어 (replica 를 사용하지 않으면 아무것도 하지 않음)
+    요청마다 request_write_marker 를 설정하며, 라우트에서 쓰기를 하면 (mark_user_write) 응답에 새 쿠키를 붙입니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not DB_REPLICA_HOSTS:
+            await self.app(scope, receive, send)
+            return
+
+        marker = {"uid": None, "until": 0.0, "wrote": None}
+        parsed = _read_cookie(scope.get("headers") or [])
+        if parsed is not None:
+            marker["uid"], marker["until"] = parsed
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and marker["wrote"] is not None:
+                until = time.time() + DB_READ_STICKY_SECONDS
+                cookie = (f"{WRITE_MARKER_COOKIE}={sign_write_marker(marker['wrote'], until)}; "
+                          f"Max-Age={int(DB_READ_STICKY_SECONDS) + 1}; Path=/; HttpOnly; SameSite=Lax")
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        # 라우트와 스레드풀 작업은 같은 dict 를 공유하므로 스레드풀에서 한 쓰기도 응답 쿠키에 반영됨
+        token = request_write_marker.set(marker)
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            request_write_marker.reset(token)
+
+
+def _on_user_changed(uid: Optional[int], version: Optional[int]):
+    # 다른 워커에서 쓰기를 한 사용자도 이 워커에서 primary 로 읽음 (전체 다시 읽기 신호는 무시)
+    if uid is not None:
+        mark_user_write(uid)
+
+
+if DB_REPLICA_HOSTS:
+    hub.add_change_listener(_on_user_changed)
@@ -0,0 +1,111 @@
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import pytz
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from db.db_conn import register_prepared_statement, execute_prepared
+from .utils import generate_recurring_events
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+반복 일정 펼치기 엔진
+- python: 반복 규칙과 예외를 가져와 generate_recurring_events 로 펼침 (기본값)
+- sql   : DB 함수 expand_recurrence (db/sql/004_expand_recurrence.sql) 로 DB 안에서 펼쳐 발생 시각만 가져옴
+두 엔진 모두 스케줄 수와 상관없이 쿼리 한 번으로 처리하며, 같은 결과를 반환해야 합니다.
+(bench/check_recurrence_engines.py 로 확인)
+"""
+
+RECURRENCE_ENGINES = ("python", "sql")
+RECURRENCE_ENGINE = os.environ.get("recurrence_engine", "python").lower()
+if RECURRENCE_ENGINE not in RECURRENCE_ENGINES:
+    raise ValueError(f"Invalid recurrence_engine: {RECURRENCE_ENGINE}. Use one of {RECURRENCE_ENGINES}.")
+
+# 스케줄 목록의 반복 예외 (python 엔진)
+RECURRENCE_EXCEPTIONS_SQL = """
+    SELECT r.schedule_id, e.start_date
+    FROM recurrence_exception e
+    JOIN recurrence r ON r.id = e.recurrence_id
+    WHERE r.schedule_id = ANY(%s)
+"""
+
+# 스케줄 목록의 기간 내 발생 시각 (sql 엔진)
+EXPAND_RECURRENCES_SQL = """
+    SELECT r.schedule_id, o.occurrence
+    FROM recurrence r
+    JOIN schedule s ON s.id = r.schedule_id
+    CROSS JOIN LATERAL expand_recurrence(
+        s.start_date, r.frequency, r.interval, r.until, r.count, %s, %s,
+        ARRAY(SELECT e.start_date FROM recurrence_exception e WHERE e.recurrence_id = r.id)
+    ) AS o(occurrence)
+    WHERE r.schedule_id = ANY(%s)
+    ORDER BY r.schedule_id, o.occurrence
+"""
+
+register_prepared_statement("recurrence_exceptions", RECURRENCE_EXCEPTIONS_SQL)
+if RECURRENCE_ENGINE == "sql":
+    # DB 함수가 필요하므로 sql 엔진을 사용할 때만 warm-up 에서 PREPARE
+    register_prepared_statement("expand_recurrences", EXPAND_RECURRENCES_SQL)
+
+# (schedule_id, start_date, frequency, interval, until, count)
+Series = Tuple[int, datetime, str, Optional[int], Optional[datetime], Optional[int]]
+
+
+def _to_utc(dt: datetime) -> datetime:
+    return pytz.utc.localize(dt) if dt.tzinfo is None else dt.astimezone(pytz.utc)
+
+
+def _execute(cur, name: str, query: str, params):
+    # prepared statement 는 트랜잭션의 첫 쿼리일 때만 fallback 할 수 있으므로, 그 외에는 일반 쿼리로 실행
+    if cur.connection.get_transaction_status() == TRANSACTION_STATUS_IDLE:
+        execute_prepared(cur, name, params)
+    else:
+        cur.execute(query, params)
+
+
+def expand_recurrences(
+    cur,
+    series: Sequence[Series],
+    window_start: datetime,
+    window_end: datetime,
+    engine: Optional[str] = None,
+) -> Dict[int, List[datetime]]:
+    """
+    반복 일정 목록을 기간 [window_start, window_end] 안의 발생 시각(UTC)으로 펼치는 함수
+    :param series: (schedule_id, start_date, frequency, interval, until, count) 목록
+    :param engine: python 또는 sql (기본값: 환경 변수 recurrence_engine)
+    :return: schedule_id -> 발생 시각 목록 (발생이 없는 스케줄은 빈 목록)
+    """
+    engine = engine or RECURRENCE_ENGINE
+    # 시간대가 없는 기간은 UTC로 해석 (두 엔진이 같은 기간을 사용하도록)
+    window_start, window_end = _to_utc(window_start), _to_utc(window_end)
+    occurrences = {row[0]: [] for row in series}
+    if not series:
+        return occurrences
+    schedule_ids = list(occurrences)
+
+    if engine == "sql":
+        _execute(cur, "expand_recurrences", EXPAND_RECURRENCES_SQL, (window_start, window_end, schedule_ids))
+        for schedule_id, occurrence in cur.fetchall():
+            occurrences[schedule_id].append(_to_utc(occurrence))
+        return occurrences
+
+    _execute(cur, "recurrence_exceptions", RECURRENCE_EXCEPTIONS_SQL, (schedule_ids,))
+    exceptions = {}
+    for schedule_id, start_date in cur.fetchall():
+        exceptions.setdefault(schedule_id, set()).add(_to_utc(start_date))
+
+    for schedule_id, start_date, frequency, interval, until, count in series:
+        occurrences[schedule_id] = generate_recurring_events(
+            start_date=start_date,
+            frequency=frequency,
+            interval=interval or 1,
+            until=until,
+            count=count,
+            requested_start=window_start,
+            requested_end=window_end,
+            exceptions=exceptions.get(schedule_id),
+        )
+    return occurrences
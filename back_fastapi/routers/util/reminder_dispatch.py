@@ -0,0 +1,495 @@
+import asyncio
+import heapq
+import os
+import smtplib
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from email.utils import format_datetime
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+import pytz
+from starlette.concurrency import run_in_threadpool
+from db.db_conn import get_db_connection, close_db_connection, open_listen_connection
+from .reminder_due import HORIZON_SQL
+from .push import hub
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+알림 메일 발송 (reminder dispatcher)
+- 알림 시각(발생 시작 - reminder.days_before 분)이 다음 구간(slice) 안에 있는 메일 알림만 DB 에서 읽어 메모리 힙(알림 시각 순)에 넣고,
+  시각이 되면 꺼내 REMINDER_BATCH_SIZE 개씩 SMTP 연결 하나로 보냄
+  - 구간마다 알림 시각 인덱스(reminder_due, routers/util/reminder_due.py)를 fire_at 범위로 한 번만 조회 - 펼치거나 전체 조회하지 않음
+  - 변경 알림(LISTEN)을 받은 사용자는 힙에서 빼고 남은 구간을 다시 읽음 (일정 / 알림 수정, 삭제 반영)
+  - 변경 알림이 누락되었을 수 있는 경우(LISTEN 연결 / 재연결)와 REMINDER_RESYNC_SECONDS 마다 읽어 둔 구간 전체를 다시 읽음
+- 발송 기록(reminder_delivery, db/sql/007_reminder_delivery.sql)으로 알림마다 한 번만 보냄
+  1. 보내기 전에 (스케줄, 몇 분 전, 발생 시작) 을 status='sending' 으로 INSERT ... ON CONFLICT DO NOTHING 하고 커밋 (이미 있으면 보내지 않음)
+  2. SMTP 서버가 받으면 'sent', 영구 오류(5xx)면 'failed'
+  3. 'sending' 인 채로 REMINDER_LEASE_SECONDS 가 지난 행(보내는 도중 재시작, 일시 오류)은 같은 Message-ID 로 다시 보냄
+- 여러 워커 중 advisory lock 을 잡은 하나만 발송 (lock 을 잡은 워커가 종료되면 다른 워커가 이어받음)
+"""
+
+REMINDER_DISPATCH_ENABLED = os.environ.get("reminder_dispatch_enabled", "false").lower() == "true"
+# 한 번에 읽어 두는 구간 길이 (분)
+REMINDER_SLICE_MINUTES = int(os.environ.get("reminder_slice_minutes", 60))
+# 시작할 때 지난 알림을 보내는 기간 (분) - 모든 워커가 내려가 있던 동안의 알림
+REMINDER_CATCH_UP_MINUTES = int(os.environ.get("reminder_catch_up_minutes", 60))
+REMINDER_BATCH_SIZE = int(os.environ.get("reminder_batch_size", 100))
+# 알림이 없을 때 변경 반영 / lock 확인 주기 (초)
+REMINDER_TICK_SECONDS = float(os.environ.get("reminder_tick_seconds", 5))
+# 읽어 둔 구간 전체를 다시 읽는 주기 (초) - 누락된 변경 알림 보정
+REMINDER_RESYNC_SECONDS = float(os.environ.get("reminder_resync_seconds", 60))
+REMINDER_LEASE_SECONDS = int(os.environ.get("reminder_lease_seconds", 300))
+REMINDER_MAX_ATTEMPTS = int(os.environ.get("reminder_max_attempts", 5))
+# 발송 기록 보관 기간 (일)
+REMINDER_RETENTION_DAYS = int(os.environ.get("reminder_retention_days", 30))
+# lock 을 잡지 못했을 때 다시 시도하는 간격 (초)
+REMINDER_LOCK_RETRY_SECONDS = 30
+# 발송 워커 하나만 실행하기 위한 advisory lock 키
+REMINDER_DISPATCH_LOCK_KEY = 72010048
+
+SMTP_HOST = os.environ.get("smtp_host", "localhost")
+SMTP_PORT = int(os.environ.get("smtp_port", 25))
+SMTP_USER = os.environ.get("smtp_user")
+SMTP_PASSWORD = os.environ.get("smtp_password")
+SMTP_STARTTLS = os.environ.get("smtp_starttls", "false").lower() == "true"
+SMTP_FROM = os.environ.get("smtp_from", "noreply@localhost")
+SMTP_TIMEOUT_SECONDS = float(os.environ.get("smtp_timeout_seconds", 10))
+
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+# (알림 시각, schedule_id, 몇 분 전, 발생 시작, uid)
+Due = Tuple[datetime, int, int, datetime, int]
+
+# 구간 (window_start, window_end] 의 아직 claim 하지 않은 메일 알림 (알림 시각 인덱스 범위 조회)
+DUE_WINDOW_SQL = """
+    SELECT rd.fire_at, rd.schedule_id, rd.minutes_before, rd.occurrence_start, rd.uid
+    FROM reminder_due rd
+    WHERE rd.email
+    AND rd.fire_at > %(window_start)s
+    AND rd.fire_at <= %(window_end)s
+    AND NOT EXISTS (
+        SELECT 1 FROM reminder_delivery d
+        WHERE d.schedule_id = rd.schedule_id AND d.minutes_before = rd.minutes_before
+        AND d.occurrence_start = rd.occurrence_start
+    )
+"""
+# 변경된 사용자만 다시 읽을 때
+DUE_USER_FILTER_SQL = """
+    AND rd.uid = ANY(%(uids)s::bigint[])
+"""
+
+CLAIM_DELIVERIES_SQL = """
+    INSERT INTO reminder_delivery (schedule_id, minutes_before, occurrence_start, uid, due_at)
+    SELECT * FROM unnest(%s::bigint[], %s::int[], %s::timestamptz[], %s::bigint[], %s::timestamptz[])
+    ON CONFLICT DO NOTHING
+    RETURNING schedule_id, minutes_before, occurrence_start
+"""
+
+# 보낼 메일 내용 (보내기 직전에 알림과 일정이 아직 그대로인지 확인)
+DELIVERY_MESSAGES_SQL = """
+    SELECT d.schedule_id, d.minutes_before, d.occurrence_start, u.email, s.title, s.start_date, s.end_date
+    FROM unnest(%s::bigint[], %s::int[], %s::timestamptz[]) AS k(schedule_id, minutes_before, occurrence_start)
+    JOIN reminder_delivery d USING (schedule_id, minutes_before, occurrence_start)
+    JOIN schedule s ON s.id = d.schedule_id
+    JOIN users u ON u.uid = s.uid
+    WHERE s.deleted_at IS NULL
+    AND EXISTS (
+        SELECT 1 FROM reminder rm
+        WHERE rm.schedule_id = d.schedule_id AND rm.days_before = d.minutes_before AND rm.email
+    )
+    AND (s.start_date = d.occurrence_start OR EXISTS (SELECT 1 FROM recurrence r WHERE r.schedule_id = s.id))
+"""
+
+FINISH_DELIVERIES_SQL = """
+    UPDATE reminder_delivery d
+    SET status = %s, sent_at = CASE WHEN %s::text = 'sent' THEN NOW() END
+    FROM unnest(%s::bigint[], %s::int[], %s::timestamptz[]) AS k(schedule_id, minutes_before, occurrence_start)
+    WHERE d.schedule_id = k.schedule_id AND d.minutes_before = k.minutes_before AND d.occurrence_start = k.occurrence_start
+    AND d.status = 'sending'
+"""
+
+# lease 가 지난 발송: 시도 횟수를 넘긴 것은 실패로, 나머지는 다시 claim
+EXPIRED_DELIVERIES_FAIL_SQL = """
+    UPDATE reminder_delivery
+    SET status = 'failed'
+    WHERE status = 'sending'
+    AND claimed_at < NOW() - make_interval(secs => %(lease)s)
+    AND attempts >= %(max_attempts)s
+"""
+EXPIRED_DELIVERIES_RECLAIM_SQL = """
+    UPDATE reminder_delivery
+    SET claimed_at = NOW(), attempts = attempts + 1
+    WHERE status = 'sending'
+    AND claimed_at < NOW() - make_interval(secs => %(lease)s)
+    RETURNING schedule_id, minutes_before, occurrence_start
+"""
+PURGE_DELIVERIES_SQL = """
+    DELETE FROM reminder_delivery
+    WHERE due_at < NOW() - make_interval(days => %(retention_days)s)
+    AND status <> 'sending'
+"""
+
+_stats = {
+    "active": False, "slices": 0, "loaded": 0, "reloaded_users": 0, "resyncs": 0, "claimed": 0, "duplicates": 0,
+    "sent": 0, "failed": 0, "retried": 0, "cancelled": 0, "errors": 0,
+}
+
+
+def _to_utc(dt: datetime) -> datetime:
+    return pytz.utc.localize(dt) if dt.tzinfo is None else dt.astimezone(pytz.utc)
+
+
+def _key_arrays(keys: Sequence[tuple]) -> tuple:
+    return [key[0] for key in keys], [key[1] for key in keys], [key[2] for key in keys]
+
+
+def load_due_reminders(window_start: datetime, window_end: datetime,
+                       uids: Optional[Iterable[int]] = None) -> Tuple[List[Due], datetime]:
+    """
+    알림 시각이 (window_start, window_end] 인 메일 알림을 읽는 함수 (스레드풀에서 실행)
+    알림 시각 인덱스의 구간 끝(horizon_end)까지만 읽으며, 쓰기 직후의 알림도 읽도록 primary 에서 조회합니다.
+    :param uids: 지정하면 이 사용자들의 알림만
+    :return: (알림 목록, 실제로 읽은 구간의 끝)
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(HORIZON_SQL)
+        row = cur.fetchone()
+        window_end = min(window_end, row[0]) if row else window_start
+        if window_end <= window_start:
+            return [], window_start
+        query = DUE_WINDOW_SQL + (DUE_USER_FILTER_SQL if uids is not None else "")
+        cur.execute(query, {"window_start": window_start, "window_end": window_end,
+                            "uids": list(uids) if uids is not None else None})
+        due = [(_to_utc(due_at), schedule_id, minutes, _to_utc(start), uid)
+               for due_at, schedule_id, minutes, start, uid in cur.fetchall()]
+        return due, window_end
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
+
+
+def _load_messages(cur, keys: Sequence[tuple]) -> List[tuple]:
+    # claim 한 알림의 메일 내용 (알림이 지워졌거나 일정이 옮겨진 것은 cancelled 로 기록)
+    if not keys:
+        return []
+    cur.execute(DELIVERY_MESSAGES_SQL, _key_arrays(keys))
+    messages = cur.fetchall()
+    found = {message[:3] for message in messages}
+    cancelled = [key for key in keys if tuple(key) not in found]
+    if cancelled:
+        cur.execute(FINISH_DELIVERIES_SQL, (STATUS_CANCELLED, STATUS_CANCELLED) + _key_arrays(cancelled))
+    return messages
+
+
+def claim_deliveries(due: Sequence[Due]) -> Tuple[int, List[tuple]]:
+    """
+    발송 기록을 먼저 커밋하고, 보낼 메일 내용을 반환하는 함수 (스레드풀에서 실행)
+    이미 기록된 알림(다른 워커, 재시작 전에 보낸 것)은 제외됩니다.
+    :return: (새로 claim 한 수, [(schedule_id, 몇 분 전, 발생 시작, 받는 주소, 제목, 시작, 종료)])
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(CLAIM_DELIVERIES_SQL, (
+            [item[1] for item in due],
+            [item[2] for item in due],
+            [item[3] for item in due],
+            [item[4] for item in due],
+            [item[0] for item in due],
+        ))
+        claimed = cur.fetchall()
+        messages = _load_messages(cur, claimed)
+        conn.commit()
+        return len(claimed), messages
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def reclaim_expired_deliveries() -> List[tuple]:
+    """
+    lease 가 지난 발송을 다시 claim 하고 메일 내용을 반환하는 함수 (스레드풀에서 실행)
+    시도 횟수를 넘긴 발송은 실패로 기록하고, 보관 기간이 지난 기록은 지웁니다.
+    """
+    params = {"lease": REMINDER_LEASE_SECONDS, "max_attempts": REMINDER_MAX_ATTEMPTS, "retention_days": REMINDER_RETENTION_DAYS}
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(EXPIRED_DELIVERIES_FAIL_SQL, params)
+        cur.execute(EXPIRED_DELIVERIES_RECLAIM_SQL, params)
+        messages = _load_messages(cur, cur.fetchall())
+        cur.execute(PURGE_DELIVERIES_SQL, params)
+        conn.commit()
+        return messages
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def finish_deliveries(sent: Sequence[tuple], failed: Sequence[tuple]):
+    """발송 결과 기록 (스레드풀에서 실행) - 둘 다 아닌 발송은 'sending' 으로 남아 lease 후 다시 보냄"""
+    if not sent and not failed:
+        return
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        for status, keys in ((STATUS_SENT, sent), (STATUS_FAILED, failed)):
+            if keys:
+                cur.execute(FINISH_DELIVERIES_SQL, (status, status) + _key_arrays(keys))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def _lead_text(minutes: int) -> str:
+    days, rest = divmod(minutes, 1440)
+    hours, minutes = divmod(rest, 60)
+    parts = [f"{value}{unit}" for value, unit in ((days, "일"), (hours, "시간"), (minutes, "분")) if value]
+    return " ".join(parts) or "0분"
+
+
+def build_reminder_email(schedule_id: int, minutes_before: int, occurrence_start: datetime, email: str,
+                         title: str, start_date: datetime, end_date: datetime) -> EmailMessage:
+    """
+    알림 메일 - Message-ID 는 알림마다 고정이므로 다시 보내도 받는 쪽에서 같은 메일로 처리할 수 있음
+    """
+    occurrence_start = _to_utc(occurrence_start)
+    occurrence_end = occurrence_start + (end_date - start_date)
+    message = EmailMessage()
+    message["From"] = SMTP_FROM
+    message["To"] = email
+    message["Subject"] = f"[일정 알림] {title}"
+    message["Date"] = format_datetime(datetime.now(pytz.utc))
+    message["Message-ID"] = (
+        f"<reminder-{schedule_id}-{minutes_before}-{int(occurrence_start.timestamp())}@{SMTP_FROM.rsplit('@', 1)[-1]}>"
+    )
+    message.set_content(
+        f"{title}\n"
+        f"{occurrence_start:%Y-%m-%d %H:%M} ~ {occurrence_end:%Y-%m-%d %H:%M} (UTC)\n"
+        f"일정 {_lead_text(minutes_before)} 전 알림입니다.\n"
+    )
+    return message
+
+
+def send_reminder_emails(messages: Sequence[tuple]) -> Tuple[List[tuple], List[tuple]]:
+    """
+    SMTP 연결 하나로 알림 메일을 보내는 함수 (스레드풀에서 실행)
+    :return: (보낸 알림 키, 영구 실패한 알림 키) - 일시 오류 / 연결 오류로 못 보낸 알림은 어느 쪽에도 없음
+    """
+    sent, failed = [], []
+    if not messages:
+        return sent, failed
+    try:
+        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS) as smtp:
+            if SMTP_STARTTLS:
+                smtp.starttls()
+            if SMTP_USER:
+                smtp.login(SMTP_USER, SMTP_PASSWORD)
+            for message in messages:
+                key = tuple(message[:3])
+                if not message[3]:
+                    failed.append(key)
+                    continue
+                try:
+                    smtp.send_message(build_reminder_email(*message))
+                    sent.append(key)
+                except smtplib.SMTPRecipientsRefused:
+                    failed.append(key)
+                except smtplib.SMTPResponseException as e:
+                    # 영구 오류(5xx)만 실패로 기록하고, 일시 오류(4xx)는 lease 후 다시 보냄
+                    if 500 <= e.smtp_code < 600:
+                        failed.append(key)
+    except (smtplib.SMTPException, OSError) as e:
+        logger.error(f"SMTP delivery to {SMTP_HOST}:{SMTP_PORT} failed after {len(sent)} of {len(messages)} reminders: {e}")
+    return sent, failed
+
+
+class ReminderDispatcher:
+    """발송 워커의 알림 힙 (이벤트 루프 안에서만 사용, DB / SMTP 작업은 스레드풀)"""
+
+    def __init__(self, now: datetime):
+        start = now - timedelta(minutes=REMINDER_CATCH_UP_MINUTES)
+        self.heap: List[Due] = []
+        # 힙에 읽어 둔 구간의 끝 / 힙에서 꺼낸 알림 시각의 끝
+        self.loaded_until = start
+        self.popped_until = start
+        self.dirty_uids: Set[int] = set()
+        self.resync_requested = False
+        self.last_resync = now
+        self.last_reclaim: Optional[datetime] = None
+
+    def mark_dirty(self, uid: int):
+        self.dirty_uids.add(uid)
+
+    def request_resync(self):
+        self.resync_requested = True
+
+    async def resync(self, now: datetime):
+        # 읽어 둔 구간을 모두 다시 읽음 (누락된 변경 알림 보정)
+        # 알림을 놓친 사이에 알림 시각이 지났을 수 있으므로 한 주기 전부터 읽음 (이미 claim 한 알림은 제외)
+        if not self.resync_requested and now - self.last_resync < timedelta(seconds=REMINDER_RESYNC_SECONDS):
+            return
+        self.resync_requested = False
+        self.last_resync = now
+        self.dirty_uids = set()
+        window_start = self.popped_until - timedelta(seconds=REMINDER_RESYNC_SECONDS)
+        due, _ = await run_in_threadpool(load_due_reminders, window_start, self.loaded_until)
+        heapq.heapify(due)
+        self.heap = due
+        _stats["resyncs"] += 1
+
+    async def reload_dirty(self):
+        # 변경된 사용자의 알림은 아직 꺼내지 않은 구간만 다시 읽음
+        if not self.dirty_uids:
+            return
+        uids, self.dirty_uids = self.dirty_uids, set()
+        self.heap = [item for item in self.heap if item[4] not in uids]
+        heapq.heapify(self.heap)
+        due, _ = await run_in_threadpool(load_due_reminders, self.popped_until, self.loaded_until, uids)
+        for item in due:
+            heapq.heappush(self.heap, item)
+        _stats["reloaded_users"] += len(uids)
+
+    async def refill(self, now: datetime):
+        # 지금부터 한 구간 뒤까지 읽어 둠 (멈춰 있던 경우에는 구간을 하나씩 따라잡고, 인덱스 구간 끝에서 멈춤)
+        slice_length = timedelta(minutes=REMINDER_SLICE_MINUTES)
+        while self.loaded_until < now + slice_length:
+            due, window_end = await run_in_threadpool(load_due_reminders, self.loaded_until,
+                                                      self.loaded_until + slice_length)
+            if window_end <= self.loaded_until:
+                break
+            for item in due:
+                heapq.heappush(self.heap, item)
+            self.loaded_until = window_end
+            _stats["slices"] += 1
+            _stats["loaded"] += len(due)
+
+    def pop_due(self, now: datetime) -> List[Due]:
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap))
+        self.popped_until = max(self.popped_until, now)
+        return due
+
+    async def send(self, messages: List[tuple]):
+        for i in range(0, len(messages), REMINDER_BATCH_SIZE):
+            sent, failed = await run_in_threadpool(send_reminder_emails, messages[i:i + REMINDER_BATCH_SIZE])
+            await run_in_threadpool(finish_deliveries, sent, failed)
+            _stats["sent"] += len(sent)
+            _stats["failed"] += len(failed)
+
+    async def deliver(self, due: List[Due]):
+        for i in range(0, len(due), REMINDER_BATCH_SIZE):
+            batch = due[i:i + REMINDER_BATCH_SIZE]
+            claimed, messages = await run_in_threadpool(claim_deliveries, batch)
+            _stats["claimed"] += claimed
+            _stats["duplicates"] += len(batch) - claimed
+            _stats["cancelled"] += claimed - len(messages)
+            await self.send(messages)
+
+    async def reclaim(self, now: datetime):
+        if self.last_reclaim is not None and now - self.last_reclaim < timedelta(seconds=REMINDER_LEASE_SECONDS):
+            return
+        self.last_reclaim = now
+        messages = await run_in_threadpool(reclaim_expired_deliveries)
+        _stats["retried"] += len(messages)
+        await self.send(messages)
+
+    async def run(self, lock_conn):
+        while True:
+            # lock 커넥션이 끊어지면 (lock 이 풀렸으므로) 예외로 종료
+            await run_in_threadpool(_check_lock_connection, lock_conn)
+            now = datetime.now(pytz.utc)
+            await self.resync(now)
+            await self.reload_dirty()
+            await self.refill(now)
+            await self.deliver(self.pop_due(now))
+            await self.reclaim(now)
+
+            wait = REMINDER_TICK_SECONDS
+            if self.heap:
+                wait = min(wait, max(0.0, (self.heap[0][0] - datetime.now(pytz.utc)).total_seconds()))
+            await asyncio.sleep(wait)
+
+
+_dispatcher: Optional[ReminderDispatcher] = None
+
+
+def _on_user_changed(uid: Optional[int], version: Optional[int]):
+    if _dispatcher is None:
+        return
+    if uid is None:
+        _dispatcher.request_resync()
+    else:
+        _dispatcher.mark_dirty(uid)
+
+
+if REMINDER_DISPATCH_ENABLED:
+    hub.add_change_listener(_on_user_changed)
+
+
+def _try_dispatch_lock(conn) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (REMINDER_DISPATCH_LOCK_KEY,))
+        return cur.fetchone()[0]
+
+
+def _check_lock_connection(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+
+
+async def run_reminder_dispatcher():
+    """
+    알림 발송 task (앱 lifespan 에서 시작, 종료 시 cancel)
+    lock 전용 커넥션(autocommit, primary)으로 advisory lock 을 잡은 워커만 발송하며, 커넥션을 닫으면 lock 이 풀립니다.
+    """
+    global _dispatcher
+    if not REMINDER_DISPATCH_ENABLED:
+        return
+    while True:
+        conn = None
+        try:
+            conn = await run_in_threadpool(open_listen_connection)
+            if await run_in_threadpool(_try_dispatch_lock, conn):
+                logger.info("Reminder dispatcher acquired the dispatch lock")
+                _dispatcher = ReminderDispatcher(datetime.now(pytz.utc))
+                _stats["active"] = True
+                await _dispatcher.run(conn)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.error(f"Reminder dispatcher failed, retrying in {REMINDER_LOCK_RETRY_SECONDS}s: {e}")
+        finally:
+            _dispatcher = None
+            _stats["active"] = False
+            if conn is not None:
+                conn.close()
+        await asyncio.sleep(REMINDER_LOCK_RETRY_SECONDS)
+
+
+def get_reminder_dispatch_stats() -> dict:
+    return {
+        "enabled": REMINDER_DISPATCH_ENABLED,
+        "pending": len(_dispatcher.heap) if _dispatcher is not None else 0,
+        "loaded_until": _dispatcher.loaded_until if _dispatcher is not None else None,
+        **_stats,
+    }
@@ -0,0 +1,250 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+import pytz
+from starlette.concurrency import run_in_threadpool
+from db.db_conn import get_db_connection, close_db_connection, open_listen_connection, PipelinedBatch
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+알림 시각 인덱스 (reminder_due, db/sql/008_reminder_due.sql, 010_reminder_due_horizon.sql)
+- 알림 시각(발생 시작 - reminder.days_before 분)을 반복 일정까지 펼쳐(예외 제외) 전역 구간 (지금, horizon_end] 만큼 저장
+  - 다음 N 개 알림(/reminders/upcoming)은 (uid, fire_at), 발송할 메일 알림은 fire_at 인덱스 범위 조회 - 읽을 때 펼치지 않음
+- 쓰기: 스케줄 / 반복 / 예외 / 알림을 바꾸는 트랜잭션이 add_refresh_reminder_due 로 이번 버전에 바뀐 스케줄(change_log)의
+  앞으로의 알림만 같은 트랜잭션에서 다시 계산 (삭제 표시된 스케줄은 지워지기만 함)
+- horizon 연장: advisory lock 을 잡은 워커 하나가 horizon_end 를 REMINDER_DUE_EXTEND_HOURS 씩 늘리며 새 구간의 알림을 추가하고,
+  보관 기간이 지난 알림을 지움
+  - 쓰기는 reminder_due_horizon 행을 FOR SHARE, 연장은 FOR UPDATE 로 잠가 서로 순서대로 실행되므로
+    연장 도중에 바뀐 스케줄의 이전 알림이 남지 않음
+"""
+
+REMINDER_DUE_HORIZON_DAYS = int(os.environ.get("reminder_due_horizon_days", 30))
+# 한 번에 늘리는 구간 길이 (시간)
+REMINDER_DUE_EXTEND_HOURS = int(os.environ.get("reminder_due_extend_hours", 24))
+# 지난 알림을 남겨 두는 기간 (시간) - 알림 발송이 밀렸을 때 따라잡는 기간보다 길어야 함
+REMINDER_DUE_RETENTION_HOURS = int(os.environ.get("reminder_due_retention_hours", 24))
+# 연장할 구간이 없을 때 다시 확인하는 간격 (초)
+REMINDER_DUE_CHECK_SECONDS = float(os.environ.get("reminder_due_check_seconds", 60))
+# 최대 알림 시간 (분, 이보다 긴 알림은 펼치지 않음)
+REMINDER_MAX_LEAD_MINUTES = int(os.environ.get("reminder_max_lead_minutes", 43200))
+# 한 번에 지우는 지난 알림 수
+REMINDER_DUE_PRUNE_LIMIT = 10000
+# lock 을 잡지 못했을 때 다시 시도하는 간격 (초)
+REMINDER_DUE_LOCK_RETRY_SECONDS = 30
+# horizon 연장을 워커 하나만 실행하기 위한 advisory lock 키
+REMINDER_DUE_LOCK_KEY = 72010049
+
+
+def _due_rows_sql(condition: str) -> str:
+    # 조건에 맞는 스케줄의 알림 중 알림 시각이 (%(lo)s, %(hi)s] 인 것 (reminder_due 행)
+    return """
+    SELECT s.uid, o.occurrence - make_interval(mins => rm.days_before), s.id, rm.days_before, o.occurrence, rm.email
+    FROM schedule s
+    JOIN reminder rm ON rm.schedule_id = s.id
+    LEFT JOIN recurrence r ON r.schedule_id = s.id
+    CROSS JOIN LATERAL (
+        SELECT s.start_date WHERE r.id IS NULL
+        UNION ALL
+        SELECT e.occurrence
+        FROM expand_recurrence(
+            s.start_date, r.frequency, r.interval, r.until, r.count,
+            %(lo)s + make_interval(mins => rm.days_before), %(hi)s + make_interval(mins => rm.days_before),
+            ARRAY(SELECT x.start_date FROM recurrence_exception x WHERE x.recurrence_id = r.id)
+        ) AS e(occurrence)
+        WHERE r.id IS NOT NULL
+    ) AS o(occurrence)
+    WHERE s.deleted_at IS NULL
+    AND rm.days_before BETWEEN 0 AND %(max_lead)s
+    AND """ + condition + """
+    AND o.occurrence - make_interval(mins => rm.days_before) > %(lo)s
+    AND o.occurrence - make_interval(mins => rm.days_before) <= %(hi)s
+"""
+
+
+INSERT_DUE_SQL = """
+    INSERT INTO reminder_due (uid, fire_at, schedule_id, minutes_before, occurrence_start, email)
+"""
+
+# 이번 트랜잭션(현재 user_version)에서 바뀐 스케줄의 앞으로의 알림을 다시 계산
+# 첫 문장에서 horizon 행을 잠근 뒤 다음 문장부터 새 스냅샷으로 읽으므로, 연장이 커밋한 알림도 지워짐
+CHANGED_SCHEDULE_IDS_SQL = """
+    SELECT c.entity_id FROM change_log c
+    JOIN user_version v ON v.uid = c.uid AND v.version = c.version
+    WHERE c.uid = %(uid)s AND c.entity = 'schedule'
+"""
+REFRESH_REMINDER_DUE_SQL = """
+    SELECT horizon_end FROM reminder_due_horizon FOR SHARE;
+    DELETE FROM reminder_due
+    WHERE schedule_id IN (""" + CHANGED_SCHEDULE_IDS_SQL + """)
+    AND fire_at > NOW();
+    WITH horizon AS (SELECT NOW() AS lo, horizon_end AS hi FROM reminder_due_horizon)
+    """ + INSERT_DUE_SQL + """
+    SELECT due.* FROM horizon, LATERAL (""" + _due_rows_sql("s.id IN (" + CHANGED_SCHEDULE_IDS_SQL + ")").replace(
+        "%(lo)s", "horizon.lo").replace("%(hi)s", "horizon.hi") + """) AS due
+    ON CONFLICT DO NOTHING
+"""
+
+# horizon 연장: 단일 일정은 시작 시각 범위(인덱스), 반복 일정은 구간 안에 발생이 있을 수 있는 것만
+EXTEND_SINGLE_SQL = INSERT_DUE_SQL + _due_rows_sql("""r.id IS NULL
+    AND s.start_date > %(lo)s
+    AND s.start_date <= %(hi)s + make_interval(mins => %(max_lead)s)""") + """
+    ON CONFLICT DO NOTHING
+"""
+EXTEND_SERIES_SQL = INSERT_DUE_SQL + _due_rows_sql("""r.id IS NOT NULL
+    AND s.start_date <= %(hi)s + make_interval(mins => %(max_lead)s)
+    AND (r.until IS NULL OR r.until > %(lo)s)""") + """
+    ON CONFLICT DO NOTHING
+"""
+PRUNE_DUE_SQL = """
+    DELETE FROM reminder_due
+    WHERE ctid = ANY(ARRAY(
+        SELECT ctid FROM reminder_due WHERE fire_at < NOW() - make_interval(hours => %s) LIMIT %s
+    ))
+"""
+
+# 다음 N 개 알림 (인덱스 범위 조회, 스케줄 정보는 PK 로)
+UPCOMING_SQL = """
+    SELECT d.fire_at, d.schedule_id, d.minutes_before, d.occurrence_start,
+           d.occurrence_start + (s.end_date - s.start_date), s.title, s.color, d.email
+    FROM reminder_due d
+    JOIN schedule s ON s.id = d.schedule_id
+    WHERE d.uid = %(uid)s
+    AND d.fire_at > %(now)s
+    AND s.deleted_at IS NULL
+    ORDER BY d.fire_at, d.schedule_id, d.minutes_before
+    LIMIT %(limit)s
+"""
+HORIZON_SQL = "SELECT horizon_end FROM reminder_due_horizon"
+
+_stats = {"active": False, "reads": 0, "extensions": 0, "extended": 0, "pruned": 0, "errors": 0, "horizon_end": None}
+
+
+def add_refresh_reminder_due(batch: PipelinedBatch, uid: int):
+    """
+    이번 트랜잭션에서 바뀐 스케줄의 알림 시각을 다시 계산하는 쿼리를 추가하는 함수 (add_record_changes 보다 뒤에 추가해야 함)
+    """
+    batch.add(REFRESH_REMINDER_DUE_SQL, {"uid": uid, "max_lead": REMINDER_MAX_LEAD_MINUTES})
+
+
+def refresh_reminder_due(cur, uid: int):
+    """add_refresh_reminder_due 와 같은 작업을 바로 실행하는 함수 (쓰기 트랜잭션 안에서 변경 기록 뒤에 호출)"""
+    cur.execute(REFRESH_REMINDER_DUE_SQL, {"uid": uid, "max_lead": REMINDER_MAX_LEAD_MINUTES})
+
+
+def list_upcoming_reminders(uid: int, limit: int) -> tuple:
+    """
+    사용자의 다음 알림 limit 개를 반환하는 함수 (스레드풀에서 실행)
+    :return: (인덱스 구간 끝, [(알림 시각, schedule_id, 몇 분 전, 발생 시작, 발생 끝, 제목, 색, 메일 알림 여부)])
+    """
+    conn = get_db_connection(read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        cur.execute(HORIZON_SQL)
+        row = cur.fetchone()
+        cur.execute(UPCOMING_SQL, {"uid": uid, "now": datetime.now(pytz.utc), "limit": limit})
+        rows = cur.fetchall()
+        _stats["reads"] += 1
+        return (row[0] if row else datetime.now(pytz.utc)), rows
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
+
+
+def extend_reminder_due_horizon() -> Optional[datetime]:
+    """
+    horizon_end 를 한 구간 늘리고 새 구간의 알림을 추가하는 함수 (스레드풀에서 실행)
+    :return: 늘린 뒤의 horizon_end (이미 충분하면 None)
+    """
+    now = datetime.now(pytz.utc)
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(HORIZON_SQL + " FOR UPDATE")
+        horizon_end = cur.fetchone()[0]
+        target = now + timedelta(days=REMINDER_DUE_HORIZON_DAYS)
+        if horizon_end >= target:
+            conn.rollback()
+            _stats["horizon_end"] = horizon_end
+            return None
+        # 오래 멈춰 있었으면 보관 기간 이전의 알림은 건너뜀
+        lo = max(horizon_end, now - timedelta(hours=REMINDER_DUE_RETENTION_HOURS))
+        hi = min(lo + timedelta(hours=REMINDER_DUE_EXTEND_HOURS), target)
+        params = {"lo": lo, "hi": hi, "max_lead": REMINDER_MAX_LEAD_MINUTES}
+        cur.execute(EXTEND_SINGLE_SQL, params)
+        extended = cur.rowcount
+        cur.execute(EXTEND_SERIES_SQL, params)
+        extended += cur.rowcount
+        cur.execute("UPDATE reminder_due_horizon SET horizon_end = %s", (hi,))
+        conn.commit()
+        _stats["extensions"] += 1
+        _stats["extended"] += extended
+        _stats["horizon_end"] = hi
+        return hi
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def prune_reminder_due() -> int:
+    """보관 기간이 지난 알림을 지우는 함수 (스레드풀에서 실행)"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(PRUNE_DUE_SQL, (REMINDER_DUE_RETENTION_HOURS, REMINDER_DUE_PRUNE_LIMIT))
+        pruned = cur.rowcount
+        conn.commit()
+        _stats["pruned"] += pruned
+        return pruned
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def _try_horizon_lock(conn) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (REMINDER_DUE_LOCK_KEY,))
+        return cur.fetchone()[0]
+
+
+async def run_reminder_due_maintainer():
+    """
+    알림 시각 인덱스의 horizon 연장 task (앱 lifespan 에서 시작, 종료 시 cancel)
+    lock 전용 커넥션(autocommit, primary)으로 advisory lock 을 잡은 워커만 실행하며, 커넥션을 닫으면 lock 이 풀립니다.
+    """
+    while True:
+        conn = None
+        try:
+            conn = await run_in_threadpool(open_listen_connection)
+            if await run_in_threadpool(_try_horizon_lock, conn):
+                logger.info("Reminder due maintainer acquired the horizon lock")
+                _stats["active"] = True
+                while True:
+                    if await run_in_threadpool(extend_reminder_due_horizon) is None:
+                        while await run_in_threadpool(prune_reminder_due) >= REMINDER_DUE_PRUNE_LIMIT:
+                            pass
+                        await asyncio.sleep(REMINDER_DUE_CHECK_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.error(f"Reminder due maintainer failed, retrying in {REMINDER_DUE_LOCK_RETRY_SECONDS}s: {e}")
+        finally:
+            _stats["active"] = False
+            if conn is not None:
+                conn.close()
+        await asyncio.sleep(REMINDER_DUE_LOCK_RETRY_SECONDS)
+
+
+def get_reminder_due_stats() -> dict:
+    return dict(_stats)
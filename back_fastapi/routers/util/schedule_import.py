@@ -0,0 +1,233 @@
+import io
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+from models.schemas import CreateSchedule
+from db.db_conn import PipelinedBatch
+from .versioning import bump_user_version
+from .change_log import LOG_IMPORTED_SCHEDULES_SQL
+from .tag_snapshot import REFRESH_IMPORTED_TAG_SNAPSHOTS_SQL
+from .reminder_due import refresh_reminder_due
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 COPY / 병합하는 일정 수 (메모리 사용량 상한)
+IMPORT_CHUNK_SIZE = 1000
+# 진행 상황 응답에 포함하는 최대 오류 메시지 수
+IMPORT_MAX_REPORTED_ERRORS = 20
+
+# 가져오기용 임시 스테이징 테이블 (트랜잭션 종료 시 자동 삭제)
+CREATE_STAGING_TABLES_SQL = """
+    CREATE TEMP TABLE import_schedule_stage (
+        seq integer PRIMARY KEY,
+        title text,
+        note text,
+        color text,
+        important text,
+        start_date timestamptz,
+        end_date timestamptz,
+        frequency text,
+        interval integer,
+        until timestamptz,
+        count integer,
+        schedule_id bigint
+    ) ON COMMIT DROP;
+    CREATE TEMP TABLE import_tag_stage (seq integer, title text) ON COMMIT DROP;
+    CREATE TEMP TABLE import_reminder_stage (seq integer, days_before integer) ON COMMIT DROP;
+    CREATE TEMP TABLE import_exdate_stage (seq integer, start_date timestamptz) ON COMMIT DROP;
+    CREATE TEMP TABLE import_done_stage (schedule_id bigint) ON COMMIT DROP
+"""
+
+# 스테이징 테이블 -> 실제 테이블 병합 쿼리 (청크마다 순서대로 실행)
+MERGE_STAGING_SQL = [
+    # 스케줄 ID 발급
+    "UPDATE import_schedule_stage SET schedule_id = nextval(pg_get_serial_sequence('schedule', 'id'))",
+    """
+    INSERT INTO schedule (id, title, note, color, start_date, end_date, important, uid, created_at, updated_at)
+    SELECT schedule_id, title, note, color, start_date, end_date, important, %(uid)s, NOW(), NOW()
+    FROM import_schedule_stage
+    """,
+    # 없는 개인 태그는 생성하고 태그 연결
+    """
+    WITH new_tag AS (
+        INSERT INTO tag (title, is_personal, uid)
+        SELECT DISTINCT ts.title, TRUE, %(uid)s
+        FROM import_tag_stage ts
+        WHERE NOT EXISTS (SELECT 1 FROM tag t WHERE t.title = ts.title AND t.uid = %(uid)s)
+        RETURNING id, title
+    ), all_tag AS (
+        SELECT id, title FROM new_tag
+        UNION ALL
+        SELECT id, title FROM tag WHERE uid = %(uid)s AND title IN (SELECT title FROM import_tag_stage)
+    )
+    INSERT INTO schedule_tag (tag_id, schedule_id, is_personal)
+    SELECT DISTINCT a.id, s.schedule_id, TRUE
+    FROM import_tag_stage ts
+    JOIN import_schedule_stage s USING (seq)
+    JOIN all_tag a ON a.title = ts.title
+    """,
+    # 태그 스냅샷 (태그가 있는 청크만)
+    REFRESH_IMPORTED_TAG_SNAPSHOTS_SQL,
+    """
+    INSERT INTO recurrence (frequency, interval, until, count, schedule_id)
+    SELECT frequency, interval, until, count, schedule_id
+    FROM import_schedule_stage
+    WHERE frequency IS NOT NULL
+    """,
+    # EXDATE는 modify_type=only 와 같은 형식으로 예외 등록 (start_date = 제외할 발생 시작 시각)
+    """
+    INSERT INTO recurrence_exception (exception_date, start_date, end_date, recurrence_id)
+    SELECT NOW(), e.start_date, e.start_date + (s.end_date - s.start_date), r.id
+    FROM import_exdate_stage e
+    JOIN import_schedule_stage s USING (seq)
+    JOIN recurrence r ON r.schedule_id = s.schedule_id
+    """,
+    """
+    INSERT INTO reminder (days_before, schedule_id)
+    SELECT rs.days_before, s.schedule_id
+    FROM import_reminder_stage rs
+    JOIN import_schedule_stage s USING (seq)
+    """,
+    # 가져온 스케줄 ID (변경 기록은 커밋 직전에 버전을 올린 뒤 한 번에 남김)
+    "INSERT INTO import_done_stage SELECT schedule_id FROM import_schedule_stage",
+    "TRUNCATE import_schedule_stage, import_tag_stage, import_reminder_stage, import_exdate_stage",
+]
+
+
+def _copy_value(value) -> str:
+    # COPY text 형식으로 값 변환
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+class _CopyBuffer:
+    """COPY FROM STDIN 으로 보낼 행을 모아두는 버퍼"""
+
+    def __init__(self, table: str, columns: List[str]):
+        self.sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        self.buffer = io.StringIO()
+        self.rows = 0
+
+    def append(self, *values):
+        self.buffer.write("\t".join(_copy_value(v) for v in values) + "\n")
+        self.rows += 1
+
+    def copy_to(self, cur):
+        if self.rows:
+            self.buffer.seek(0)
+            cur.copy_expert(self.sql, self.buffer)
+        self.buffer = io.StringIO()
+        self.rows = 0
+
+
+def validate_import_events(
+    events: Iterable[Tuple[Optional[CreateSchedule], List[datetime], Optional[str]]],
+) -> Tuple[int, List[dict]]:
+    """
+    가져오기 전에 파싱된 일정 스트림을 끝까지 읽어 검사하는 함수 (스트리밍 응답을 시작하기 전에 호출)
+    일정을 메모리에 모으지 않고 개수와 오류만 셉니다.
+    :return: (일정 수, 해석할 수 없는 일정의 오류 목록 - 최대 IMPORT_MAX_REPORTED_ERRORS 개)
+    """
+    processed = 0
+    errors = []
+    for schedule, _, error in events:
+        processed += 1
+        if schedule is None and len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"row": processed, "error": error})
+    return processed, errors
+
+
+def import_schedules(
+    conn,
+    uid: int,
+    events: Iterable[Tuple[Optional[CreateSchedule], List[datetime], Optional[str]]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Iterator[dict]:
+    """
+    파싱된 일정 스트림을 COPY + 스테이징 테이블 병합으로 가져오는 제너레이터
+    - 청크 단위로 스테이징 테이블에 COPY 한 뒤, 집합 연산(INSERT ... SELECT)으로 병합
+    - 메모리에는 최대 한 청크만 유지
+    - 모든 청크를 하나의 트랜잭션으로 처리하여 중간에 실패하면 전체를 rollback
+    - user_version 은 마지막 청크를 병합한 뒤 커밋 직전에 올림 (버전 행 잠금을 커밋까지 짧게만 잡으므로
+      가져오는 동안 같은 사용자의 다른 쓰기를 막지 않고, 변경 기록의 버전도 커밋 순서와 같음)
+    - 청크마다 진행 상황(dict)을 반환하고, 마지막에 status=done 을 반환
+
+    :param events: (스케줄, 예외일 목록, 오류 메시지) 튜플 - ical.parse_ics_events / parse_csv_events 결과
+    """
+    cur = conn.cursor()
+    processed = imported = skipped = 0
+    errors = []
+
+    schedules = _CopyBuffer("import_schedule_stage", [
+        "seq", "title", "note", "color", "important", "start_date", "end_date",
+        "frequency", "interval", "until", "count",
+    ])
+    tags = _CopyBuffer("import_tag_stage", ["seq", "title"])
+    reminders = _CopyBuffer("import_reminder_stage", ["seq", "days_before"])
+    exdates = _CopyBuffer("import_exdate_stage", ["seq", "start_date"])
+
+    def flush_chunk():
+        for buffer in (schedules, tags, reminders, exdates):
+            buffer.copy_to(cur)
+        batch = PipelinedBatch(cur)
+        for query in MERGE_STAGING_SQL:
+            batch.add(query, {"uid": uid})
+        batch.flush()
+
+    try:
+        cur.execute(CREATE_STAGING_TABLES_SQL)
+        for schedule, event_exdates, error in events:
+            processed += 1
+            if schedule is None:
+                skipped += 1
+                if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    errors.append({"row": processed, "error": error})
+                continue
+
+            seq = schedules.rows
+            schedules.append(
+                seq, schedule.title, schedule.note, schedule.color, schedule.important,
+                schedule.start_date, schedule.end_date,
+                schedule.repeat_frequency if schedule.is_repeat else None,
+                schedule.repeat_interval if schedule.is_repeat else None,
+                schedule.repeat_end_date if schedule.is_repeat else None,
+                schedule.repeat_count if schedule.is_repeat else None,
+            )
+            for tag in schedule.tags:
+                tags.append(seq, tag)
+            for reminder in schedule.reminders or []:
+                reminders.append(seq, reminder)
+            if schedule.is_repeat:
+                for exdate in event_exdates:
+                    exdates.append(seq, exdate)
+            imported += 1
+
+            if schedules.rows >= chunk_size:
+                flush_chunk()
+                yield {"status": "progress", "processed": processed, "imported": imported, "skipped": skipped}
+
+        flush_chunk()
+        # 버전은 커밋 직전에 올리고 (여기서부터 커밋까지만 버전 행을 잠금) 가져온 스케줄을 이 버전으로 기록
+        bump_user_version(cur, uid)
+        cur.execute(LOG_IMPORTED_SCHEDULES_SQL, {"uid": uid})
+        # 가져온 스케줄(이번 버전의 변경 기록)의 알림 시각은 커밋 직전에 한 번만 계산
+        refresh_reminder_due(cur, uid)
+        conn.commit()
+        logger.info(f"Imported {imported} schedules for user {uid} ({skipped} skipped)")
+        yield {"status": "done", "processed": processed, "imported": imported, "skipped": skipped, "errors": errors}
+    except GeneratorExit:
+        # 클라이언트 연결 종료 등으로 중단된 경우
+        conn.rollback()
+        raise
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Error importing schedules: {e}", exc_info=True)
+        yield {"status": "error", "processed": processed, "imported": 0, "skipped": skipped,
+               "detail": "Failed to import schedules. No schedule was imported."}
+    finally:
+        cur.close()
@@ -0,0 +1,199 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, List, Tuple
+import pytz
+from starlette.concurrency import run_in_threadpool
+from db.db_conn import get_db_connection, close_db_connection, open_listen_connection
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+삭제한 스케줄의 연관 데이터 정리 (deferred purge)
+- 삭제 요청은 schedule.deleted_at 만 채우고 커밋 (db/sql/009_schedule_soft_delete.sql) - 조회는 모두 deleted_at IS NULL 인 행만 읽으므로 바로 보이지 않음
+- purger 는 삭제 표시된 스케줄을 ID 순으로 (마지막으로 처리한 ID 다음부터) SCHEDULE_PURGE_BATCH_SIZE 개씩 골라,
+  반복 예외 -> 반복 -> 알림 -> 태그 연결 -> 발송 기록 순으로 문장마다 최대 SCHEDULE_PURGE_ROW_LIMIT 행씩 지우고 바로 커밋한 뒤 스케줄 행을 지움
+  - 긴 반복 일정을 지워도 한 트랜잭션이 잠그는 행 수와 커넥션을 잡는 시간이 짧음 (배치 사이에 SCHEDULE_PURGE_PAUSE_MS 만큼 쉼)
+  - 알림 시각 인덱스(reminder_due)의 앞으로의 알림은 삭제 요청 트랜잭션에서 지워지므로 (지난 알림은 보관 기간 뒤 정리) 지우지 않음
+  - 변경 기록(change_log)의 삭제 tombstone 은 동기화를 위해 남김
+  - 배치 정리가 실패하면 스케줄 하나씩 다시 정리하고, 그래도 실패한 스케줄은 로그를 남기고 건너뜀
+    (끝까지 처리하면 처음 ID 부터 다시 골라 건너뛴 스케줄은 다음 회차에 다시 시도)
+- 여러 워커 중 advisory lock 을 잡은 하나만 실행 (지우는 문장은 여러 번 실행해도 결과가 같음)
+"""
+
+SCHEDULE_PURGE_ENABLED = os.environ.get("schedule_purge_enabled", "true").lower() == "true"
+# 한 번에 정리하는 스케줄 수
+SCHEDULE_PURGE_BATCH_SIZE = int(os.environ.get("schedule_purge_batch_size", 100))
+# 문장 하나(트랜잭션 하나)가 지우는 최대 행 수
+SCHEDULE_PURGE_ROW_LIMIT = int(os.environ.get("schedule_purge_row_limit", 1000))
+# 배치 사이에 쉬는 시간 (ms)
+SCHEDULE_PURGE_PAUSE_MS = int(os.environ.get("schedule_purge_pause_ms", 50))
+# 정리할 스케줄이 없을 때 다시 확인하는 간격 (초)
+SCHEDULE_PURGE_INTERVAL_SECONDS = float(os.environ.get("schedule_purge_interval_seconds", 30))
+# lock 을 잡지 못했을 때 다시 시도하는 간격 (초)
+SCHEDULE_PURGE_LOCK_RETRY_SECONDS = 30
+# purger 하나만 실행하기 위한 advisory lock 키
+SCHEDULE_PURGE_LOCK_KEY = 72010050
+
+# 사용자의 스케줄에 삭제 표시 (삭제 요청 트랜잭션)
+SOFT_DELETE_SCHEDULES_SQL = """
+    UPDATE schedule SET deleted_at = NOW(), updated_at = NOW()
+    WHERE id = ANY(%s) AND uid = %s AND deleted_at IS NULL
+    RETURNING id
+"""
+
+# 수정 요청에서 삭제되지 않은 스케줄 행을 잠금 (삭제 표시와 같은 행을 잠그므로, 삭제된 스케줄에 자식 행을 다시 만들지 않음)
+LOCK_SCHEDULE_SQL = """
+    SELECT id FROM schedule
+    WHERE id = %s AND uid = %s AND deleted_at IS NULL
+    FOR UPDATE
+"""
+
+# 정리할 스케줄 (마지막으로 처리한 ID 다음부터 ID 순)
+PURGE_CANDIDATES_SQL = """
+    SELECT id FROM schedule
+    WHERE deleted_at IS NOT NULL AND id > %s
+    ORDER BY id
+    LIMIT %s
+"""
+
+
+def _purge_rows_sql(table: str, condition: str) -> str:
+    # 조건에 맞는 행을 최대 %(limit)s 개만 지움 (ctid 로 골라 TID 로 삭제)
+    return f"""
+    DELETE FROM {table}
+    WHERE ctid = ANY(ARRAY(SELECT ctid FROM {table} WHERE {condition} LIMIT %(limit)s))
+"""
+
+
+# 외래 키 순서대로 (자식 테이블 먼저)
+PURGE_STEPS = [
+    ("recurrence_exception", _purge_rows_sql(
+        "recurrence_exception", "recurrence_id IN (SELECT id FROM recurrence WHERE schedule_id = ANY(%(ids)s))")),
+    ("recurrence", _purge_rows_sql("recurrence", "schedule_id = ANY(%(ids)s)")),
+    ("reminder", _purge_rows_sql("reminder", "schedule_id = ANY(%(ids)s)")),
+    ("schedule_tag", _purge_rows_sql("schedule_tag", "schedule_id = ANY(%(ids)s)")),
+    ("reminder_delivery", _purge_rows_sql("reminder_delivery", "schedule_id = ANY(%(ids)s)")),
+]
+PURGE_SCHEDULES_SQL = "DELETE FROM schedule WHERE id = ANY(%(ids)s) AND deleted_at IS NOT NULL"
+
+_stats = {"active": False, "passes": 0, "schedules": 0, "rows": {table: 0 for table, _ in PURGE_STEPS}, "errors": 0,
+          "failed_schedules": 0, "last_purged_at": None}
+
+
+def purge_schedules(conn, schedule_ids: List[int]) -> Dict[str, int]:
+    """
+    삭제 표시된 스케줄들의 연관 데이터와 스케줄 행을 지우는 함수 (문장마다 커밋)
+    :return: 테이블별 지운 행 수
+    """
+    cur = conn.cursor()
+    counts = {}
+    try:
+        params = {"ids": schedule_ids, "limit": SCHEDULE_PURGE_ROW_LIMIT}
+        for table, query in PURGE_STEPS:
+            counts[table] = 0
+            while True:
+                cur.execute(query, params)
+                deleted = cur.rowcount
+                conn.commit()
+                counts[table] += deleted
+                if deleted < SCHEDULE_PURGE_ROW_LIMIT:
+                    break
+        cur.execute(PURGE_SCHEDULES_SQL, params)
+        counts["schedule"] = cur.rowcount
+        conn.commit()
+        return counts
+    finally:
+        cur.close()
+
+
+def _record_purged(counts: Dict[str, int]):
+    _stats["schedules"] += counts.pop("schedule")
+    for table, deleted in counts.items():
+        _stats["rows"][table] += deleted
+
+
+def purge_deleted_schedules(after_id: int) -> Tuple[int, int]:
+    """
+    삭제 표시된 스케줄을 after_id 다음부터 한 배치 정리하는 함수 (스레드풀에서 실행)
+    배치 정리가 실패하면 스케줄 하나씩 다시 정리하며, 실패한 스케줄은 건너뜀
+    :return: (고른 스케줄 수, 마지막으로 처리한 스케줄 ID)
+    """
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(PURGE_CANDIDATES_SQL, (after_id, SCHEDULE_PURGE_BATCH_SIZE))
+            schedule_ids = [row[0] for row in cur.fetchall()]
+        conn.commit()
+        if not schedule_ids:
+            return 0, after_id
+        try:
+            _record_purged(purge_schedules(conn, schedule_ids))
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Schedule purge batch failed, retrying one by one: {e}")
+            for schedule_id in schedule_ids:
+                try:
+                    _record_purged(purge_schedules(conn, [schedule_id]))
+                except Exception as e:
+                    conn.rollback()
+                    _stats["failed_schedules"] += 1
+                    logger.error(f"Failed to purge schedule {schedule_id}, skipping: {e}")
+        _stats["last_purged_at"] = datetime.now(pytz.utc)
+        return len(schedule_ids), schedule_ids[-1]
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        close_db_connection(conn)
+
+
+def _try_purge_lock(conn) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (SCHEDULE_PURGE_LOCK_KEY,))
+        return cur.fetchone()[0]
+
+
+async def run_schedule_purger():
+    """
+    삭제한 스케줄 정리 task (앱 lifespan 에서 시작, 종료 시 cancel)
+    lock 전용 커넥션(autocommit, primary)으로 advisory lock 을 잡은 워커만 정리하며, 커넥션을 닫으면 lock 이 풀립니다.
+    """
+    if not SCHEDULE_PURGE_ENABLED:
+        return
+    while True:
+        conn = None
+        try:
+            conn = await run_in_threadpool(open_listen_connection)
+            if await run_in_threadpool(_try_purge_lock, conn):
+                logger.info("Schedule purger acquired the purge lock")
+                _stats["active"] = True
+                after_id = 0
+                while True:
+                    purged, after_id = await run_in_threadpool(purge_deleted_schedules, after_id)
+                    _stats["passes"] += 1
+                    if purged < SCHEDULE_PURGE_BATCH_SIZE:
+                        # 끝까지 처리했으므로 다음 회차는 처음부터 (건너뛴 스케줄 다시 시도)
+                        after_id = 0
+                        await asyncio.sleep(SCHEDULE_PURGE_INTERVAL_SECONDS)
+                    else:
+                        await asyncio.sleep(SCHEDULE_PURGE_PAUSE_MS / 1000)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.error(f"Schedule purger failed, retrying in {SCHEDULE_PURGE_LOCK_RETRY_SECONDS}s: {e}")
+        finally:
+            _stats["active"] = False
+            if conn is not None:
+                conn.close()
+        await asyncio.sleep(SCHEDULE_PURGE_LOCK_RETRY_SECONDS)
+
+
+def get_schedule_purge_stats() -> dict:
+    return {
+        "enabled": SCHEDULE_PURGE_ENABLED,
+        **_stats,
+    }
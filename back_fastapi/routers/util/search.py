@@ -0,0 +1,146 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+import psycopg2
+import pytz
+from fastapi import HTTPException, status
+from rapidfuzz import fuzz, utils as fuzz_utils
+from db.db_conn import get_db_connection, close_db_connection
+from .recurrence import expand_recurrences
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+스케줄 검색 (제목, 메모, 태그)
+1. 후보 조회: trigram GIN 인덱스(db/sql/005_search_trgm.sql)로 검색어를 포함하거나(ILIKE) 단어 유사도가 높은(<%) 스케줄과
+   태그를 찾아, 유사도 순으로 최대 SEARCH_CANDIDATE_LIMIT 개
+2. 재정렬: rapidfuzz 로 제목 / 태그 / 메모 점수를 계산해 가중치가 가장 큰 값을 점수로 사용
+3. 반복 일정은 반복 일정 엔진으로 지금 이후의 다음 발생을 함께 반환
+"""
+
+# 후보 최대 개수 (재정렬 대상)
+SEARCH_CANDIDATE_LIMIT = int(os.environ.get("search_candidate_limit", 200))
+# 결과에 포함하는 최소 점수 (0 ~ 100)
+SEARCH_MIN_SCORE = float(os.environ.get("search_min_score", 50))
+# 단어 유사도 후보 기준 (pg_trgm.word_similarity_threshold)
+SEARCH_SIMILARITY_THRESHOLD = float(os.environ.get("search_similarity_threshold", 0.3))
+# 쿼리 시간 제한 (ms)
+SEARCH_TIMEOUT_MS = int(os.environ.get("search_timeout_ms", 1000))
+# 반복 일정의 다음 발생을 찾는 기간 (일)
+SEARCH_NEXT_OCCURRENCE_DAYS = int(os.environ.get("search_next_occurrence_days", 400))
+
+# 필드별 가중치 (제목 > 태그 > 메모)
+TITLE_WEIGHT = 1.0
+TAG_WEIGHT = 0.9
+NOTE_WEIGHT = 0.8
+
+# 인덱스 식 (005_search_trgm.sql 과 같아야 함)
+SCHEDULE_SEARCH_TEXT = "(s.title || ' ' || COALESCE(s.note, ''))"
+
+SEARCH_CANDIDATES_SQL = """
+    WITH matched AS (
+        SELECT s.id
+        FROM schedule s
+        WHERE s.uid = %(uid)s AND s.deleted_at IS NULL
+        AND (""" + SCHEDULE_SEARCH_TEXT + """ ILIKE %(pattern)s OR %(query)s <%% """ + SCHEDULE_SEARCH_TEXT + """)
+        UNION
+        SELECT st.schedule_id
+        FROM tag t
+        JOIN schedule_tag st ON st.tag_id = t.id
+        WHERE t.uid = %(uid)s
+        AND (t.title ILIKE %(pattern)s OR %(query)s <%% t.title)
+    )
+    SELECT s.id, s.title, s.note, s.color, s.start_date, s.end_date,
+           r.frequency, r.interval, r.until, r.count, s.tag_snapshot
+    FROM schedule s
+    LEFT JOIN recurrence r ON s.id = r.schedule_id
+    WHERE s.uid = %(uid)s AND s.deleted_at IS NULL AND s.id IN (SELECT id FROM matched)
+    ORDER BY word_similarity(%(query)s, """ + SCHEDULE_SEARCH_TEXT + """) DESC, s.id
+    LIMIT %(limit)s
+"""
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def score_candidate(query: str, title: str, note: Optional[str], tag_names: List[str]) -> float:
+    """
+    검색어와 스케줄의 점수 (0 ~ 100) - 필드별 rapidfuzz 점수에 가중치를 곱한 값 중 최대값
+    """
+    scores = [TITLE_WEIGHT * fuzz.WRatio(query, title, processor=fuzz_utils.default_process)]
+    if tag_names:
+        scores.append(TAG_WEIGHT * max(fuzz.WRatio(query, tag, processor=fuzz_utils.default_process) for tag in tag_names))
+    if note:
+        scores.append(NOTE_WEIGHT * fuzz.partial_ratio(query, note, processor=fuzz_utils.default_process))
+    return max(scores)
+
+
+def search_schedules(uid: int, query: str, limit: int) -> List[dict]:
+    """
+    스케줄을 검색해 점수 순으로 반환하는 함수 (스레드풀에서 실행)
+    :return: [{"id", "title", "note", "color", "tags", "start_date", "end_date", "is_repeat", "next_occurrence", "score"}]
+    """
+    conn = get_db_connection(read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SET LOCAL statement_timeout = %s; SET LOCAL pg_trgm.word_similarity_threshold = %s",
+            (SEARCH_TIMEOUT_MS, SEARCH_SIMILARITY_THRESHOLD)
+        )
+        cur.execute(SEARCH_CANDIDATES_SQL, {
+            "uid": uid,
+            "query": query,
+            "pattern": _like_pattern(query),
+            "limit": SEARCH_CANDIDATE_LIMIT,
+        })
+        rows = cur.fetchall()
+
+        ranked = []
+        for row in rows:
+            # 태그 스냅샷 [{"id", "name"}] -> 태그 이름 목록
+            row = row[:10] + ([tag["name"] for tag in row[10]],)
+            score = score_candidate(query, row[1], row[2], row[10])
+            if score >= SEARCH_MIN_SCORE:
+                ranked.append((score, row))
+        ranked.sort(key=lambda item: (-item[0], item[1][0]))
+        ranked = ranked[:limit]
+
+        # 반복 일정의 다음 발생 (결과에 포함된 반복 일정만, 쿼리 한 번)
+        now = datetime.now(pytz.utc)
+        series = [(row[0], row[4], row[6], row[7], row[8], row[9]) for _, row in ranked if row[6]]
+        occurrences = expand_recurrences(cur, series, now, now + timedelta(days=SEARCH_NEXT_OCCURRENCE_DAYS))
+
+        results = []
+        for score, (schedule_id, title, note, color, start_date, end_date,
+                    frequency, interval, until, count, tag_names) in ranked:
+            next_occurrence = None
+            if frequency and occurrences[schedule_id]:
+                event = occurrences[schedule_id][0]
+                next_occurrence = {"start_date": event, "end_date": event + (end_date - start_date)}
+            results.append({
+                "id": schedule_id,
+                "title": title,
+                "note": note,
+                "color": color,
+                "tags": tag_names,
+                "start_date": start_date,
+                "end_date": end_date,
+                "is_repeat": frequency is not None,
+                "next_occurrence": next_occurrence,
+                "score": round(score, 1),
+            })
+        return results
+    except psycopg2.extensions.QueryCanceledError:
+        logger.warning(f"Search for user {uid} exceeded {SEARCH_TIMEOUT_MS}ms")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search took too long. Try a more specific query."
+        )
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
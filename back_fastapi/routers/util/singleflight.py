@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+동일한 요청 병합 (single-flight)
+같은 키로 동시에 들어온 요청은 먼저 들어온 요청(leader)의 계산 하나를 함께 기다리고 같은 결과를 받습니다.
+계산이 끝나면 키를 지우므로 결과를 캐시하지 않으며, 키에 사용자 데이터 버전을 넣어 쓰기 이후의 요청이
+쓰기 이전에 시작된 계산에 합류하지 않도록 합니다.
+이벤트 루프 안에서만 사용하므로 (워커 프로세스 단위) 별도의 lock이 필요 없습니다.
+"""
+
+# 이름 -> SingleFlight (metrics 용)
+_flights: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.requests = 0
+        self.executions = 0
+        _flights[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """
+        key로 진행 중인 계산이 있으면 그 결과를 기다리고, 없으면 fn()을 실행하는 함수
+        계산은 별도 task로 실행하므로 leader 요청이 취소(클라이언트 연결 종료)되어도 함께 기다리는 요청은 결과를 받습니다.
+        fn에서 발생한 예외는 기다리던 모든 요청에 그대로 전달됩니다.
+        """
+        self.requests += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # 기다리던 요청이 모두 취소된 경우에도 예외가 조회되지 않았다는 경고가 남지 않도록 함
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Single-flight {self.name} computation failed: {task.exception()}")
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "coalesced": self.requests - self.executions,
+            # 요청 수 / 실제 계산 수 (1.0 이면 병합된 요청 없음)
+            "collapse_ratio": round(self.requests / self.executions, 3) if self.executions else None,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def get_singleflight_stats() -> dict:
+    """
+    single-flight 별 요청 수, 실제 계산 수, 병합 비율을 반환하는 함수
+    """
+    return {name: flight.stats() for name, flight in _flights.items()}
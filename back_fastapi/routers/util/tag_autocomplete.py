@@ -0,0 +1,121 @@
+import heapq
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+from db.db_conn import get_db_connection, close_db_connection
+from .cache import LRUCache
+
+"""
+태그 자동완성 (사용자별 메모리 인덱스)
+- 태그 이름을 casefold 한 값으로 정렬한 배열에서 bisect 로 접두사 범위를 찾고, 사용 횟수(schedule_tag) 순으로 상위 N개 반환
+- 처음 요청할 때 만들고(lazy), 일정 생성 / 수정으로 태그가 추가되면 이 워커의 인덱스를 바로 갱신
+- 다른 경로(일괄 작업, 가져오기, 다른 워커)의 변경은 TAG_AUTOCOMPLETE_TTL_SECONDS 마다 다시 만들어 반영
+- 사용자 수는 LRU 로 제한 (오래 사용하지 않은 사용자부터 제거)
+"""
+
+TAG_AUTOCOMPLETE_MAX_USERS = int(os.environ.get("tag_autocomplete_max_users", 10000))
+TAG_AUTOCOMPLETE_TTL_SECONDS = float(os.environ.get("tag_autocomplete_ttl_seconds", 300))
+
+# 사용자의 태그와 사용 횟수
+TAG_USAGE_SQL = """
+    SELECT t.title, COUNT(s.id)
+    FROM tag t
+    LEFT JOIN schedule_tag st ON st.tag_id = t.id
+    LEFT JOIN schedule s ON s.id = st.schedule_id AND s.deleted_at IS NULL
+    WHERE t.uid = %s
+    GROUP BY t.title
+"""
+
+# 스케줄에 연결된 태그 이름 (수정 전 태그의 사용 횟수를 줄이기 위해 사용)
+SCHEDULE_TAG_TITLES_SQL = """
+    SELECT t.title
+    FROM schedule_tag st
+    JOIN tag t ON t.id = st.tag_id
+    WHERE st.schedule_id = %s
+"""
+
+# 접두사 범위의 끝 (모든 문자보다 큰 값)
+_PREFIX_END = "\U0010ffff"
+
+
+class TagAutocomplete:
+    """한 사용자의 태그 접두사 인덱스 (갱신과 조회는 _lock 으로 보호)"""
+
+    def __init__(self, usage: Dict[str, int]):
+        self.usage = usage
+        # (casefold 한 이름, 원래 이름) 정렬 배열
+        self.keys: List[Tuple[str, str]] = sorted((title.casefold(), title) for title in usage)
+        self.built_at = time.monotonic()
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        key = prefix.casefold()
+        lo = bisect_left(self.keys, (key,))
+        hi = bisect_left(self.keys, (key + _PREFIX_END,))
+        top = heapq.nsmallest(limit, self.keys[lo:hi], key=lambda item: (-self.usage[item[1]], item[0]))
+        return [(title, self.usage[title]) for _, title in top]
+
+    def add_usage(self, title: str, delta: int):
+        if title not in self.usage:
+            if delta <= 0:
+                return
+            self.usage[title] = 0
+            insort(self.keys, (title.casefold(), title))
+        # 태그는 사용하지 않게 되어도 남아 있으므로 0에서 멈춤
+        self.usage[title] = max(0, self.usage[title] + delta)
+
+
+_indexes = LRUCache(TAG_AUTOCOMPLETE_MAX_USERS)
+_lock = threading.Lock()
+
+
+def _load(uid: int) -> TagAutocomplete:
+    conn = get_db_connection(read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        cur.execute(TAG_USAGE_SQL, (uid,))
+        return TagAutocomplete(dict(cur.fetchall()))
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def suggest_tags(uid: int, prefix: str, limit: int) -> List[Tuple[str, int]]:
+    """
+    접두사로 시작하는 태그를 사용 횟수 순으로 반환하는 함수 (스레드풀에서 실행)
+    :return: [(태그 이름, 사용 횟수)]
+    """
+    index = _indexes.get(uid)
+    if index is None or time.monotonic() - index.built_at > TAG_AUTOCOMPLETE_TTL_SECONDS:
+        index = _load(uid)
+        _indexes.set(uid, index)
+    with _lock:
+        return index.suggest(prefix, limit)
+
+
+def is_tag_autocomplete_cached(uid: int) -> bool:
+    return uid in _indexes
+
+
+def record_tag_usage(uid: int, added: Iterable[str], removed: Iterable[str] = ()):
+    """
+    일정 생성 / 수정을 커밋한 뒤 태그 사용 횟수를 갱신하는 함수 (인덱스가 없는 사용자는 무시)
+    """
+    index = _indexes.peek(uid)
+    if index is None:
+        return
+    with _lock:
+        for title in dict.fromkeys(removed):
+            index.add_usage(title, -1)
+        for title in dict.fromkeys(added):
+            index.add_usage(title, 1)
+
+
+def invalidate_tag_autocomplete(uid: int):
+    """태그 이름 변경처럼 사용 횟수로 반영할 수 없는 변경 뒤에 호출 (다음 요청에서 다시 만듦)"""
+    _indexes.pop(uid)
+
+
+def get_tag_autocomplete_stats() -> dict:
+    return _indexes.stats()
@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from operator import and_, or_
+from typing import Dict, List, Optional, Tuple
+from db.db_conn import get_db_connection, close_db_connection
+from .cache import LRUCache
+from .versioning import GET_USER_VERSION_SQL
+from .push import hub
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+"""
+사용자별 태그 -> 스케줄 비트맵 인덱스 (여러 태그로 거르는 /list, /sidebar 조회용)
+- 태그가 붙은 사용자의 스케줄을 ID 순으로 정렬해 0, 1, 2 ... 위치를 매기고 (전역 ID 대신 사용자별 위치를 쓰므로 비트맵이 작음),
+  태그마다 해당 스케줄 위치의 비트를 켠 정수(Python int 비트셋)로 보관
+- 여러 태그 중 하나라도(any) / 모두(all) 붙은 스케줄: 비트맵 OR / AND 한 번으로 계산해 스케줄 ID 목록으로 변환
+- 인덱스는 만들 때의 user_version 을 가지며 현재 버전과 같을 때만 사용
+  - 없거나 오래된 인덱스는 백그라운드 스레드에서 다시 만들고, 그동안 요청은 SQL 로 필터 (요청 안에서 만들지 않음)
+  - 인덱스가 있는 사용자의 변경 알림을 받으면 미리 다시 만들어 둠
+  - 같은 사용자는 TAG_BITMAP_REBUILD_INTERVAL_MS 안에 다시 만들지 않음 (replica 지연으로 오래된 인덱스가 만들어져도 요청마다 다시 만들지 않음)
+  - 만든 인덱스가 이미 있는 인덱스보다 오래된 버전이면 버림
+- 사용자 수는 LRU 로 제한 (오래 조회하지 않은 사용자부터 제거)
+"""
+
+TAG_BITMAP_MAX_USERS = int(os.environ.get("tag_bitmap_max_users", 10000))
+# 같은 사용자의 인덱스를 다시 만드는 최소 간격 (ms)
+TAG_BITMAP_REBUILD_INTERVAL_MS = int(os.environ.get("tag_bitmap_rebuild_interval_ms", 1000))
+
+# 사용자의 (태그, 스케줄) 연결
+TAG_BITMAP_SOURCE_SQL = """
+    SELECT st.tag_id, st.schedule_id
+    FROM schedule_tag st
+    JOIN schedule s ON s.id = st.schedule_id
+    WHERE s.uid = %s AND s.deleted_at IS NULL
+"""
+
+
+class TagBitmapIndex:
+    """한 사용자의 태그별 스케줄 비트맵 (만든 뒤에는 바꾸지 않으므로 잠금 없이 조회)"""
+
+    def __init__(self, version: int, rows: List[Tuple[int, int]]):
+        self.version = version
+        # 비트 위치 -> 스케줄 ID
+        self.schedule_ids: List[int] = sorted({schedule_id for _, schedule_id in rows})
+        position = {schedule_id: i for i, schedule_id in enumerate(self.schedule_ids)}
+        size = (len(self.schedule_ids) + 7) // 8
+        buffers: Dict[int, bytearray] = {}
+        for tag_id, schedule_id in rows:
+            buffer = buffers.get(tag_id)
+            if buffer is None:
+                buffer = buffers[tag_id] = bytearray(size)
+            i = position[schedule_id]
+            buffer[i >> 3] |= 1 << (i & 7)
+        self.bitmaps: Dict[int, int] = {tag_id: int.from_bytes(buffer, "little") for tag_id, buffer in buffers.items()}
+
+    def match(self, tag_ids: List[int], match_all: bool = False) -> List[int]:
+        """
+        태그 중 하나라도(match_all=False) / 모두(match_all=True) 붙은 스케줄 ID 목록 (ID 순)
+        """
+        bits = reduce(and_ if match_all else or_, (self.bitmaps.get(tag_id, 0) for tag_id in tag_ids), -1 if match_all else 0)
+        if bits <= 0:
+            return []
+        schedule_ids = []
+        for byte_index, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+            while byte:
+                low = byte & -byte
+                schedule_ids.append(self.schedule_ids[(byte_index << 3) + low.bit_length() - 1])
+                byte ^= low
+        return schedule_ids
+
+    def nbytes(self) -> int:
+        return sum((bits.bit_length() + 7) // 8 for bits in self.bitmaps.values())
+
+
+_indexes = LRUCache(TAG_BITMAP_MAX_USERS)
+_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tag-bitmap")
+_pending = set()
+_pending_lock = threading.Lock()
+# 사용자 -> 마지막으로 인덱스를 만들기 시작한 시각 (time.monotonic)
+_last_build = LRUCache(TAG_BITMAP_MAX_USERS)
+_stats = {"builds": 0, "stale": 0, "discarded": 0, "build_errors": 0}
+
+
+def build_tag_bitmap_index(uid: int) -> TagBitmapIndex:
+    """
+    사용자의 태그 비트맵 인덱스를 만드는 함수 (버전과 연결을 같은 스냅샷에서 읽음)
+    """
+    conn = get_db_connection(read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;\n" + GET_USER_VERSION_SQL, (uid,))
+        row = cur.fetchone()
+        version = row[0] if row else 0
+        cur.execute(TAG_BITMAP_SOURCE_SQL, (uid,))
+        return TagBitmapIndex(version, cur.fetchall())
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
+
+
+def _build_and_store(uid: int):
+    try:
+        index = build_tag_bitmap_index(uid)
+        _stats["builds"] += 1
+        # 그 사이에 더 새로운 인덱스가 들어왔으면 (먼저 시작한 빌드가 replica 지연 등으로 늦게 끝난 경우) 버림
+        current = _indexes.peek(uid)
+        if current is not None and current.version > index.version:
+            _stats["discarded"] += 1
+            return
+        _indexes.set(uid, index)
+    except Exception as e:
+        _stats["build_errors"] += 1
+        logger.error(f"Failed to build tag bitmap index for user {uid}: {e}")
+    finally:
+        with _pending_lock:
+            _pending.discard(uid)
+
+
+def schedule_bitmap_build(uid: int):
+    """사용자의 인덱스를 백그라운드에서 (다시) 만들도록 예약하는 함수 (이미 예약되어 있거나 최근에 만들었으면 무시)"""
+    now = time.monotonic()
+    with _pending_lock:
+        if uid in _pending:
+            return
+        last_build = _last_build.peek(uid)
+        if last_build is not None and (now - last_build) * 1000 < TAG_BITMAP_REBUILD_INTERVAL_MS:
+            return
+        _pending.add(uid)
+        _last_build.set(uid, now)
+    _builder.submit(_build_and_store, uid)
+
+
+def filter_schedule_ids_by_tags(uid: int, version: int, tag_ids: List[int], match_all: bool = False) -> Optional[List[int]]:
+    """
+    태그 필터에 맞는 사용자의 스케줄 ID 목록을 반환하는 함수
+    인덱스가 없거나 version 과 다르면 None 을 반환하고 백그라운드에서 다시 만들도록 예약합니다. (호출한 요청은 SQL 로 필터)
+    """
+    index = _indexes.get(uid)
+    if index is None or index.version != version:
+        if index is not None:
+            _stats["stale"] += 1
+        if index is None or index.version < version:
+            schedule_bitmap_build(uid)
+        return None
+    return index.match(tag_ids, match_all)
+
+
+def _on_user_changed(uid: Optional[int], version: Optional[int]):
+    # 인덱스가 있는 사용자가 바뀌면 다음 조회 전에 다시 만들어 둠 (전체 다시 읽기는 무시 - 조회할 때 버전으로 검증)
+    if uid is None:
+        return
+    index = _indexes.peek(uid)
+    if index is not None and index.version < version:
+        schedule_bitmap_build(uid)
+
+
+hub.add_change_listener(_on_user_changed)
+
+
+def get_tag_bitmap_stats() -> dict:
+    return {
+        "users": _indexes.stats(),
+        "bytes": sum(index.nbytes() for index in _indexes.values()),
+        "pending_builds": len(_pending),
+        **_stats,
+    }
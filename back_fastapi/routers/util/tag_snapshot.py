@@ -0,0 +1,87 @@
+from typing import List, Optional, Sequence, Tuple
+from db.db_conn import PipelinedBatch
+
+"""
+스케줄 태그 스냅샷(schedule.tag_snapshot, db/sql/006_tag_snapshot.sql)
+- 스케줄에 붙은 태그를 [{"id", "name"}] jsonb 로 스케줄 행에 함께 저장해, 조회할 때 schedule_tag / tag 조인과 집계를 하지 않음
+- 태그 연결을 바꾸는 쓰기는 연결 쿼리 뒤에 같은 트랜잭션에서 add_refresh_tag_snapshots 로 스냅샷을 다시 계산
+- 태그 이름 변경은 그 태그가 붙은 스케줄의 스냅샷을 다시 계산 (REFRESH_TAG_SNAPSHOTS_FOR_TAG_SQL)
+- find_stale_tag_snapshots / rebuild_tag_snapshots: 저장된 스냅샷과 원본(schedule_tag)을 비교 / 일괄 재계산 (bench/check_tag_snapshots.py)
+"""
+
+# 스케줄(s)의 현재 태그 스냅샷 (이름, ID 순)
+TAG_SNAPSHOT_SQL = """
+    COALESCE((
+        SELECT jsonb_agg(jsonb_build_object('id', t.id, 'name', t.title) ORDER BY t.title, t.id)
+        FROM schedule_tag st
+        JOIN tag t ON t.id = st.tag_id
+        WHERE st.schedule_id = s.id
+    ), '[]'::jsonb)
+"""
+
+REFRESH_TAG_SNAPSHOTS_SQL = """
+    UPDATE schedule s
+    SET tag_snapshot = """ + TAG_SNAPSHOT_SQL + """
+    WHERE s.id = ANY(%(schedule_ids)s::bigint[])
+"""
+
+# 태그 이름 변경 후 그 태그가 붙은 스케줄 (파라미터: tag_id)
+REFRESH_TAG_SNAPSHOTS_FOR_TAG_SQL = """
+    UPDATE schedule s
+    SET tag_snapshot = """ + TAG_SNAPSHOT_SQL + """
+    WHERE s.id IN (SELECT st.schedule_id FROM schedule_tag st WHERE st.tag_id = %(tag_id)s)
+"""
+
+# 가져오기(import) 스테이징 테이블의 스케줄 (schedule_import.MERGE_STAGING_SQL 용)
+REFRESH_IMPORTED_TAG_SNAPSHOTS_SQL = """
+    UPDATE schedule s
+    SET tag_snapshot = """ + TAG_SNAPSHOT_SQL + """
+    WHERE s.id IN (SELECT schedule_id FROM import_schedule_stage)
+    AND EXISTS (SELECT 1 FROM import_tag_stage)
+"""
+
+# ID 구간 [after_id 초과, limit 개] 에서 저장된 스냅샷이 원본과 다른 스케줄
+STALE_TAG_SNAPSHOTS_SQL = """
+    WITH chunk AS (
+        SELECT s.id, s.tag_snapshot
+        FROM schedule s
+        WHERE s.id > %(after_id)s
+        ORDER BY s.id
+        LIMIT %(limit)s
+    )
+    SELECT (SELECT MAX(id) FROM chunk), (SELECT COUNT(*) FROM chunk), ARRAY(
+        SELECT s.id
+        FROM chunk s
+        WHERE s.tag_snapshot IS DISTINCT FROM """ + TAG_SNAPSHOT_SQL + """
+        ORDER BY s.id
+    )
+"""
+
+
+def add_refresh_tag_snapshots(batch: PipelinedBatch, schedule_ids: Sequence[int]):
+    """
+    태그 연결 쿼리 뒤에 스케줄들의 태그 스냅샷을 다시 계산하는 쿼리를 추가하는 함수
+    """
+    if schedule_ids:
+        batch.add(REFRESH_TAG_SNAPSHOTS_SQL, {"schedule_ids": list(schedule_ids)})
+
+
+def find_stale_tag_snapshots(cur, after_id: int, limit: int) -> Tuple[Optional[int], int, List[int]]:
+    """
+    ID 순으로 after_id 다음 limit 개의 스케줄 중 스냅샷이 원본과 다른 스케줄을 찾는 함수
+    :return: (검사한 마지막 ID - 더 없으면 None, 검사한 스케줄 수, 다른 스케줄 ID 목록)
+    """
+    cur.execute(STALE_TAG_SNAPSHOTS_SQL, {"after_id": after_id, "limit": limit})
+    last_id, checked, stale_ids = cur.fetchone()
+    return last_id, checked, stale_ids
+
+
+def rebuild_tag_snapshots(cur, schedule_ids: Sequence[int]) -> int:
+    """
+    스케줄들의 태그 스냅샷을 다시 계산하는 함수 (커밋은 호출하는 쪽에서)
+    :return: 갱신한 행 수
+    """
+    if not schedule_ids:
+        return 0
+    cur.execute(REFRESH_TAG_SNAPSHOTS_SQL, {"schedule_ids": list(schedule_ids)})
+    return cur.rowcount
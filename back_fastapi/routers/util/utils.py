@@ -1,10 +1,15 @@
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
+import base64
+import json
 import psycopg2
-from db.db_conn import get_db_connection, close_db_connection
+from db.db_conn import get_db_connection, close_db_connection, execute_prepared
 from typing import List, Tuple,Optional, Set
 import dateutil.relativedelta
 import pytz  # 시간대 처리를 위한 모듈
+import os
+import time
+from .cache import LRUCache
 
 import logging
 
@@ -33,6 +38,34 @@ def parse_iso_date(date_str: str) -> datetime:
         )
 
 
+def encode_cursor(start_date: datetime, schedule_id: int) -> str:
+    """
+    keyset 페이지네이션 위치 (start_date, id)를 불투명한(opaque) 커서 문자열로 변환하는 함수
+    :param start_date: 마지막으로 반환한 스케줄의 시작 시각
+    :param schedule_id: 마지막으로 반환한 스케줄 ID
+    :return: URL-safe base64 문자열
+    """
+    raw = json.dumps([start_date.isoformat(), schedule_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    encode_cursor로 만든 커서 문자열을 (start_date, id)로 변환하는 함수
+    :param cursor: 커서 문자열
+    :return: (start_date, schedule_id)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_date, schedule_id = json.loads(raw)
+        return datetime.fromisoformat(start_date), int(schedule_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
+
+
 def check_color_list(color: str) -> bool:
     """
     명시해놓은 color list에 입력받은 문자열이 있는지 체크 후 True False를 반환하는 함수
@@ -59,36 +92,85 @@ def check_color_list(color: str) -> bool:
         )
 
 
-def check_group_tags(uid):
+# 개인 태그: [{"id", "name"}]
+PER_TAGS_SQL = """
+    SELECT COALESCE(json_agg(json_build_object('id', t.id, 'name', t.title) ORDER BY t.id), '[]'::json)
+    FROM tag t
+    WHERE t.uid = %(uid)s AND t.is_personal = TRUE
+"""
+
+# 그룹 태그: 사용자가 속한 그룹(community_member)별로, 그룹 스케줄(community_schedule)에 연결된 태그(schedule_tag)
+# [{"id", "name", "tags": [{"id", "name"}]}]
+GROUP_TAGS_SQL = """
+    SELECT COALESCE(json_agg(json_build_object('id', g.id, 'name', g.title, 'tags', g.tags) ORDER BY g.id), '[]'::json)
+    FROM (
+        SELECT c.id, c.title,
+               COALESCE(
+                   jsonb_agg(DISTINCT jsonb_build_object('id', t.id, 'name', t.title)) FILTER (WHERE t.id IS NOT NULL),
+                   '[]'::jsonb
+               ) AS tags
+        FROM community_member m
+        JOIN community c ON c.id = m.community_id
+        LEFT JOIN community_schedule cs ON cs.community_id = c.id
+        LEFT JOIN schedule_tag st ON st.community_schedule_id = cs.id
+        LEFT JOIN tag t ON t.id = st.tag_id
+        WHERE m.uid = %(uid)s
+        GROUP BY c.id, c.title
+    ) g
+"""
+
+# 개인 태그와 그룹 태그를 한 번의 쿼리로 조회
+TOTAL_TAGS_SQL = "SELECT (" + PER_TAGS_SQL + "), (" + GROUP_TAGS_SQL + ")"
+
+# 태그 목록 캐시 유지 시간 (초) - 다른 그룹 멤버의 변경은 이 시간 안에 반영
+TOTAL_TAGS_CACHE_TTL_SECONDS = float(os.environ.get("total_tags_cache_ttl_seconds", 60))
+# uid -> (user_version, 저장 시각, 개인 태그, 그룹 태그)
+total_tags_cache = LRUCache(int(os.environ.get("total_tags_cache_size", 10000)))
+
+
+def load_total_tags(uid: int) -> Tuple[List[dict], List[dict]]:
     """
-    total_tags에 들어갈 그룹 태그 데이터 추출하는 함수
-    1. 로그인 한 유저(uid)가 속한 group에서(TB_community_member) community_schedule_id ( TB_schedule_tag)를 추출해오기
-    2. 그룹 태그 id( TB_schedule_tag )를기준으로 tag name(TB_tag) select 
-    3. 그룹 별 리스트화하여 return
+    개인 태그와 그룹 태그를 커넥션 하나로 조회하는 함수 (스레드풀에서 실행)
+    캐시는 user_version 으로 검증하므로 (PK 조회 한 번) 사용자의 태그 변경은 바로 반영되고,
+    그룹 쪽 변경은 TOTAL_TAGS_CACHE_TTL_SECONDS 안에 반영됩니다.
+    :return: (개인 태그 목록, 그룹 목록)
     """
-    return 0
-
-
-
-def check_per_tags(uid: int) -> List[Tuple[int, str]]:
-    conn = get_db_connection()
+    conn = get_db_connection(read_only=True, uid=uid)
     cur = conn.cursor()
     try:
-        cur.execute("SELECT id, title FROM tag WHERE uid = %s AND is_personal = TRUE", (uid,))
-        tags = cur.fetchall()
-        return tags
-    except Exception as e:
-        print(f"Error fetching personal tags: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch personal tags."
-        )
+        execute_prepared(cur, "user_version_lookup", (uid,))
+        row = cur.fetchone()
+        version = row[0] if row else 0
+
+        cached = total_tags_cache.get(uid)
+        if cached is not None and cached[0] == version and time.monotonic() - cached[1] < TOTAL_TAGS_CACHE_TTL_SECONDS:
+            return cached[2], cached[3]
+
+        cur.execute(TOTAL_TAGS_SQL, {"uid": uid})
+        per_tags, group_tags = cur.fetchone()
+        total_tags_cache.set(uid, (version, time.monotonic(), per_tags, group_tags))
+        return per_tags, group_tags
     finally:
         cur.close()
         close_db_connection(conn)
-        
-        
-        
+
+
+def recurrence_step(frequency: str, interval: int):
+    """
+    반복 주기 한 번의 간격을 반환하는 함수 (일/주 단위는 timedelta, 월/연 단위는 relativedelta)
+    """
+    if frequency == 'daily':
+        return timedelta(days=interval)
+    elif frequency == 'weekly':
+        return timedelta(weeks=interval)
+    elif frequency == 'monthly':
+        return dateutil.relativedelta.relativedelta(months=interval)
+    elif frequency == 'yearly':
+        return dateutil.relativedelta.relativedelta(years=interval)
+    logger.error(f"Invalid frequency: {frequency}")
+    raise ValueError(f"Invalid frequency: {frequency}")
+
+
 def generate_recurring_events(
     start_date: datetime, 
     frequency: str, 
@@ -99,64 +181,64 @@ def generate_recurring_events(
     requested_end: datetime, 
     exceptions: Optional[Set[datetime]] = None  # 예외 일정 추가
 ) -> List[datetime]:
+    """
+    반복 일정의 발생 시각 중 요청 기간 [requested_start, requested_end] 안에 있는 것을 반환하는 함수 (UTC)
+    - k번째 발생 = start_date + k x (interval 만큼의 주기) 로 계산하므로, 월말(31일) 일정이 짧은 달을 지나도 날짜가 밀리지 않음
+      (해당 날짜가 없는 달은 그 달의 마지막 날)
+    - count 는 예외로 제외된 발생도 포함한 전체 발생 횟수
+    - DB 함수 expand_recurrence (db/sql/004_expand_recurrence.sql) 와 같은 결과를 반환해야 합니다.
+    """
     occurrences = []
-    current_date = start_date
-    occurrences_count = 0
 
     # 예외 일정이 없을 경우 빈 집합으로 초기화
     if exceptions is None:
         exceptions = set()
 
     # 로그: 함수 시작 로그와 입력 데이터 기록
-    logger.info(f"Starting generate_recurring_events with start_date={start_date}, frequency={frequency}, "
-                f"interval={interval}, until={until}, count={count}, requested_start={requested_start}, "
-                f"requested_end={requested_end}, exceptions={exceptions}")
-
-    # Ensure all datetime objects are timezone-aware
-    if current_date.tzinfo is None:
-        current_date = pytz.utc.localize(current_date)
-    if until is not None and until.tzinfo is None:
-        until = pytz.utc.localize(until)
-    if requested_start.tzinfo is None:
-        requested_start = pytz.utc.localize(requested_start)
-    if requested_end.tzinfo is None:
-        requested_end = pytz.utc.localize(requested_end)
+    logger.debug(f"Starting generate_recurring_events with start_date={start_date}, frequency={frequency}, "
+                 f"interval={interval}, until={until}, count={count}, requested_start={requested_start}, "
+                 f"requested_end={requested_end}, exceptions={exceptions}")
+
+    # Ensure all datetime objects are timezone-aware (계산은 UTC 기준)
+    def to_utc(dt: datetime) -> datetime:
+        return pytz.utc.localize(dt) if dt.tzinfo is None else dt.astimezone(pytz.utc)
+
+    start_date = to_utc(start_date)
+    requested_start = to_utc(requested_start)
+    requested_end = to_utc(requested_end)
+    # 종료일 또는 무한 반복일 경우, until이 없으면 요청 종료일로 대체
+    until = min(to_utc(until), requested_end) if until else requested_end
 
     try:
-        # 종료일 또는 무한 반복일 경우, until이 없으면 요청 종료일로 대체
-        until = until if until else requested_end
-        logger.debug(f"Computed until={until} for the recurring events")
+        interval = interval or 1
+        step = recurrence_step(frequency, interval)
+
+        # 요청 기간 이전의 발생은 계산하지 않고 건너뜀
+        # (월/연 단위는 한 주기가 최대 31일 x 개월 수이므로, 그 길이로 나눈 값은 실제 위치보다 작거나 같음)
+        k = 0
+        if requested_start > start_date:
+            if isinstance(step, timedelta):
+                k = (requested_start - start_date) // step
+            else:
+                months = step.months + 12 * step.years
+                k = (requested_start - start_date).days // (31 * months)
 
-        while current_date <= until and (count is None or occurrences_count < count):
+        while count is None or k < count:
+            current_date = start_date + step * k
+            if current_date > until:
+                break
             # 요청된 기간 안에 있는 반복 일정만 추가하고, 예외 일정은 제외
-            if current_date >= requested_start and current_date <= requested_end:
+            if current_date >= requested_start:
                 if current_date in exceptions:
                     logger.debug(f"Skipping exception date: {current_date}")
                 else:
-                    logger.debug(f"Adding occurrence: {current_date}")
                     occurrences.append(current_date)
-
-            # 다음 반복 발생일 계산 (주기와 간격에 따라)
-            if frequency == 'daily':
-                current_date += timedelta(days=interval)
-            elif frequency == 'weekly':
-                current_date += timedelta(weeks=interval)
-            elif frequency == 'monthly':
-                current_date += dateutil.relativedelta.relativedelta(months=interval)
-            elif frequency == 'yearly':
-                current_date += dateutil.relativedelta.relativedelta(years=interval)
-            else:
-                logger.error(f"Invalid frequency: {frequency}")
-                raise ValueError(f"Invalid frequency: {frequency}")
-
-            occurrences_count += 1
-            logger.debug(f"Next occurrence calculated: {current_date}")
+            k += 1
 
     except Exception as e:
         logger.error(f"Error occurred while generating recurring events: {e}")
         raise
 
-    # 로그: 발생한 모든 일정을 로그에 기록
-    logger.info(f"Generated {len(occurrences)} occurrences, with exceptions excluded: {exceptions}")
+    logger.debug(f"Generated {len(occurrences)} occurrences, with exceptions excluded: {exceptions}")
 
-    return occurrences
\ No newline at end of file
+    return occurrences
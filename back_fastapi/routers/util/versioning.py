@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Optional, Tuple
+from db.db_conn import PipelinedBatch, mark_user_write, get_db_connection, close_db_connection, register_prepared_statement, execute_prepared
+
+"""
+사용자별 데이터 버전(user_version) 관리
+쓰기 트랜잭션 안에서 버전을 올리면 커밋과 함께 반영되고, 읽기 쪽에서는 PK 조회 한 번으로 변경 여부를 알 수 있습니다.
+모든 쓰기 경로가 버전을 올리므로, 버전을 올릴 때 read-your-writes 를 위해 해당 사용자의 읽기를 잠시 primary로 고정합니다.
+"""
+
+# 변경 알림 채널 (routers.util.push 의 LISTEN 커넥션이 수신)
+CHANGE_NOTIFY_CHANNEL = "schedule_changes"
+
+# 버전을 올리고 "uid:version" 알림을 보냄 (NOTIFY는 커밋될 때만 전달되므로 rollback 된 쓰기는 알리지 않음)
+BUMP_USER_VERSION_SQL = """
+    WITH bumped AS (
+        INSERT INTO user_version (uid, version, updated_at)
+        VALUES (%s, 1, NOW())
+        ON CONFLICT (uid) DO UPDATE
+        SET version = user_version.version + 1, updated_at = NOW()
+        RETURNING uid, version
+    )
+    SELECT version, pg_notify('""" + CHANGE_NOTIFY_CHANNEL + """', uid::text || ':' || version::text)
+    FROM bumped
+"""
+
+GET_USER_VERSION_SQL = "SELECT version, updated_at FROM user_version WHERE uid = %s"
+register_prepared_statement("user_version_lookup", GET_USER_VERSION_SQL)
+
+
+def bump_user_version(cur, uid: int) -> int:
+    """
+    사용자 데이터 버전을 1 올리는 함수 (쓰기 트랜잭션 안에서 호출)
+    :return: 새 버전
+    """
+    mark_user_write(uid)
+    cur.execute(BUMP_USER_VERSION_SQL, (uid,))
+    return cur.fetchone()[0]
+
+
+def add_bump_user_version(batch: PipelinedBatch, uid: int):
+    """
+    PipelinedBatch에 버전 증가 쿼리를 추가하는 함수
+    batch의 마지막 쿼리 결과를 읽는 경우에는 그 쿼리보다 먼저 추가해야 합니다.
+    """
+    mark_user_write(uid)
+    batch.add(BUMP_USER_VERSION_SQL, (uid,))
+
+
+def get_user_version(cur, uid: int) -> Tuple[int, Optional[datetime]]:
+    """
+    사용자 데이터 버전을 조회하는 함수
+    :return: (버전, 마지막 변경 시각) - 한 번도 변경되지 않은 사용자는 (0, None)
+    """
+    cur.execute(GET_USER_VERSION_SQL, (uid,))
+    row = cur.fetchone()
+    return (row[0], row[1]) if row else (0, None)
+
+
+def read_user_version(uid: int) -> int:
+    """
+    사용자 데이터 버전만 조회하는 함수 (요청 병합 키, 캐시 검증용)
+    커넥션을 직접 가져오며, 읽기 전용이므로 replica에서 조회할 수 있습니다. (쓰기 직후의 사용자는 primary)
+    """
+    conn = get_db_connection(read_only=True, uid=uid)
+    cur = conn.cursor()
+    try:
+        execute_prepared(cur, "user_version_lookup", (uid,))
+        row = cur.fetchone()
+        return row[0] if row else 0
+    finally:
+        cur.close()
+        close_db_connection(conn)
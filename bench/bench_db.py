@@ -0,0 +1,30 @@
+import os
+import sys
+from contextlib import contextmanager
+
+"""
+DB 를 사용하는 벤치마크 / 점검 스크립트의 공통 준비
+back_fastapi 를 import 경로에 추가하고, 서버의 lifespan 처럼 커넥션 풀을 만든 뒤 끝나면 닫습니다.
+(풀을 만들지 않으면 get_db_connection() 이 503 "The server is starting up" 을 던짐)
+
+    from bench_db import connection_pool
+
+    with connection_pool():
+        conn = get_db_connection()
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(ROOT, "back_fastapi") not in sys.path:
+    sys.path.insert(0, os.path.join(ROOT, "back_fastapi"))
+
+from db.db_conn import init_connection_pool, close_connection_pool  # noqa: E402
+
+
+@contextmanager
+def connection_pool():
+    """커넥션 풀을 만들고, 블록이 끝나면 (예외 / sys.exit 포함) 닫는 context manager"""
+    init_connection_pool()
+    try:
+        yield
+    finally:
+        close_connection_pool()
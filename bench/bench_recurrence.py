@@ -0,0 +1,101 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+import pytz
+
+"""
+반복 일정 펼치기 엔진 벤치마크 (python vs sql)
+BENCH_UID 사용자로 반복 일정 N개(daily / weekly / monthly / yearly, 일부는 예외 포함)를 트랜잭션 안에서 만들고,
+기간(한 달 / 일 년)별로 두 엔진의 expand_recurrences 실행 시간(중앙값)과 펼친 발생 수를 markdown 표로 출력합니다.
+만든 데이터는 마지막에 rollback 하므로 남지 않습니다.
+
+    BENCH_UID=<사용자 ID> python bench/bench_recurrence.py --series 10 100 1000 --runs 20
+
+db/sql/004_expand_recurrence.sql 이 적용된 DB가 필요합니다. (db_host 등 서버와 같은 환경 변수 사용)
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "back_fastapi"))
+
+from db.db_conn import get_db_connection, close_db_connection  # noqa: E402
+from bench_db import connection_pool  # noqa: E402
+from routers.util.recurrence import expand_recurrences, RECURRENCE_ENGINES  # noqa: E402
+
+# 2022-01-01 부터 시작해 기간(2024년) 전에 시작한 반복 일정을 포함
+CREATE_SERIES_SQL = """
+    WITH new_schedule AS (
+        INSERT INTO schedule (title, note, color, start_date, end_date, important, uid, created_at, updated_at)
+        SELECT 'bench ' || n, '', '#000000',
+               timestamptz '2022-01-01 09:00+00' + n * interval '7 hours',
+               timestamptz '2022-01-01 10:00+00' + n * interval '7 hours',
+               false, %s, NOW(), NOW()
+        FROM generate_series(1, %s) AS n
+        RETURNING id, start_date
+    ), new_recurrence AS (
+        INSERT INTO recurrence (frequency, interval, until, count, schedule_id)
+        SELECT (ARRAY['daily', 'weekly', 'monthly', 'yearly'])[1 + id %% 4], 1 + id %% 3, NULL, NULL, id
+        FROM new_schedule
+        RETURNING schedule_id, frequency, interval, until, count
+    )
+    SELECT s.id, s.start_date, r.frequency, r.interval, r.until, r.count
+    FROM new_schedule s
+    JOIN new_recurrence r ON r.schedule_id = s.id
+"""
+
+# 일정 10개 중 하나에 시작일부터 하루 간격으로 예외 3개 추가
+CREATE_EXCEPTIONS_SQL = """
+    INSERT INTO recurrence_exception (exception_date, start_date, end_date, recurrence_id)
+    SELECT NOW(), s.start_date + k * interval '1 day', s.end_date + k * interval '1 day', r.id
+    FROM recurrence r
+    JOIN schedule s ON s.id = r.schedule_id
+    CROSS JOIN generate_series(0, 2) AS k
+    WHERE r.schedule_id = ANY(%s) AND r.schedule_id %% 10 = 0
+"""
+
+WINDOWS = {
+    "month": (datetime(2024, 5, 1, tzinfo=pytz.utc), datetime(2024, 5, 31, 23, 59, 59, tzinfo=pytz.utc)),
+    "year": (datetime(2024, 1, 1, tzinfo=pytz.utc), datetime(2024, 12, 31, 23, 59, 59, tzinfo=pytz.utc)),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    uid = int(os.environ["BENCH_UID"])
+
+    print(f"runs={args.runs}")
+    print()
+    print("| series | window | engine | median (ms) | occurrences |")
+    print("|---:|---|---|---:|---:|")
+    for size in args.series:
+        conn = get_db_connection()
+        cur = conn.cursor()
+        try:
+            cur.execute(CREATE_SERIES_SQL, (uid, size))
+            series = cur.fetchall()
+            cur.execute(CREATE_EXCEPTIONS_SQL, ([row[0] for row in series],))
+            for window_name, (window_start, window_end) in WINDOWS.items():
+                for engine in RECURRENCE_ENGINES:
+                    timings = []
+                    for _ in range(args.runs):
+                        started = time.perf_counter()
+                        occurrences = expand_recurrences(cur, series, window_start, window_end, engine=engine)
+                        timings.append((time.perf_counter() - started) * 1000)
+                    total = sum(len(events) for events in occurrences.values())
+                    print(f"| {size} | {window_name} | {engine} | {statistics.median(timings):.2f} | {total} |",
+                          flush=True)
+        finally:
+            conn.rollback()
+            cur.close()
+            close_db_connection(conn)
+
+
+if __name__ == "__main__":
+    with connection_pool():
+        main()
@@ -0,0 +1,142 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+"""
+스케줄 검색 벤치마크
+--seed 로 BENCH_UIDS 사용자들에게 벤치마크용 스케줄을 나누어 만든 뒤 (기본 1,000,000개, 메모에 'bench-search' 표시),
+무작위 단어(일부는 오타)로 search_schedules 를 호출해 지연 시간(p50 / p95 / p99)을 markdown 표로 출력합니다.
+p99 가 --target-ms 를 넘으면 종료 코드 1로 끝납니다.
+
+    BENCH_UIDS=1,2,3 python bench/bench_search.py --seed --schedules 1000000
+    BENCH_UIDS=1,2,3 python bench/bench_search.py --queries 2000 --target-ms 150
+    BENCH_UIDS=1,2,3 python bench/bench_search.py --cleanup
+
+db/sql/005_search_trgm.sql 이 적용된 DB가 필요합니다. (db_host 등 서버와 같은 환경 변수 사용)
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "back_fastapi"))
+
+from db.db_conn import get_db_connection, close_db_connection  # noqa: E402
+from bench_db import connection_pool  # noqa: E402
+from routers.util.search import search_schedules  # noqa: E402
+
+WORDS = [
+    "meeting", "lunch", "dinner", "review", "standup", "dentist", "doctor", "gym", "yoga", "project",
+    "deadline", "birthday", "anniversary", "interview", "workshop", "seminar", "conference", "flight", "hotel", "trip",
+    "payment", "invoice", "report", "planning", "retro", "demo", "release", "sprint", "study", "exam",
+    "회의", "점심", "저녁", "운동", "병원", "출장", "발표", "마감", "생일", "스터디",
+]
+
+SEED_CHUNK = 100000
+
+SEED_SQL = """
+    INSERT INTO schedule (title, note, color, start_date, end_date, important, uid, created_at, updated_at)
+    SELECT w[1 + floor(random() * array_length(w, 1))::int] || ' ' || w[1 + floor(random() * array_length(w, 1))::int],
+           'bench-search ' || w[1 + floor(random() * array_length(w, 1))::int] || ' ' || w[1 + floor(random() * array_length(w, 1))::int],
+           'blue',
+           d.start_at,
+           d.start_at + interval '1 hour',
+           'medium',
+           (%(uids)s::bigint[])[1 + (n %% array_length(%(uids)s::bigint[], 1))],
+           NOW(), NOW()
+    FROM generate_series(1, %(count)s) AS n
+    CROSS JOIN (SELECT %(words)s::text[] AS w) words
+    -- n 을 참조해 행마다 다른 시작 시각을 만듦
+    CROSS JOIN LATERAL (SELECT timestamptz '2024-01-01 00:00+00' + (random() * 730 + n * 0) * interval '1 day' AS start_at) d
+"""
+
+CLEANUP_SQL = "DELETE FROM schedule WHERE uid = ANY(%s) AND note LIKE 'bench-search %%'"
+
+
+def typo(word: str, rng: random.Random) -> str:
+    if len(word) < 4:
+        return word
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def seed(uids, total: int):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        for offset in range(0, total, SEED_CHUNK):
+            cur.execute(SEED_SQL, {"uids": uids, "count": min(SEED_CHUNK, total - offset), "words": WORDS})
+            conn.commit()
+            print(f"seeded {min(offset + SEED_CHUNK, total)}/{total}", flush=True)
+        cur.execute("ANALYZE schedule")
+        conn.commit()
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def cleanup(uids):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(CLEANUP_SQL, (uids,))
+        print(f"deleted {cur.rowcount} schedules")
+        conn.commit()
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[max(0, int(len(values) * p) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true", help="Insert the benchmark dataset before measuring")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark dataset and exit")
+    parser.add_argument("--schedules", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, default=150.0, help="p99 latency target")
+    args = parser.parse_args()
+
+    uids = [int(uid) for uid in os.environ["BENCH_UIDS"].split(",")]
+    if args.cleanup:
+        cleanup(uids)
+        return
+    if args.seed:
+        seed(uids, args.schedules)
+
+    rng = random.Random(0)
+    timings = {"exact": [], "typo": []}
+    empty = 0
+    for _ in range(args.queries):
+        kind = rng.choice(list(timings))
+        word = rng.choice(WORDS)
+        query = typo(word, rng) if kind == "typo" else word
+        started = time.perf_counter()
+        results = search_schedules(rng.choice(uids), query, args.limit)
+        timings[kind].append((time.perf_counter() - started) * 1000)
+        empty += not results
+
+    all_timings = timings["exact"] + timings["typo"]
+    print(f"schedules~{args.schedules} users={len(uids)} queries={args.queries} empty_results={empty}")
+    print()
+    print("| queries | count | p50 (ms) | p95 (ms) | p99 (ms) | mean (ms) |")
+    print("|---|---:|---:|---:|---:|---:|")
+    for name, values in list(timings.items()) + [("all", all_timings)]:
+        if values:
+            print(f"| {name} | {len(values)} | {percentile(values, 0.5):.1f} | {percentile(values, 0.95):.1f} | "
+                  f"{percentile(values, 0.99):.1f} | {statistics.mean(values):.1f} |")
+
+    p99 = percentile(all_timings, 0.99)
+    print()
+    print(f"p99 {p99:.1f}ms / target {args.target_ms:.1f}ms: {'PASS' if p99 <= args.target_ms else 'FAIL'}")
+    sys.exit(0 if p99 <= args.target_ms else 1)
+
+
+if __name__ == "__main__":
+    with connection_pool():
+        main()
@@ -0,0 +1,86 @@
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+"""
+기동 시간 벤치마크
+- import 시간: `import back_fastapi.main` 에 걸리는 시간 (DB 연결 없이 import 되어야 함)
+- 첫 요청까지 시간: 프로세스 시작부터 `/` 가 처음 200을 반환할 때까지
+- ready 까지 시간: 프로세스 시작부터 `/ready` 가 처음 200을 반환할 때까지 (warm-up 완료)
+
+    python bench/bench_startup.py --runs 5
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); "
+    "import back_fastapi.main; "
+    "print((time.perf_counter() - started) * 1000)"
+)
+
+
+def measure_import() -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, stderr=subprocess.DEVNULL)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def measure_first_request(port: int, timeout: float = 60.0):
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "entrypoint.py", "--prod", "--workers", "1", "--port", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    first_request_ms = ready_ms = None
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout and ready_ms is None:
+                try:
+                    if first_request_ms is None and client.get(base_url + "/").status_code == 200:
+                        first_request_ms = (time.perf_counter() - started) * 1000
+                    if client.get(base_url + "/ready").status_code == 200:
+                        ready_ms = (time.perf_counter() - started) * 1000
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return first_request_ms, ready_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    imports, first_requests, readies = [], [], []
+    for _ in range(args.runs):
+        imports.append(measure_import())
+        first_request_ms, ready_ms = measure_first_request(args.port)
+        if first_request_ms is not None:
+            first_requests.append(first_request_ms)
+        if ready_ms is not None:
+            readies.append(ready_ms)
+
+    def median(values):
+        return f"{statistics.median(values):.1f}" if values else "n/a"
+
+    print("| metric | median (ms) |")
+    print("|---|---:|")
+    print(f"| import back_fastapi.main | {median(imports)} |")
+    print(f"| process start -> first request | {median(first_requests)} |")
+    print(f"| process start -> ready | {median(readies)} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import httpx
+import websockets
+
+"""
+워커 하나당 유지할 수 있는 WebSocket 연결 수와 변경 알림 fan-out 지연 벤치마크
+
+워커 1개로 `entrypoint.py --prod` 서버를 띄우고, 연결 수별로
+- 연결 N개를 동시에 맺는 데 걸린 시간과 실패 수
+- 연결을 유지한 채 일정 간격으로 스케줄을 수정(PATCH)했을 때, 수정 요청 시작부터 각 연결이 알림을 받기까지의 지연 (p50 / p99)
+- 알림을 받지 못한 연결 수
+를 markdown 표로 출력합니다. 모든 연결은 같은 사용자(BENCH_TOKEN)로 맺으므로 알림 하나가 N개 연결로 fan-out 됩니다.
+
+    BENCH_TOKEN=<jwt> BENCH_SID=<수정할 스케줄 ID> python bench/bench_websocket.py --connections 100 1000 5000
+
+연결 수가 많으면 클라이언트/서버 모두 열린 파일 수 제한(ulimit -n)을 늘려야 합니다.
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def wait_until_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(base_url + "/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[max(0, int(len(values) * p) - 1)]
+
+
+async def run(base_url: str, ws_url: str, connections: int, rounds: int, interval: float, token: str, sid: int):
+    received = []  # 라운드별 (연결 index -> 수신 시각)
+    sockets = []
+    failed = 0
+
+    async def connect():
+        nonlocal failed
+        try:
+            sockets.append(await websockets.connect(ws_url, extra_headers={"Authorization": f"Bearer {token}"},
+                                                    open_timeout=30, max_queue=None))
+        except Exception:
+            failed += 1
+
+    started = time.perf_counter()
+    # 서버 accept 대기열이 넘치지 않도록 나누어 연결
+    for offset in range(0, connections, 500):
+        await asyncio.gather(*(connect() for _ in range(min(500, connections - offset))))
+    connect_seconds = time.perf_counter() - started
+
+    async def reader(index, ws):
+        try:
+            async for message in ws:
+                if json.loads(message).get("type") in ("changed", "resync") and received:
+                    received[-1].setdefault(index, time.perf_counter())
+        except websockets.ConnectionClosed:
+            pass
+
+    readers = [asyncio.ensure_future(reader(i, ws)) for i, ws in enumerate(sockets)]
+    latencies, missed = [], 0
+    async with httpx.AsyncClient(headers={"Authorization": f"Bearer {token}"}, timeout=30.0) as client:
+        for round_number in range(rounds):
+            received.append({})
+            write_started = time.perf_counter()
+            await client.patch(f"{base_url}/api/per-schedule/{sid}", json={"note": f"bench round {round_number}"})
+            await asyncio.sleep(interval)
+            latencies.extend(t - write_started for t in received[-1].values())
+            missed += len(sockets) - len(received[-1])
+
+    for task in readers:
+        task.cancel()
+    await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+    async with httpx.AsyncClient() as client:
+        push_stats = (await client.get(base_url + "/api/metrics/push")).json()
+    return len(sockets), failed, connect_seconds, latencies, missed, push_stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds to wait for deliveries after each write")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    token = os.environ["BENCH_TOKEN"]
+    sid = int(os.environ["BENCH_SID"])
+    base_url = f"http://127.0.0.1:{args.port}"
+    ws_url = f"ws://127.0.0.1:{args.port}/api/push/ws"
+
+    print(f"workers=1 rounds={args.rounds} cpus={os.cpu_count()}")
+    print()
+    print("| connections | connected | failed | connect (s) | fan-out p50 (ms) | fan-out p99 (ms) | missed | overflowed |")
+    print("|---:|---:|---:|---:|---:|---:|---:|---:|")
+    for connections in args.connections:
+        # 요청 수 제한에 걸리지 않도록 벤치마크 서버에서는 끔
+        env = dict(os.environ, rate_limit_enabled="false", push_max_connections=str(max(connections, 10000)))
+        server = subprocess.Popen(
+            [sys.executable, "entrypoint.py", "--prod", "--workers", "1", "--port", str(args.port)],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(wait_until_ready(base_url))
+            connected, failed, connect_seconds, latencies, missed, push_stats = asyncio.run(
+                run(base_url, ws_url, connections, args.rounds, args.interval, token, sid)
+            )
+            print(f"| {connections} | {connected} | {failed} | {connect_seconds:.2f} | "
+                  f"{percentile(latencies, 0.5) * 1000:.1f} | {percentile(latencies, 0.99) * 1000:.1f} | "
+                  f"{missed} | {push_stats.get('overflowed', 0)} |", flush=True)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import httpx
+
+"""
+워커 수에 따른 초당 요청 수(requests/sec) 벤치마크
+
+워커 수별로 `entrypoint.py --prod` 서버를 띄우고, 동시 요청으로 일정 시간 부하를 준 뒤
+markdown 표로 결과를 출력합니다.
+
+    python bench/bench_workers.py --workers 1 2 4 8 --path / --duration 20 --concurrency 256
+    BENCH_TOKEN=<jwt> python bench/bench_workers.py --path "/api/per-schedule/list?start_date=2024-05-01T00:00:00%2B00:00&end_date=2024-05-31T23:59:59%2B00:00"
+
+DB를 사용하는 경로를 측정할 때는 .env의 DB 설정과 db_connection_budget이 서버와 같아야 합니다.
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(base_url + "/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+async def run_load(url: str, duration: float, concurrency: int, headers: dict):
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, headers=headers, timeout=30.0) as client:
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    return len(latencies) / elapsed, p99 * 1000, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    headers = {"Authorization": f"Bearer {os.environ['BENCH_TOKEN']}"} if os.environ.get("BENCH_TOKEN") else {}
+
+    print(f"path={args.path} duration={args.duration}s concurrency={args.concurrency} cpus={os.cpu_count()}")
+    print()
+    print("| workers | requests/sec | p99 (ms) | errors |")
+    print("|--------:|-------------:|---------:|-------:|")
+    for workers in args.workers:
+        server = subprocess.Popen(
+            [sys.executable, "entrypoint.py", "--prod", "--workers", str(workers), "--port", str(args.port)],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(wait_until_ready(base_url))
+            asyncio.run(run_load(base_url + args.path, args.warmup, args.concurrency, headers))
+            rps, p99, errors = asyncio.run(run_load(base_url + args.path, args.duration, args.concurrency, headers))
+            print(f"| {workers} | {rps:,.0f} | {p99:.1f} | {errors} |", flush=True)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+import pytz
+
+"""
+반복 일정 펼치기 엔진 일치 검사
+python 엔진(generate_recurring_events)과 sql 엔진(DB 함수 expand_recurrence)에 같은 규칙을 넣어
+발생 시각 목록이 같은지 확인합니다. 고정 케이스(월말, 윤년, count 와 예외, until, interval, 기간 이전 시작)에
+--random 개수만큼의 무작위 규칙을 더해 검사하며, 다른 결과가 하나라도 있으면 종료 코드 1로 끝납니다.
+
+    python bench/check_recurrence_engines.py --random 1000
+
+db/sql/004_expand_recurrence.sql 이 적용된 DB가 필요합니다. (db_host 등 서버와 같은 환경 변수 사용)
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "back_fastapi"))
+
+from db.db_conn import get_db_connection, close_db_connection  # noqa: E402
+from bench_db import connection_pool  # noqa: E402
+from routers.util.utils import generate_recurring_events  # noqa: E402
+
+EXPAND_SQL = "SELECT expand_recurrence(%s, %s, %s, %s, %s, %s, %s, %s::timestamptz[])"
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=pytz.utc)
+
+
+# (이름, start, frequency, interval, until, count, window_start, window_end, exceptions)
+CASES = [
+    ("daily", utc(2024, 1, 1, 9), "daily", 1, None, None, utc(2024, 1, 1), utc(2024, 1, 31, 23, 59), []),
+    ("daily interval 3", utc(2024, 1, 1, 9), "daily", 3, None, None, utc(2024, 1, 1), utc(2024, 2, 29), []),
+    ("weekly until", utc(2024, 1, 3, 10), "weekly", 1, utc(2024, 2, 14, 10), None, utc(2024, 1, 1), utc(2024, 3, 31), []),
+    ("weekly started before window", utc(2020, 6, 1, 8), "weekly", 2, None, None, utc(2024, 5, 1), utc(2024, 5, 31), []),
+    ("monthly on 31st", utc(2024, 1, 31, 12), "monthly", 1, None, None, utc(2024, 1, 1), utc(2024, 12, 31), []),
+    ("monthly on 30th interval 2", utc(2023, 12, 30), "monthly", 2, None, None, utc(2024, 1, 1), utc(2025, 1, 1), []),
+    ("yearly leap day", utc(2020, 2, 29, 7), "yearly", 1, None, None, utc(2020, 1, 1), utc(2029, 12, 31), []),
+    ("count includes exceptions", utc(2024, 3, 1, 9), "daily", 1, None, 5, utc(2024, 3, 1), utc(2024, 3, 31),
+     [utc(2024, 3, 2, 9), utc(2024, 3, 4, 9)]),
+    ("count ends before window", utc(2024, 1, 1), "weekly", 1, None, 3, utc(2024, 3, 1), utc(2024, 3, 31), []),
+    ("until before window", utc(2024, 1, 1), "daily", 1, utc(2024, 1, 10), None, utc(2024, 2, 1), utc(2024, 2, 29), []),
+    ("window before start", utc(2024, 6, 1), "daily", 1, None, None, utc(2024, 5, 1), utc(2024, 6, 3), []),
+    ("occurrence on window edges", utc(2024, 1, 1), "daily", 1, None, None, utc(2024, 1, 5), utc(2024, 1, 7), []),
+    ("exception outside rule", utc(2024, 1, 1, 9), "daily", 1, None, None, utc(2024, 1, 1), utc(2024, 1, 5),
+     [utc(2024, 1, 2, 10)]),
+    ("non-UTC start", datetime(2024, 1, 31, 23, 30, tzinfo=pytz.FixedOffset(540)), "monthly", 1, None, 6,
+     utc(2024, 1, 1), utc(2024, 12, 31), []),
+]
+
+
+def random_case(rng: random.Random):
+    start = utc(2020, 1, 1) + timedelta(minutes=rng.randrange(0, 5 * 365 * 24 * 60, 30))
+    frequency = rng.choice(["daily", "weekly", "monthly", "yearly"])
+    interval = rng.choice([None, 1, 1, 2, 3, 7])
+    until = start + timedelta(days=rng.randrange(0, 1500)) if rng.random() < 0.3 else None
+    count = rng.randrange(1, 60) if rng.random() < 0.3 else None
+    window_start = start + timedelta(days=rng.randrange(-60, 1500))
+    window_end = window_start + timedelta(days=rng.choice([1, 7, 31, 42, 366]))
+    # 실제 발생 시각 몇 개를 예외로 사용
+    occurrences = generate_recurring_events(start, frequency, interval, until, count, start, window_end)
+    exceptions = rng.sample(occurrences, min(len(occurrences), rng.randrange(0, 4)))
+    return ("random", start, frequency, interval, until, count, window_start, window_end, exceptions)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--random", type=int, default=500, help="Number of random rules to add")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = CASES + [random_case(rng) for _ in range(args.random)]
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    mismatches = 0
+    try:
+        for name, start, frequency, interval, until, count, window_start, window_end, exceptions in cases:
+            expected = generate_recurring_events(
+                start, frequency, interval, until, count, window_start, window_end, set(exceptions)
+            )
+            cur.execute(EXPAND_SQL, (start, frequency, interval, until, count, window_start, window_end, exceptions))
+            actual = [row[0].astimezone(pytz.utc) for row in cur.fetchall()]
+            if actual != expected:
+                mismatches += 1
+                print(f"MISMATCH {name}: start={start} frequency={frequency} interval={interval} until={until} "
+                      f"count={count} window=[{window_start}, {window_end}] exceptions={exceptions}")
+                print(f"  python: {expected}")
+                print(f"  sql:    {actual}")
+        conn.rollback()
+    finally:
+        cur.close()
+        close_db_connection(conn)
+
+    print(f"{len(cases)} cases, {mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    with connection_pool():
+        main()
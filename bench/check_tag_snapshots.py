@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import time
+
+"""
+스케줄 태그 스냅샷(schedule.tag_snapshot) 일치 검사
+스케줄을 ID 순으로 --chunk 개씩 읽어 저장된 스냅샷과 schedule_tag / tag 로 계산한 값을 비교하고,
+다른 스케줄 수를 출력합니다. --rebuild 를 주면 다른 스케줄의 스냅샷을 청크마다 다시 계산해 커밋합니다.
+(db/sql/006_tag_snapshot.sql 적용 직후 기존 행을 채울 때도 사용) --rebuild 없이 다른 스케줄이 있으면 종료 코드 1로 끝납니다.
+
+    python bench/check_tag_snapshots.py
+    python bench/check_tag_snapshots.py --rebuild --chunk 5000
+
+db_host 등 서버와 같은 환경 변수를 사용합니다.
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "back_fastapi"))
+
+from db.db_conn import get_db_connection, close_db_connection  # noqa: E402
+from bench_db import connection_pool  # noqa: E402
+from routers.util.tag_snapshot import find_stale_tag_snapshots, rebuild_tag_snapshots  # noqa: E402
+
+# 출력하는 최대 스케줄 ID 수
+MAX_REPORTED_IDS = 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rebuild", action="store_true", help="Recompute stale snapshots")
+    parser.add_argument("--chunk", type=int, default=10000, help="Schedules checked per query")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    after_id, checked, stale, rebuilt, reported = 0, 0, 0, 0, []
+    started = time.perf_counter()
+    try:
+        while True:
+            last_id, chunk_checked, stale_ids = find_stale_tag_snapshots(cur, after_id, args.chunk)
+            if last_id is None:
+                break
+            checked += chunk_checked
+            stale += len(stale_ids)
+            reported.extend(stale_ids[:MAX_REPORTED_IDS - len(reported)])
+            if args.rebuild and stale_ids:
+                rebuilt += rebuild_tag_snapshots(cur, stale_ids)
+            # 청크마다 커밋해 잠금을 오래 잡지 않음
+            conn.commit()
+            after_id = last_id
+    finally:
+        cur.close()
+        conn.rollback()
+        close_db_connection(conn)
+
+    print(f"checked={checked} stale={stale} rebuilt={rebuilt} elapsed={time.perf_counter() - started:.1f}s")
+    if reported:
+        print(f"stale schedule ids (first {len(reported)}): {', '.join(map(str, reported))}")
+    sys.exit(1 if stale and not args.rebuild else 0)
+
+
+if __name__ == "__main__":
+    with connection_pool():
+        main()
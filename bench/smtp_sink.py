@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import email
+import email.policy
+from collections import Counter
+
+"""
+알림 메일 발송 확인용 로컬 SMTP 서버 (받은 메일을 저장하지 않고 요약만 출력)
+받은 메일마다 받는 주소, 제목, Message-ID 를 출력하고, 종료할 때(Ctrl+C) 같은 Message-ID 로 두 번 이상 받은 메일 수를 출력합니다.
+--reject-every N 을 주면 N 번째 메일마다 451(일시 오류)로 거절해 재발송을 확인할 수 있습니다.
+
+    python bench/smtp_sink.py --port 1025
+    smtp_host=localhost smtp_port=1025 reminder_dispatch_enabled=true uvicorn main:app
+"""
+
+received = Counter()
+
+
+class SinkSession:
+    def __init__(self, reject_every: int):
+        self.reject_every = reject_every
+        self.accepted = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def reply(line: str):
+            writer.write((line + "\r\n").encode())
+
+        reply("220 smtp-sink ready")
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith("EHLO") or command.startswith("HELO"):
+                reply("250 smtp-sink")
+            elif command.startswith("MAIL") or command.startswith("RCPT") or command in ("RSET", "NOOP"):
+                reply("250 OK")
+            elif command == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                await writer.drain()
+                lines = []
+                while True:
+                    data_line = await reader.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                self.accepted += 1
+                if self.reject_every and self.accepted % self.reject_every == 0:
+                    reply("451 Try again later")
+                else:
+                    message = email.message_from_bytes(b"".join(lines), policy=email.policy.default)
+                    message_id = message.get("Message-ID")
+                    received[message_id] += 1
+                    print(f"{message.get('To')} | {message.get('Subject')} | {message_id}"
+                          f"{' (DUPLICATE)' if received[message_id] > 1 else ''}", flush=True)
+                    reply("250 OK")
+            elif command == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("502 Command not implemented")
+            await writer.drain()
+        writer.close()
+
+
+async def serve(host: str, port: int, reject_every: int):
+    session = SinkSession(reject_every)
+    server = await asyncio.start_server(session.handle, host, port)
+    print(f"smtp-sink listening on {host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--reject-every", type=int, default=0, help="Reply 451 to every Nth message")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.reject_every))
+    except KeyboardInterrupt:
+        pass
+    duplicates = sum(1 for count in received.values() if count > 1)
+    print(f"\nreceived={sum(received.values())} unique={len(received)} duplicated_message_ids={duplicates}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,97 @@
+import argparse
+import os
 import uvicorn
-from back_fastapi import main
+from dotenv import load_dotenv
 
 """
 Entry point to start this application
 When the entry point is different, Please consider the relative path of packages.
+
+개발 모드 (기본값): 단일 프로세스 + 코드 변경 시 자동 재시작
+    python entrypoint.py
+
+운영 모드: 여러 워커 프로세스 + uvloop + httptools, 자동 재시작 없음
+    python entrypoint.py --prod --workers 4
+
+운영 모드에서는 DB 커넥션 전체 예산(db_connection_budget)에서 워커마다 풀 밖에서 여는 커넥션
+(RESERVED_CONNECTIONS_PER_WORKER)을 먼저 빼고, 나머지를 워커 수로 나누어 워커별 커넥션 풀 최대 크기(db_pool_max)를 정합니다.
+워커마다 풀 커넥션이 최소 1개 필요하므로 예산이 모자라면 워커 수를 줄입니다.
+SIGTERM을 받으면 새 연결을 받지 않고, 처리 중인 요청은 graceful_shutdown 초까지 기다린 뒤 종료합니다.
 """
 
+# 워커 전체가 사용할 수 있는 DB 커넥션 수 (PostgreSQL max_connections 보다 작게 설정)
+DEFAULT_DB_CONNECTION_BUDGET = 20
+# 워커마다 커넥션 풀 밖에서 primary 에 여는 커넥션 수
+# - LISTEN 커넥션 1개 (routers/util/push.py)
+# - advisory lock 커넥션 3개 (reminder_dispatch, reminder_due, schedule_purge - lock 을 잡지 못한 워커는 닫고 재시도 때 다시 염)
+RESERVED_CONNECTIONS_PER_WORKER = 1 + 3
+# SIGTERM 이후 처리 중인 요청을 기다리는 최대 시간 (초)
+DEFAULT_GRACEFUL_SHUTDOWN_SECONDS = 30
+
+
+def pool_size_per_worker(connection_budget: int, workers: int) -> int:
+    """
+    워커별 DB 커넥션 풀 최대 크기를 계산하는 함수
+    :param connection_budget: 전체 워커가 사용할 수 있는 커넥션 수
+    :param workers: 워커 프로세스 수
+    :return: 워커 한 개의 풀 최대 크기 (워커 수 * (풀 크기 + RESERVED_CONNECTIONS_PER_WORKER) <= 전체 커넥션 수)
+    """
+    pool_size = (connection_budget - workers * RESERVED_CONNECTIONS_PER_WORKER) // workers
+    if pool_size < 1:
+        raise ValueError(f"db_connection_budget ({connection_budget}) is too small for {workers} workers "
+                         f"({RESERVED_CONNECTIONS_PER_WORKER + 1} connections per worker)")
+    return pool_size
+
+
+def cap_workers(connection_budget: int, workers: int) -> int:
+    """
+    워커 수를 커넥션 예산으로 실행할 수 있는 수 이하로 줄이는 함수 (워커 한 개에 풀 밖 커넥션 + 풀 커넥션 최소 1개)
+    """
+    max_workers = connection_budget // (RESERVED_CONNECTIONS_PER_WORKER + 1)
+    if max_workers < 1:
+        raise SystemExit(f"db_connection_budget must be at least {RESERVED_CONNECTIONS_PER_WORKER + 1} "
+                         f"(got {connection_budget})")
+    if workers > max_workers:
+        print(f"Capping workers from {workers} to {max_workers} for db_connection_budget ({connection_budget})")
+        return max_workers
+    return workers
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the rich_schedule API server")
+    parser.add_argument("--prod", action="store_true",
+                        default=os.environ.get("app_env") == "production",
+                        help="Run in production mode (multiple workers, no reload)")
+    parser.add_argument("--workers", type=int,
+                        default=int(os.environ.get("web_workers", os.cpu_count() or 1)),
+                        help="Number of worker processes in production mode")
+    parser.add_argument("--host", default=os.environ.get("web_host", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("web_port", 8000)))
+    parser.add_argument("--graceful-shutdown", type=int,
+                        default=int(os.environ.get("graceful_shutdown_seconds", DEFAULT_GRACEFUL_SHUTDOWN_SECONDS)),
+                        help="Seconds to wait for in-flight requests after SIGTERM")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    # uvicorn.run(main.app, host="0.0.0.0", port=8000)x
-    uvicorn.run("back_fastapi.main:app", host="0.0.0.0", port=8000, reload=True)
+    load_dotenv()
+    args = parse_args()
+
+    if args.prod:
+        connection_budget = int(os.environ.get("db_connection_budget", DEFAULT_DB_CONNECTION_BUDGET))
+        args.workers = cap_workers(connection_budget, args.workers)
+        # 워커 프로세스는 환경 변수를 물려받으므로 여기서 정한 풀 크기를 db_conn에서 사용
+        os.environ["db_pool_max"] = str(pool_size_per_worker(connection_budget, args.workers))
+        uvicorn.run(
+            "back_fastapi.main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+            timeout_graceful_shutdown=args.graceful_shutdown,
+        )
+    else:
+        # uvicorn.run(main.app, host="0.0.0.0", port=8000)x
+        uvicorn.run("back_fastapi.main:app", host=args.host, port=args.port, reload=True)